@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProyectoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Proyecto'
+
+    def ready(self):
+        from . import signals  # noqa: F401
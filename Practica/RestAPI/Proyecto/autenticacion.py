@@ -0,0 +1,97 @@
+"""
+Autenticación por token con caché en proceso.
+
+``TokenAuthentication`` de DRF hace un JOIN entre ``authtoken_token`` y el usuario en
+cada petición autenticada. ``TokenAuthenticationCacheada`` guarda el resultado en una
+caché LRU con TTL; las señales de ``Proyecto.signals`` la invalidan al cerrar sesión,
+rotar el token o modificar/borrar el usuario. En otros procesos del servidor el cambio se
+observa como mucho al caducar la entrada (``TOKEN_CACHE_TTL``).
+"""
+import copy
+import threading
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import CacheLRU
+
+
+class CacheTokens:
+    """
+    Caché token -> (usuario, token) con índice por usuario para invalidar sus entradas.
+    Las entradas que la LRU expulsa o deja caducar salen también del índice, así que este
+    no crece más que la caché. Todo acceso a la LRU se hace con ``_lock`` tomado para que
+    índice y caché cambien juntos.
+    """
+
+    def __init__(self, max_entradas=10000, ttl=60):
+        self._lru = CacheLRU(max_entradas, ttl, al_expulsar=self._expulsada)
+        self._clave_por_usuario = {}
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def _expulsada(self, clave, entrada):
+        usuario, _ = entrada
+        if self._clave_por_usuario.get(usuario.pk) == clave:
+            del self._clave_por_usuario[usuario.pk]
+
+    def generacion(self):
+        with self._lock:
+            return self._generacion
+
+    def obtener(self, clave):
+        with self._lock:
+            return self._lru.get(clave)
+
+    def guardar(self, clave, usuario, token, generacion):
+        with self._lock:
+            # Si hubo una invalidación durante la consulta, el resultado puede estar obsoleto
+            if generacion != self._generacion:
+                return
+            self._clave_por_usuario[usuario.pk] = clave
+            self._lru.set(clave, (usuario, token))
+
+    def invalidar_token(self, clave):
+        with self._lock:
+            self._generacion += 1
+            self._lru.delete(clave)
+
+    def invalidar_usuario(self, usuario_id):
+        with self._lock:
+            self._generacion += 1
+            clave = self._clave_por_usuario.pop(usuario_id, None)
+            if clave is not None:
+                self._lru.delete(clave)
+
+    def clear(self):
+        with self._lock:
+            self._generacion += 1
+            self._clave_por_usuario.clear()
+            self._lru.clear()
+
+    def estadisticas(self):
+        return self._lru.estadisticas()
+
+
+cache_tokens = CacheTokens(
+    max_entradas=getattr(settings, 'TOKEN_CACHE_MAX_ENTRADAS', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 60),
+)
+
+
+class TokenAuthenticationCacheada(TokenAuthentication):
+    """
+    ``TokenAuthentication`` que resuelve los tokens ya vistos sin consultar la base de datos.
+    """
+
+    def authenticate_credentials(self, key):
+        entrada = cache_tokens.obtener(key)
+        if entrada is not None:
+            usuario, token = entrada
+            # Copia para que una vista no pueda modificar el usuario compartido entre peticiones
+            return copy.copy(usuario), token
+
+        generacion = cache_tokens.generacion()
+        usuario, token = super().authenticate_credentials(key)
+        cache_tokens.guardar(key, usuario, token, generacion)
+        return copy.copy(usuario), token
@@ -0,0 +1,40 @@
+"""
+Perfil de SQLite para producción.
+
+Es opcional: se activa con ``SQLITE_PERFIL_PRODUCCION=1`` en el entorno (ver settings), de
+modo que los comandos de ``manage.py`` y los tests no pasan ``db.sqlite3`` a WAL. Con él,
+al abrir cada conexión se aplican los PRAGMA de ``SQLITE_PRAGMAS``:
+
+- ``journal_mode=WAL``: los lectores no bloquean al escritor ni el escritor a los lectores.
+- ``busy_timeout``: un escritor espera al que tiene el bloqueo en lugar de fallar con
+  ``database is locked``.
+- ``synchronous=NORMAL``: con WAL solo se sincroniza a disco en los checkpoints; una caída
+  del sistema puede perder las últimas transacciones, pero no corrompe la base de datos.
+- ``mmap_size``: las lecturas se sirven desde el fichero mapeado en memoria.
+
+El resto del perfil (``SQLITE_CONEXIONES_PRODUCCION``) se añade a ``DATABASES``: conexiones
+persistentes (``CONN_MAX_AGE``) y
+transacciones ``BEGIN IMMEDIATE``, que toman el bloqueo de escritura al empezar y así
+esperan con ``busy_timeout`` en vez de fallar al pasar de lectura a escritura.
+"""
+from django.conf import settings
+
+
+def aplicar_pragmas(connection):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for nombre, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nombre} = {valor}")
+
+
+def leer_pragmas(connection, nombres=('journal_mode', 'busy_timeout', 'synchronous', 'mmap_size')):
+    with connection.cursor() as cursor:
+        resultado = {}
+        for nombre in nombres:
+            cursor.execute(f"PRAGMA {nombre}")
+            resultado[nombre] = cursor.fetchone()[0]
+    return resultado
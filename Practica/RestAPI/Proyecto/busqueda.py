@@ -0,0 +1,99 @@
+"""
+Búsqueda de texto completo sobre el título y la descripción de los eventos.
+
+En SQLite se usa una tabla virtual FTS5 (``Proyecto_eventos_fts``) cuyo rowid es el id
+del evento. Las señales de ``Proyecto.signals`` la mantienen sincronizada al guardar y
+borrar eventos. En otros motores se recurre a ``icontains``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+TABLA_FTS = 'Proyecto_eventos_fts'
+
+
+def disponible():
+    return connection.vendor == 'sqlite'
+
+
+def crear_indice(schema_editor):
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} "
+        f"USING fts5(titulo, descripcion, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def expresion_fts(texto):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura: cada palabra se busca
+    como prefijo y todas deben aparecer. Devuelve None si no hay palabras.
+    """
+    palabras = re.findall(r'\w+', texto)
+    if not palabras:
+        return None
+    return ' '.join('"%s"*' % palabra for palabra in palabras)
+
+
+def indexar_evento(evento):
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA_FTS} WHERE rowid = %s", [evento.pk])
+        cursor.execute(
+            f"INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion) VALUES (%s, %s, %s)",
+            [evento.pk, evento.titulo, evento.descripcion],
+        )
+
+
+def indexar_eventos(eventos):
+    """
+    Añade al índice eventos recién creados en bloque (``bulk_create`` no emite señales).
+    """
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion) VALUES (%s, %s, %s)",
+            [(evento.pk, evento.titulo, evento.descripcion) for evento in eventos],
+        )
+
+
+def eliminar_evento(evento_id):
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA_FTS} WHERE rowid = %s", [evento_id])
+
+
+def reindexar():
+    """
+    Reconstruye el índice completo a partir de la tabla de eventos.
+    """
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA_FTS}")
+        cursor.execute(
+            f"INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion) "
+            f"SELECT id, titulo, descripcion FROM Proyecto_eventos"
+        )
+
+
+def buscar(eventos, texto):
+    """
+    Filtra el queryset de eventos por ``texto`` y lo ordena por relevancia (bm25).
+    """
+    expresion = expresion_fts(texto)
+    if expresion is None:
+        return eventos.none()
+    if not disponible():
+        return eventos.filter(Q(titulo__icontains=texto) | Q(descripcion__icontains=texto)).order_by('fecha', 'id')
+    # JOIN con la tabla FTS: el MATCH resuelve los candidatos y cada evento se obtiene por clave primaria
+    return eventos.extra(
+        tables=[TABLA_FTS],
+        where=[f'{TABLA_FTS}.rowid = "Proyecto_eventos"."id"', f'{TABLA_FTS} MATCH %s'],
+        params=[expresion],
+        select={'relevancia': f'{TABLA_FTS}.rank'},
+        order_by=['relevancia', 'id'],
+    )
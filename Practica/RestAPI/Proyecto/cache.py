@@ -0,0 +1,211 @@
+"""
+Caché en memoria de las respuestas de los listados públicos.
+
+Cada entrada se guarda junto a una etiqueta (``eventos``, ``reservas:<id>``,
+``comentarios:<id>``) y la generación que tenía esa etiqueta cuando se empezó a
+construir la respuesta. Las señales de ``Proyecto.signals`` incrementan la generación
+de las etiquetas afectadas por cada escritura, de modo que las entradas anteriores
+dejan de servirse al instante sin necesidad de recorrer la caché.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from .renderizado import codificar
+
+
+class CacheLRU:
+    """
+    Diccionario acotado con expulsión LRU y caducidad por TTL. Seguro entre hilos.
+
+    ``al_expulsar(clave, valor)``, si se indica, se llama por cada entrada que sale por
+    expulsión o caducidad (no por ``delete`` ni ``clear``), con el cerrojo tomado: no debe
+    volver a usar la caché.
+    """
+
+    def __init__(self, max_entradas=1024, ttl=60, al_expulsar=None):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.al_expulsar = al_expulsar
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._datos[clave]
+                    self._expulsada(clave, entrada[1])
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def set(self, clave, valor):
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                expulsada, (_, valor) = self._datos.popitem(last=False)
+                self._expulsada(expulsada, valor)
+
+    def _expulsada(self, clave, valor):
+        if self.al_expulsar is not None:
+            self.al_expulsar(clave, valor)
+
+    def delete(self, clave):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "ratio_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl": self.ttl,
+            }
+
+
+class CacheRespuestas:
+    """
+    Caché de datos de respuesta invalidable por etiqueta.
+    """
+
+    def __init__(self, max_entradas=1024, ttl=30):
+        self._lru = CacheLRU(max_entradas, ttl)
+        self._generaciones = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def generacion(self, etiqueta):
+        with self._lock:
+            return self._generaciones[etiqueta]
+
+    def obtener(self, clave, etiqueta):
+        entrada = self._lru.get(clave)
+        if entrada is None:
+            return None
+        generacion, datos = entrada
+        if generacion != self.generacion(etiqueta):
+            self._lru.delete(clave)
+            return None
+        return datos
+
+    def guardar(self, clave, etiqueta, generacion, datos):
+        # Si hubo una escritura mientras se construía la respuesta, no se guarda
+        if generacion == self.generacion(etiqueta):
+            self._lru.set(clave, (generacion, datos))
+
+    def invalidar(self, *etiquetas):
+        with self._lock:
+            for etiqueta in etiquetas:
+                self._generaciones[etiqueta] += 1
+
+    def invalidar_al_confirmar(self, *etiquetas):
+        """
+        Invalida ahora y de nuevo al confirmar la transacción en curso, para descartar
+        también lo que otros hilos hayan leído antes del COMMIT.
+        """
+        self.invalidar(*etiquetas)
+        transaction.on_commit(lambda: self.invalidar(*etiquetas))
+
+    def clear(self):
+        self._lru.clear()
+        with self._lock:
+            self._generaciones.clear()
+
+    def estadisticas(self):
+        return self._lru.estadisticas()
+
+
+cache_respuestas = CacheRespuestas(
+    max_entradas=getattr(settings, 'CACHE_RESPUESTAS_MAX_ENTRADAS', 1024),
+    ttl=getattr(settings, 'CACHE_RESPUESTAS_TTL', 30),
+)
+
+
+def clave_peticion(request, etiqueta):
+    """
+    Clave de caché: etiqueta del endpoint + parámetros de query ordenados.
+    """
+    parametros = urlencode(sorted(request.GET.lists()), doseq=True)
+    return f"{etiqueta}?{parametros}"
+
+
+class RespuestaJSON(HttpResponse):
+    """
+    Respuesta JSON que conserva los datos en ``data`` como la ``Response`` de DRF, para
+    las vistas asíncronas, que no pasan por DRF. Se codifica igual que con ``RenderizadorJSON``.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(codificar(data), **kwargs)
+        self.data = data
+
+
+def _consultar_cache(request, etiqueta, kwargs):
+    etiqueta_peticion = etiqueta.format(**kwargs)
+    clave = clave_peticion(request, etiqueta_peticion)
+    # Con el sello persistente en la clave, otros procesos tampoco sirven datos anteriores
+    version = getattr(request, 'version_datos', None)
+    if version is not None:
+        clave = f"{clave}#v{version}"
+    return etiqueta_peticion, clave, cache_respuestas.obtener(clave, etiqueta_peticion)
+
+
+def cachear_respuesta(etiqueta):
+    """
+    Decorador para el ``get`` de una vista (APIView o vista asíncrona de Django).
+    ``etiqueta`` puede usar los argumentos de la URL, p. ej. ``'reservas:{id}'``.
+    Solo se guardan las respuestas 200.
+    """
+    def decorador(metodo):
+        if inspect.iscoroutinefunction(metodo):
+            @functools.wraps(metodo)
+            async def envoltorio_async(vista, request, *args, **kwargs):
+                etiqueta_peticion, clave, datos = _consultar_cache(request, etiqueta, kwargs)
+                if datos is not None:
+                    return RespuestaJSON(datos)
+                generacion = cache_respuestas.generacion(etiqueta_peticion)
+                respuesta = await metodo(vista, request, *args, **kwargs)
+                if respuesta.status_code == status.HTTP_200_OK:
+                    cache_respuestas.guardar(clave, etiqueta_peticion, generacion, respuesta.data)
+                return respuesta
+            return envoltorio_async
+
+        @functools.wraps(metodo)
+        def envoltorio(vista, request, *args, **kwargs):
+            etiqueta_peticion, clave, datos = _consultar_cache(request, etiqueta, kwargs)
+            if datos is not None:
+                return Response(datos, status=status.HTTP_200_OK)
+
+            generacion = cache_respuestas.generacion(etiqueta_peticion)
+            respuesta = metodo(vista, request, *args, **kwargs)
+            if respuesta.status_code == status.HTTP_200_OK:
+                cache_respuestas.guardar(clave, etiqueta_peticion, generacion, respuesta.data)
+            return respuesta
+        return envoltorio
+    return decorador
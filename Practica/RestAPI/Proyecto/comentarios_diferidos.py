@@ -0,0 +1,124 @@
+"""
+Escritura diferida de comentarios (write-behind).
+
+Con ``COMENTARIOS_DIFERIDOS = True``, ``CrearComentarioView`` no inserta el comentario: lo
+deja en un buffer en memoria del proceso y responde ``202 Accepted``. Un hilo de fondo
+vacía el buffer con un solo ``bulk_create`` por lote, de modo que una ráfaga de comentarios
+se convierte en unas pocas transacciones de escritura en lugar de una por comentario.
+
+- Por tiempo: cada ``COMENTARIOS_INTERVALO`` segundos.
+- Por tamaño: en cuanto hay ``COMENTARIOS_LOTE`` pendientes se despierta al hilo.
+- Límite: con ``COMENTARIOS_MAX_PENDIENTES`` pendientes, la petición que añade vacía el
+  buffer ella misma y espera a que termine; así el buffer no crece sin control.
+- Al terminar el proceso (``atexit``) se vacía lo que quede.
+
+Cada vaciado hace en una transacción lo mismo que las señales para cada comentario:
+estadísticas por evento, invalidación de la caché y sellos de versión de los listados de
+comentarios. En cuanto se confirma, el listado (y su ETag) incluyen los comentarios.
+Un comentario aceptado aparece como mucho ``COMENTARIOS_INTERVALO`` segundos después; si el
+proceso muere sin salir de forma ordenada (SIGKILL) se pierden los pendientes.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from . import estadisticas
+from .models import Eventos, Comentarios
+from .versiones import registrar_cambios
+
+logger = logging.getLogger(__name__)
+
+
+def activo():
+    return getattr(settings, 'COMENTARIOS_DIFERIDOS', False)
+
+
+class BufferComentarios:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vaciando = threading.Lock()
+        self._despertar = threading.Event()
+        self._pendientes = []  # (evento_id, texto)
+        self._hilo = None
+
+    def lote(self):
+        return getattr(settings, 'COMENTARIOS_LOTE', 200)
+
+    def max_pendientes(self):
+        return getattr(settings, 'COMENTARIOS_MAX_PENDIENTES', 5000)
+
+    def intervalo(self):
+        return getattr(settings, 'COMENTARIOS_INTERVALO', 0.5)
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def anhadir(self, evento_id, texto):
+        with self._lock:
+            self._pendientes.append((evento_id, texto))
+            pendientes = len(self._pendientes)
+            if self._hilo is None:
+                self._arrancar()
+        if pendientes >= self.max_pendientes():
+            self.vaciar()
+        elif pendientes >= self.lote():
+            self._despertar.set()
+
+    def _arrancar(self):
+        self._hilo = threading.Thread(target=self._bucle, name='comentarios-diferidos', daemon=True)
+        self._hilo.start()
+        atexit.register(self.vaciar)
+
+    def _bucle(self):
+        while True:
+            self._despertar.wait(self.intervalo())
+            self._despertar.clear()
+            # Como entre peticiones: descarta conexiones caducadas o rotas
+            close_old_connections()
+            try:
+                self.vaciar()
+            finally:
+                close_old_connections()
+
+    def vaciar(self):
+        """
+        Escribe todos los pendientes y devuelve cuántos comentarios se crearon.
+        """
+        with self._vaciando:
+            with self._lock:
+                lote, self._pendientes = self._pendientes, []
+            if not lote:
+                return 0
+            try:
+                return self._escribir(lote)
+            except Exception:
+                # Se devuelven al buffer para el siguiente intento, sin pasar del límite
+                with self._lock:
+                    hueco = max(0, self.max_pendientes() - len(self._pendientes))
+                    self._pendientes[:0] = lote[:hueco]
+                logger.exception("No se pudieron escribir %d comentarios diferidos (%d descartados).",
+                                  len(lote), len(lote) - hueco)
+                return 0
+
+    def _escribir(self, lote):
+        with transaction.atomic():
+            # El evento pudo borrarse mientras el comentario esperaba
+            existentes = set(Eventos.objects.filter(id__in={evento_id for evento_id, _ in lote})
+                             .values_list('id', flat=True))
+            comentarios = Comentarios.objects.bulk_create([
+                Comentarios(evento_id=evento_id, texto=texto) for evento_id, texto in lote if evento_id in existentes
+            ])
+            if comentarios:
+                # bulk_create no emite señales
+                estadisticas.sumar_comentarios(comentarios)
+                registrar_cambios(*{f'comentarios:{comentario.evento_id}' for comentario in comentarios})
+        if len(comentarios) < len(lote):
+            logger.warning("%d comentarios diferidos descartados: su evento ya no existe.", len(lote) - len(comentarios))
+        return len(comentarios)
+
+
+buffer_comentarios = BufferComentarios()
@@ -0,0 +1,80 @@
+"""
+Hash y verificación de contraseñas en un pool de hilos acotado.
+
+Las contraseñas se guardan con el hasher por defecto de Django (PBKDF2), que tarda del
+orden de 100 ms por operación. ``hashlib`` libera el GIL durante el cálculo, así que el
+pool limita cuántos hashes se calculan a la vez (``CREDENCIALES_MAX_HILOS``) y el resto de
+peticiones siguen teniendo CPU. Si hay más de ``CREDENCIALES_MAX_PENDIENTES`` operaciones
+en curso o en cola, o si el resultado tarda más de ``CREDENCIALES_ESPERA_MAXIMA``
+segundos, se lanza ``ServicioSaturado`` en vez de acumular peticiones bloqueadas.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+
+MAX_HILOS = getattr(settings, 'CREDENCIALES_MAX_HILOS', None) or os.cpu_count() or 2
+MAX_PENDIENTES = getattr(settings, 'CREDENCIALES_MAX_PENDIENTES', 64)
+ESPERA_MAXIMA = getattr(settings, 'CREDENCIALES_ESPERA_MAXIMA', 10)  # segundos
+
+_pool = ThreadPoolExecutor(max_workers=MAX_HILOS, thread_name_prefix='credenciales')
+_plazas = threading.BoundedSemaphore(MAX_PENDIENTES)
+
+
+class ServicioSaturado(Exception):
+    pass
+
+
+def _ejecutar(funcion, *args):
+    if not getattr(settings, 'CREDENCIALES_EN_POOL', True):
+        return funcion(*args)
+    if not _plazas.acquire(blocking=False):
+        raise ServicioSaturado("Servidor ocupado, inténtalo de nuevo en unos segundos.")
+    try:
+        futuro = _pool.submit(funcion, *args)
+    except BaseException:
+        _plazas.release()
+        raise
+    futuro.add_done_callback(lambda _: _plazas.release())
+    try:
+        return futuro.result(timeout=ESPERA_MAXIMA)
+    except TimeoutError:
+        # La operación sigue en el pool y libera su plaza al terminar
+        raise ServicioSaturado("Servidor ocupado, inténtalo de nuevo en unos segundos.")
+
+
+def es_hash(valor):
+    try:
+        identify_hasher(valor)
+    except ValueError:
+        return False
+    return True
+
+
+def _verificar(contrasenha, codificada):
+    if codificada is None:
+        # Usuario inexistente: se calcula un hash igualmente para no revelarlo por el tiempo de respuesta
+        make_password(contrasenha)
+        return False, None
+    if not check_password(contrasenha, codificada):
+        return False, None
+    # Si el hasher por defecto ha cambiado (p. ej. más iteraciones) se devuelve el hash actualizado
+    hasher = identify_hasher(codificada)
+    if hasher.algorithm != get_hasher().algorithm or hasher.must_update(codificada):
+        return True, make_password(contrasenha)
+    return True, None
+
+
+def hashear_contrasenha(contrasenha):
+    return _ejecutar(make_password, contrasenha)
+
+
+def verificar_contrasenha(contrasenha, codificada):
+    """
+    Devuelve ``(valida, nuevo_hash)``. ``nuevo_hash`` no es None cuando conviene guardar
+    la contraseña con los parámetros actuales del hasher. ``codificada`` None indica que
+    el usuario no existe.
+    """
+    return _ejecutar(_verificar, contrasenha, codificada)
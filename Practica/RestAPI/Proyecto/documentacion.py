@@ -0,0 +1,524 @@
+"""
+Documentación OpenAPI de las vistas de ``Proyecto.views``.
+
+Los esquemas de peticiones y respuestas se construyen al importar este módulo, no al
+importar las vistas: solo lo cargan la generación del esquema (``Proyecto.esquema``) y las
+páginas de Swagger/ReDoc, así que un proceso que no sirve la documentación no importa
+drf_yasg ni construye ninguno de estos objetos. Importarlo aplica ``swagger_auto_schema``
+a cada método documentado; como Python solo ejecuta el módulo una vez, se aplica una vez.
+"""
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+
+from . import estadisticas, views
+from .exportacion import FORMATOS as FORMATOS_EXPORTACION
+from .serializers import PROYECCION_EVENTO, PROYECCION_RESERVA, PROYECCION_COMENTARIO
+
+INFO = openapi.Info(
+    title="API de Eventos",
+    default_version='v1',
+    description="Gestión de eventos, reservas y comentarios",
+)
+
+
+def documentar(vista, metodo, **opciones):
+    """
+    Equivale a decorar ``vista.metodo`` con ``@swagger_auto_schema(**opciones)``.
+    """
+    swagger_auto_schema(**opciones)(getattr(vista, metodo))
+
+
+def fields_param(proyeccion):
+    return openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, description=(
+        "Campos a devolver, separados por comas (por defecto todos): " + ", ".join(proyeccion.campos)))
+
+
+##################################
+# CRUD de eventos:
+
+# Definición de parámetros de query
+q_param = openapi.Parameter('q', openapi.IN_QUERY, description="Búsqueda de texto en título y descripción (resultados ordenados por relevancia)", type=openapi.TYPE_STRING)
+titulo_param = openapi.Parameter('titulo', openapi.IN_QUERY, description="Filtro por título", type=openapi.TYPE_STRING)
+fecha_param = openapi.Parameter('fecha', openapi.IN_QUERY, description="Filtro por fecha (YYYY-MM-DD)", type=openapi.TYPE_STRING)
+desde_param = openapi.Parameter('desde', openapi.IN_QUERY, description="Eventos desde esta fecha, incluida (YYYY-MM-DD)", type=openapi.TYPE_STRING)
+hasta_param = openapi.Parameter('hasta', openapi.IN_QUERY, description="Eventos hasta esta fecha, incluida (YYYY-MM-DD)", type=openapi.TYPE_STRING)
+limite_param = openapi.Parameter('limite', openapi.IN_QUERY, description="Número de eventos por página", type=openapi.TYPE_INTEGER, default=5)
+pagina_param = openapi.Parameter('pagina', openapi.IN_QUERY, description="Número de página", type=openapi.TYPE_INTEGER, default=1)
+cursor_param = openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor opaco de paginación (vacío para la primera página). Sustituye a 'pagina'", type=openapi.TYPE_STRING)
+
+documentar(views.ListarEventosView, 'get',
+    manual_parameters=[q_param, titulo_param, fecha_param, desde_param, hasta_param, limite_param, pagina_param,
+                       cursor_param, fields_param(PROYECCION_EVENTO)],
+    responses={200: openapi.Response('Listado de eventos', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'count': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'total_pages': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'current_page': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'next': openapi.Schema(type=openapi.TYPE_INTEGER, nullable=True),
+            'previous': openapi.Schema(type=openapi.TYPE_INTEGER, nullable=True),
+            'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+            'results': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'titulo': openapi.Schema(type=openapi.TYPE_STRING),
+                        'descripcion': openapi.Schema(type=openapi.TYPE_STRING),
+                        'fecha': openapi.Schema(type=openapi.TYPE_STRING),
+                        'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'url': openapi.Schema(type=openapi.TYPE_STRING),
+                        'organizador': openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                'nombre': openapi.Schema(type=openapi.TYPE_STRING),
+                                'email': openapi.Schema(type=openapi.TYPE_STRING)
+                            }
+                        )
+                    }
+                )
+            )
+        }
+    )), 400: "Fecha, página o cursor no válidos."}
+)
+
+documentar(views.CalendarioEventosView, 'get',
+    manual_parameters=[
+        openapi.Parameter('agrupacion', openapi.IN_QUERY, description="Periodo de agrupación", type=openapi.TYPE_STRING,
+                          enum=list(views.AGRUPACIONES_CALENDARIO), default='mes'),
+        desde_param, hasta_param,
+    ],
+    responses={200: openapi.Response('Eventos por periodo', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'agrupacion': openapi.Schema(type=openapi.TYPE_STRING),
+            'results': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'periodo': openapi.Schema(type=openapi.TYPE_STRING, description="Primer día del periodo (YYYY-MM-DD)"),
+                        'eventos': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'entradas_vendidas': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'plazas_libres': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    }
+                )
+            )
+        }
+    )), 400: "Agrupación o fechas no válidas."}
+)
+
+# Esquema del request para crear un evento
+evento_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['titulo', 'descripcion', 'fecha', 'capacidad', 'url'],
+    properties={
+        'titulo': openapi.Schema(type=openapi.TYPE_STRING, description="Título del evento"),
+        'descripcion': openapi.Schema(type=openapi.TYPE_STRING, description="Descripción del evento"),
+        'fecha': openapi.Schema(type=openapi.TYPE_STRING, format='date', description="Fecha del evento (YYYY-MM-DD)"),
+        'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER, description="Capacidad del evento"),
+        'url': openapi.Schema(type=openapi.TYPE_STRING, description="URL relacionada al evento")
+    }
+)
+
+documentar(views.CrearEventoView, 'post',
+    request_body=evento_request,
+    responses={201: openapi.Response('Evento creado', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
+        }
+    ))}
+)
+
+evento_update_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'titulo': openapi.Schema(type=openapi.TYPE_STRING, description="Título del evento"),
+        'descripcion': openapi.Schema(type=openapi.TYPE_STRING, description="Descripción del evento"),
+        'fecha': openapi.Schema(type=openapi.TYPE_STRING, format='date', description="Fecha del evento (YYYY-MM-DD)"),
+        'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER, description="Capacidad del evento"),
+        'url': openapi.Schema(type=openapi.TYPE_STRING, description="URL relacionada al evento"),
+        'organizador': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del organizador (opcional)")
+    }
+)
+
+documentar(views.ActualizarEventoView, 'put',
+    request_body=evento_update_request,
+    responses={200: openapi.Response('Evento actualizado', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+documentar(views.ActualizarEventoView, 'patch',
+    request_body=evento_update_request,
+    responses={200: openapi.Response('Evento actualizado', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+documentar(views.BorrarEventoView, 'delete',
+    responses={200: openapi.Response('Evento eliminado', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+por_estado = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={estado: openapi.Schema(type=openapi.TYPE_INTEGER) for estado in estadisticas.ESTADOS}
+)
+
+documentar(views.EstadisticasEventoView, 'get',
+    manual_parameters=[openapi.Parameter('id', openapi.IN_PATH, description="ID del evento", type=openapi.TYPE_INTEGER)],
+    responses={200: openapi.Response('Estadísticas del evento', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'evento': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'entradas_vendidas': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'ocupacion': openapi.Schema(type=openapi.TYPE_NUMBER, description="Entradas vendidas / capacidad"),
+            'reservas': por_estado,
+            'entradas': por_estado,
+            'comentarios': openapi.Schema(type=openapi.TYPE_INTEGER)
+        }
+    )), 404: "Evento no encontrado."}
+)
+
+
+documentar(views.PanelOrganizadorView, 'get',
+    manual_parameters=[
+        desde_param, hasta_param,
+        openapi.Parameter('limite', openapi.IN_QUERY, description="Eventos por página (máximo 100)", type=openapi.TYPE_INTEGER, default=20),
+        openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor opaco de paginación", type=openapi.TYPE_STRING),
+    ],
+    responses={200: openapi.Response('Eventos del organizador con sus estadísticas', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+            'results': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'titulo': openapi.Schema(type=openapi.TYPE_STRING),
+                        'fecha': openapi.Schema(type=openapi.TYPE_STRING),
+                        'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'entradas_vendidas': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'plazas_libres': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'reservas': openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={'total': openapi.Schema(type=openapi.TYPE_INTEGER), **por_estado.properties}
+                        ),
+                        'entradas': por_estado,
+                        'comentarios': openapi.Schema(type=openapi.TYPE_INTEGER)
+                    }
+                )
+            )
+        }
+    )), 400: "Parámetros o cursor no válidos."}
+)
+
+
+##################################
+# Gestión de reservas:
+
+def esquema_listado_por_evento(descripcion, propiedades):
+    return openapi.Response(descripcion, schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'count': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+            'results': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_OBJECT, properties=propiedades)
+            )
+        }
+    ))
+
+
+parametros_listado_por_evento = [
+    openapi.Parameter('id', openapi.IN_PATH, description="ID del evento", type=openapi.TYPE_INTEGER),
+    openapi.Parameter('limite', openapi.IN_QUERY, description="Elementos por página (máximo 100)",
+                      type=openapi.TYPE_INTEGER, default=20),
+    openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor devuelto en 'next_cursor' por la página anterior",
+                      type=openapi.TYPE_STRING),
+]
+
+documentar(views.ListarReservasView, 'get',
+    manual_parameters=[*parametros_listado_por_evento, fields_param(PROYECCION_RESERVA)],
+    responses={200: esquema_listado_por_evento('Listado de reservas', {
+        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'usuario': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'evento': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'estado': openapi.Schema(type=openapi.TYPE_STRING)
+    })}
+)
+
+reserva_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['usuario', 'evento', 'entradas_reservadas', 'estado'],
+    properties={
+        'usuario': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del usuario"),
+        'evento': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del evento"),
+        'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER, description="Número de entradas reservadas"),
+        'estado': openapi.Schema(type=openapi.TYPE_STRING, description="Estado de la reserva")
+    }
+)
+
+documentar(views.CrearReservaView, 'post',
+    request_body=reserva_request,
+    responses={
+        201: openapi.Response('Reserva creada', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )),
+        409: "No quedan entradas suficientes para el evento."
+    }
+)
+
+lote_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['reservas'],
+    properties={
+        'reservas': openapi.Schema(type=openapi.TYPE_ARRAY, items=reserva_request,
+                                   description="Reservas a crear (máximo 1000)")
+    }
+)
+
+documentar(views.CrearReservasLoteView, 'post',
+    request_body=lote_request,
+    responses={
+        200: openapi.Response('Resultado por reserva, en el mismo orden', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'creadas': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'resultados': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'status': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'error': openapi.Schema(type=openapi.TYPE_STRING)
+                        }
+                    )
+                )
+            }
+        )),
+        400: "El lote está vacío, no es una lista o supera el máximo."
+    }
+)
+
+reserva_update_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'usuario': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del usuario"),
+        'evento': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del evento"),
+        'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER, description="Número de entradas reservadas"),
+        'estado': openapi.Schema(type=openapi.TYPE_STRING, description="Estado de la reserva")
+    }
+)
+
+documentar(views.ActualizarReservaView, 'put',
+    request_body=reserva_update_request,
+    responses={200: openapi.Response('Reserva actualizada', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+documentar(views.ActualizarReservaView, 'patch',
+    request_body=reserva_update_request,
+    responses={200: openapi.Response('Reserva actualizada', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+documentar(views.CancelarReservaView, 'delete',
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="ID de la reserva", type=openapi.TYPE_INTEGER)
+    ],
+    responses={200: openapi.Response('Reserva eliminada', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+
+##################################
+# Comentarios:
+
+documentar(views.ListarComentariosView, 'get',
+    manual_parameters=[*parametros_listado_por_evento, fields_param(PROYECCION_COMENTARIO)],
+    responses={200: esquema_listado_por_evento('Listado de comentarios', {
+        'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'texto': openapi.Schema(type=openapi.TYPE_STRING),
+        'FechaC': openapi.Schema(type=openapi.TYPE_STRING)
+    })}
+)
+
+comentario_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['texto'],
+    properties={
+        'texto': openapi.Schema(type=openapi.TYPE_STRING, description="Texto del comentario")
+    }
+)
+
+documentar(views.CrearComentarioView, 'post',
+    request_body=comentario_request,
+    responses={
+        201: openapi.Response('Comentario creado', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )),
+        202: openapi.Response('Comentario aceptado (escritura diferida)', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+        ))
+    }
+)
+
+
+##################################
+# Importación y exportación:
+
+formato_param = openapi.Parameter('formato', openapi.IN_QUERY, description="Formato: ndjson (por defecto) o csv",
+                                  type=openapi.TYPE_STRING, enum=list(FORMATOS_EXPORTACION), default='ndjson')
+tamano_lote_param = openapi.Parameter('tamano_lote', openapi.IN_QUERY, description="Filas por lote de inserción",
+                                      type=openapi.TYPE_INTEGER)
+resumen_importacion = openapi.Response('Resumen de la importación', schema=openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        'importados': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'errores_totales': openapi.Schema(type=openapi.TYPE_INTEGER),
+        'errores': openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'linea': openapi.Schema(type=openapi.TYPE_INTEGER),
+                    'status': openapi.Schema(type=openapi.TYPE_INTEGER,
+                                             description="Código HTTP que habría tenido el alta de la fila"),
+                    'error': openapi.Schema(type=openapi.TYPE_STRING)
+                }
+            )
+        )
+    }
+))
+
+documentar(views.ExportarEventosView, 'get', manual_parameters=[formato_param], responses={200: "Fichero NDJSON o CSV"})
+
+documentar(views.ExportarReservasView, 'get',
+    manual_parameters=[
+        openapi.Parameter('id', openapi.IN_PATH, description="ID del evento", type=openapi.TYPE_INTEGER),
+        formato_param
+    ],
+    responses={200: "Fichero NDJSON o CSV"}
+)
+
+# ImportarEventosView e ImportarReservasView heredan este método
+documentar(views.ImportarView, 'post', manual_parameters=[formato_param, tamano_lote_param], responses={200: resumen_importacion})
+
+
+##################################
+# Caché:
+
+documentar(views.EstadisticasCacheView, 'get',
+    responses={200: openapi.Response('Estadísticas de la caché', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'aciertos': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'fallos': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'ratio_aciertos': openapi.Schema(type=openapi.TYPE_NUMBER),
+            'entradas': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'max_entradas': openapi.Schema(type=openapi.TYPE_INTEGER),
+            'ttl': openapi.Schema(type=openapi.TYPE_INTEGER)
+        }
+    ))}
+)
+
+documentar(views.RegenerarEsquemaView, 'post',
+    responses={200: openapi.Response('Esquema regenerado', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'etag': openapi.Schema(type=openapi.TYPE_STRING),
+            'bytes': openapi.Schema(type=openapi.TYPE_INTEGER)
+        }
+    ))}
+)
+
+
+##################################
+# Usuario:
+
+login_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['email', 'contrasenha'],
+    properties={
+        'email': openapi.Schema(type=openapi.TYPE_STRING, description="Email del usuario"),
+        'contrasenha': openapi.Schema(type=openapi.TYPE_STRING, description="Contraseña del usuario")
+    }
+)
+
+documentar(views.LoginView, 'post',
+    request_body=login_request,
+    responses={
+        200: openapi.Response('Login exitoso', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'token': openapi.Schema(type=openapi.TYPE_STRING),
+                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )),
+        400: "Credenciales inválidas.",
+        503: "Servidor ocupado."
+    }
+)
+
+documentar(views.LogoutView, 'post',
+    responses={200: openapi.Response('Sesión cerrada', schema=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+    ))}
+)
+
+register_request = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    required=['nombre', 'email', 'contrasenha', 'tipo'],
+    properties={
+        'nombre': openapi.Schema(type=openapi.TYPE_STRING, description="Nombre del usuario"),
+        'email': openapi.Schema(type=openapi.TYPE_STRING, description="Email del usuario"),
+        'contrasenha': openapi.Schema(type=openapi.TYPE_STRING, description="Contraseña del usuario"),
+        'tipo': openapi.Schema(type=openapi.TYPE_STRING, description="Tipo de usuario (organizador, asistente, etc.)"),
+        'biografia': openapi.Schema(type=openapi.TYPE_STRING, description="Biografía (opcional)")
+    }
+)
+
+documentar(views.RegisterView, 'post',
+    request_body=register_request,
+    responses={
+        201: openapi.Response('Usuario registrado', schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
+        )),
+        400: "Faltan datos requeridos o el email ya está registrado.",
+        503: "Servidor ocupado."
+    }
+)
@@ -0,0 +1,112 @@
+"""
+Reparto de lecturas entre la base de datos principal y una réplica de lectura.
+
+Las vistas con ``lectura_replica = True`` (los listados públicos) leen de la réplica
+``ALIAS_LECTURA`` en las peticiones GET/HEAD; todo lo demás, y todas las escrituras, va
+a ``default``. Para que un cliente vea sus propias escrituras aunque la réplica vaya
+retrasada:
+
+- dentro de una petición, en cuanto se escribe, el resto de lecturas van a la principal;
+- la respuesta a una petición que ha escrito lleva la cookie ``REPLICA_COOKIE``, y
+  mientras dure (``REPLICA_RETARDO_MAXIMO`` segundos) ese cliente lee de la principal.
+
+Fuera de una petición (comandos, tests que usan el ORM directamente) todo va a ``default``.
+"""
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_COOKIE = 'leer_primaria'
+METODOS_LECTURA = ('GET', 'HEAD')
+
+
+class EstadoPeticion:
+    def __init__(self):
+        self.replica = False
+        self.escrito = False
+
+
+_estado = contextvars.ContextVar('estado_enrutamiento', default=None)
+
+
+def alias_lectura():
+    return getattr(settings, 'ALIAS_LECTURA', None)
+
+
+def marcar_escritura():
+    """
+    Trata la petición en curso como si hubiera escrito aunque la escritura se haga más
+    tarde (``Proyecto.comentarios_diferidos``): el cliente recibe la cookie y lee de la principal.
+    """
+    estado = _estado.get()
+    if estado is not None:
+        estado.escrito = True
+
+
+class EnrutadorLecturaEscritura:
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None and estado.replica and not estado.escrito and alias_lectura():
+            return alias_lectura()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado.escrito = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica contiene los mismos datos que la principal
+        return True
+
+
+class EnrutamientoLecturasMiddleware:
+    """
+    Decide por petición si las lecturas pueden ir a la réplica y marca con una cookie
+    a los clientes que acaban de escribir.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        estado = EstadoPeticion()
+        token = _estado.set(estado)
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self.marcar(respuesta, estado)
+
+    async def __acall__(self, request):
+        estado = EstadoPeticion()
+        token = _estado.set(estado)
+        try:
+            respuesta = await self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self.marcar(respuesta, estado)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        estado = _estado.get()
+        vista = getattr(view_func, 'view_class', None)
+        if (estado is not None and request.method in METODOS_LECTURA
+                and getattr(vista, 'lectura_replica', False)
+                and REPLICA_COOKIE not in request.COOKIES):
+            estado.replica = True
+
+    def marcar(self, respuesta, estado):
+        if estado.escrito and alias_lectura():
+            respuesta.set_cookie(REPLICA_COOKIE, '1', max_age=getattr(settings, 'REPLICA_RETARDO_MAXIMO', 5),
+                                 httponly=True, samesite='Lax')
+        return respuesta
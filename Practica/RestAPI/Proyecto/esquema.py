@@ -0,0 +1,149 @@
+"""
+Esquema OpenAPI precalculado.
+
+drf_yasg recorre todas las vistas y sus ``swagger_auto_schema`` cada vez que se pide el
+esquema. Aquí se genera una sola vez por proceso (o se carga del fichero que escribe
+``manage.py generar_esquema`` en el despliegue) y se sirve desde memoria, con ETag y una
+copia ya comprimida con gzip. Cada codificación tiene su propio ETag fuerte. Swagger UI y ReDoc lo piden a ``swagger.json``
+(``SPEC_URL`` en ``SWAGGER_SETTINGS``/``REDOC_SETTINGS``).
+
+drf_yasg y ``Proyecto.documentacion`` se importan al generar el esquema o servir la primera
+página de documentación, no al arrancar.
+
+Con ``ESQUEMA_API_FICHERO`` configurado, cada proceso recarga el fichero cuando cambia su
+fecha de modificación, así que regenerarlo en un proceso llega a todos.
+"""
+import gzip
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+
+class EsquemaPrecalculado:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cuerpo = None
+        self._gzip = None
+        self._etag = None
+        self._mtime = None
+
+    def fichero(self):
+        return getattr(settings, 'ESQUEMA_API_FICHERO', None)
+
+    def generar(self):
+        from drf_yasg.codecs import OpenAPICodecJson
+        from drf_yasg.generators import OpenAPISchemaGenerator
+        from .documentacion import INFO
+
+        esquema = OpenAPISchemaGenerator(INFO).get_schema(request=None, public=True)
+        return OpenAPICodecJson(validators=[]).encode(esquema)
+
+    def _publicar(self, cuerpo, mtime=None):
+        self._cuerpo = cuerpo
+        self._gzip = gzip.compress(cuerpo, compresslevel=9)
+        self._etag = '"%s"' % hashlib.sha1(cuerpo).hexdigest()
+        self._mtime = mtime
+
+    def _mtime_fichero(self):
+        try:
+            return os.stat(self.fichero()).st_mtime_ns
+        except OSError:
+            return None
+
+    def regenerar(self):
+        """
+        Genera el esquema de nuevo y, si hay fichero configurado, lo reescribe.
+        """
+        cuerpo = self.generar()
+        with self._lock:
+            fichero = self.fichero()
+            mtime = None
+            if fichero:
+                temporal = f"{fichero}.tmp"
+                with open(temporal, 'wb') as f:
+                    f.write(cuerpo)
+                os.replace(temporal, fichero)
+                mtime = self._mtime_fichero()
+            self._publicar(cuerpo, mtime)
+        return cuerpo
+
+    def obtener(self):
+        """
+        Devuelve ``(cuerpo, cuerpo_gzip, etag)``.
+        """
+        if self.fichero():
+            mtime = self._mtime_fichero()
+            if mtime is None:
+                self.regenerar()
+            elif mtime != self._mtime:
+                with self._lock:
+                    with open(self.fichero(), 'rb') as f:
+                        self._publicar(f.read(), mtime)
+        elif self._cuerpo is None:
+            with self._lock:
+                if self._cuerpo is None:
+                    self._publicar(self.generar())
+        return self._cuerpo, self._gzip, self._etag
+
+    def clear(self):
+        with self._lock:
+            self._cuerpo = self._gzip = self._etag = self._mtime = None
+
+
+esquema_api = EsquemaPrecalculado()
+
+
+def etag_gzip(etag):
+    # Un ETag fuerte identifica bytes concretos: la copia comprimida necesita el suyo
+    return f'{etag[:-1]}-gzip"'
+
+
+class EsquemaView(View):
+    """
+    GET: Esquema OpenAPI en JSON, comprimido con gzip si el cliente lo acepta.
+    """
+
+    def get(self, request):
+        cuerpo, cuerpo_gzip, etag = esquema_api.obtener()
+        comprimido = 'gzip' in request.headers.get('Accept-Encoding', '')
+        if comprimido:
+            cuerpo, etag = cuerpo_gzip, etag_gzip(etag)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            respuesta = HttpResponseNotModified()
+        else:
+            respuesta = HttpResponse(cuerpo, content_type='application/json')
+            if comprimido:
+                respuesta['Content-Encoding'] = 'gzip'
+        respuesta['ETag'] = etag
+        respuesta['Cache-Control'] = 'no-cache'
+        patch_vary_headers(respuesta, ['Accept-Encoding'])
+        return respuesta
+
+
+def vista_documentacion(renderizador):
+    """
+    Página de Swagger UI (``'swagger'``) o ReDoc (``'redoc'``). La vista de drf_yasg se crea
+    en la primera petición.
+    """
+    vista = None
+
+    def documentacion(request, *args, **kwargs):
+        nonlocal vista
+        if vista is None:
+            from drf_yasg.views import get_schema_view
+            from rest_framework import permissions
+            from .documentacion import INFO
+
+            vista = get_schema_view(INFO, public=True, permission_classes=(permissions.AllowAny,)).with_ui(
+                renderizador, cache_timeout=0)
+        return vista(request, *args, **kwargs)
+
+    return csrf_exempt(documentacion)
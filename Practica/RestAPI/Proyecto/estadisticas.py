@@ -0,0 +1,185 @@
+"""
+Estadísticas por evento mantenidas de forma incremental.
+
+Cada alta, modificación o baja de una reserva o un comentario se traduce en incrementos
+sobre la fila de ``EstadisticasEvento`` de su evento (un UPDATE con ``F()`` por evento
+afectado), así que leer las estadísticas es una búsqueda por clave primaria. Las señales
+de ``Proyecto.signals`` cubren las operaciones del ORM; las inserciones masivas
+(``bulk_create``) llaman a ``sumar_reservas`` o ``sumar_comentarios``.
+
+Las filas solo se crean con valores exactos: vacías al crear el evento o recalculadas
+desde las tablas (``reconstruir``). Si un evento no tiene fila, los incrementos se
+ignoran y la fila se calcula la primera vez que se pide (``completar``). Los cálculos
+leen siempre de la base principal, aunque la petición esté leyendo de la réplica.
+"""
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+
+from .models import Eventos, Reservas, Comentarios, EstadisticasEvento
+
+ESTADOS = [estado for estado, _ in Reservas.Estado_Reserva]
+
+
+def _sumar_reserva(cambios, evento_id, estado, entradas, signo):
+    if estado not in ESTADOS:
+        return
+    cambios[evento_id][f'reservas_{estado}'] += signo
+    cambios[evento_id][f'entradas_{estado}'] += signo * entradas
+
+
+def aplicar(cambios, tamano_lote=100):
+    """
+    Aplica ``{evento_id: Counter(campo -> incremento)}`` con un UPDATE por cada
+    ``tamano_lote`` eventos (``CASE`` por campo con el incremento de cada evento).
+    """
+    cambios = [(evento_id, {campo: valor for campo, valor in incrementos.items() if valor})
+               for evento_id, incrementos in cambios.items()]
+    cambios = [(evento_id, incrementos) for evento_id, incrementos in cambios if incrementos]
+    for inicio in range(0, len(cambios), tamano_lote):
+        lote = dict(cambios[inicio:inicio + tamano_lote])
+        campos = {campo for incrementos in lote.values() for campo in incrementos}
+        EstadisticasEvento.objects.filter(evento_id__in=lote).update(**{
+            campo: F(campo) + Case(*(When(evento_id=evento_id, then=Value(incrementos[campo]))
+                                     for evento_id, incrementos in lote.items() if campo in incrementos),
+                                   default=Value(0))
+            for campo in campos
+        })
+
+
+def cambio_reserva(antes, despues):
+    """
+    ``antes`` y ``despues`` son tuplas ``(evento_id, estado, entradas)`` o None (alta/baja).
+    """
+    if (antes is not None and None in antes) or (despues is not None and None in despues):
+        # Valores desconocidos (campos diferidos): se recalculan los eventos implicados
+        reconstruir({valores[0] for valores in (antes, despues) if valores and valores[0] is not None})
+        return
+    cambios = defaultdict(Counter)
+    if antes is not None:
+        _sumar_reserva(cambios, *antes, signo=-1)
+    if despues is not None:
+        _sumar_reserva(cambios, *despues, signo=1)
+    aplicar(cambios)
+
+
+def cambio_comentario(evento_antes, evento_despues):
+    cambios = defaultdict(Counter)
+    if evento_antes is not None:
+        cambios[evento_antes]['comentarios'] -= 1
+    if evento_despues is not None:
+        cambios[evento_despues]['comentarios'] += 1
+    aplicar(cambios)
+
+
+def sumar_reservas(reservas):
+    """
+    Suma reservas recién insertadas en bloque (``bulk_create`` no emite señales).
+    """
+    cambios = defaultdict(Counter)
+    for reserva in reservas:
+        _sumar_reserva(cambios, reserva.evento_id, reserva.estado, reserva.entradas_reservadas, signo=1)
+    aplicar(cambios)
+
+
+def sumar_comentarios(comentarios):
+    """
+    Suma comentarios recién insertados en bloque.
+    """
+    cambios = defaultdict(Counter)
+    for comentario in comentarios:
+        cambios[comentario.evento_id]['comentarios'] += 1
+    aplicar(cambios)
+
+
+def calcular(evento_ids):
+    """
+    Estadísticas exactas de los eventos dados a partir de las reservas y los comentarios.
+    """
+    filas = {evento_id: EstadisticasEvento(evento_id=evento_id) for evento_id in evento_ids}
+    reservas = (Reservas.objects.using(DEFAULT_DB_ALIAS).filter(evento_id__in=filas).values('evento_id', 'estado')
+                .annotate(reservas=Count('id'), entradas=Sum('entradas_reservadas')).order_by())
+    for grupo in reservas:
+        if grupo['estado'] in ESTADOS:
+            setattr(filas[grupo['evento_id']], f"reservas_{grupo['estado']}", grupo['reservas'])
+            setattr(filas[grupo['evento_id']], f"entradas_{grupo['estado']}", grupo['entradas'])
+    comentarios = (Comentarios.objects.using(DEFAULT_DB_ALIAS).filter(evento_id__in=filas).values('evento_id')
+                   .annotate(total=Count('id')).order_by())
+    for grupo in comentarios:
+        filas[grupo['evento_id']].comentarios = grupo['total']
+    return list(filas.values())
+
+
+def reconstruir(evento_ids=None, tamano_lote=1000):
+    """
+    Recalcula las filas de los eventos dados (o de todos), sustituyendo las existentes, y
+    devuelve cuántas se escribieron.
+    """
+    eventos = Eventos.objects.using(DEFAULT_DB_ALIAS)
+    if evento_ids is None:
+        evento_ids = eventos.order_by('id').values_list('id', flat=True).iterator(chunk_size=tamano_lote)
+    else:
+        # Solo eventos que siguen existiendo
+        evento_ids = eventos.filter(id__in=list(evento_ids)).values_list('id', flat=True)
+    escritas = 0
+    lote = []
+    for evento_id in evento_ids:
+        lote.append(evento_id)
+        if len(lote) >= tamano_lote:
+            escritas += _guardar(calcular(lote))
+            lote = []
+    if lote:
+        escritas += _guardar(calcular(lote))
+    return escritas
+
+
+def completar(evento_ids):
+    """
+    Crea las filas que faltan de los eventos dados. Si otra petición crea alguna a la vez,
+    se conserva la suya: nunca se sustituye una fila existente.
+    """
+    # Solo eventos que siguen existiendo
+    evento_ids = list(Eventos.objects.using(DEFAULT_DB_ALIAS).filter(id__in=list(evento_ids))
+                      .values_list('id', flat=True))
+    if evento_ids:
+        EstadisticasEvento.objects.bulk_create(calcular(evento_ids), ignore_conflicts=True)
+    return len(evento_ids)
+
+
+def _guardar(filas):
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        EstadisticasEvento.objects.filter(evento_id__in=[fila.evento_id for fila in filas]).delete()
+        EstadisticasEvento.objects.bulk_create(filas)
+    return len(filas)
+
+
+def obtener(evento_id):
+    """
+    Fila de estadísticas del evento (con el evento cargado), o None si el evento no existe.
+    """
+    consulta = EstadisticasEvento.objects.select_related('evento').filter(evento_id=evento_id)
+    fila = consulta.first()
+    if fila is None:
+        completar([evento_id])
+        fila = consulta.using(DEFAULT_DB_ALIAS).first()
+    return fila
+
+
+async def aobtener(evento_id):
+    """
+    Versión asíncrona de ``obtener`` (sin cargar el evento). Si falta la fila se calcula en un hilo.
+    """
+    fila = await EstadisticasEvento.objects.filter(evento_id=evento_id).afirst()
+    if fila is None:
+        fila = await sync_to_async(obtener)(evento_id)
+    return fila
+
+
+def total_reservas(fila):
+    return sum(getattr(fila, f'reservas_{estado}') for estado in ESTADOS)
+
+
+def total_comentarios(fila):
+    return fila.comentarios
@@ -0,0 +1,68 @@
+"""
+Exportación en streaming de eventos y reservas (NDJSON o CSV).
+
+Las filas se leen con ``.values_list().iterator(chunk_size=...)`` y se escriben en
+trozos según se generan, así que la memoria usada no depende del número de filas.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+CAMPOS_EVENTO = ('id', 'titulo', 'descripcion', 'fecha', 'capacidad', 'url', 'organizador')
+CAMPOS_RESERVA = ('id', 'usuario', 'evento', 'entradas_reservadas', 'estado')
+
+FORMATOS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+TAMANO_TROZO = getattr(settings, 'EXPORTACION_TAMANO_TROZO', 2000)
+
+
+class _Eco:
+    """
+    Pseudo-fichero para ``csv.writer``: devuelve la línea en lugar de almacenarla.
+    """
+    def write(self, valor):
+        return valor
+
+
+def _valor(valor):
+    return valor.isoformat() if hasattr(valor, 'isoformat') else valor
+
+
+def generar_ndjson(filas, campos):
+    trozo = []
+    for fila in filas:
+        trozo.append(json.dumps(dict(zip(campos, map(_valor, fila))), ensure_ascii=False))
+        if len(trozo) >= TAMANO_TROZO:
+            yield '\n'.join(trozo) + '\n'
+            trozo = []
+    if trozo:
+        yield '\n'.join(trozo) + '\n'
+
+
+def generar_csv(filas, campos):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(campos)
+    trozo = []
+    for fila in filas:
+        trozo.append(escritor.writerow([_valor(v) for v in fila]))
+        if len(trozo) >= TAMANO_TROZO:
+            yield ''.join(trozo)
+            trozo = []
+    if trozo:
+        yield ''.join(trozo)
+
+
+def respuesta_exportacion(queryset, campos, formato, nombre):
+    """
+    Devuelve una ``StreamingHttpResponse`` con las filas del queryset en el formato pedido.
+    """
+    filas = queryset.order_by('id').values_list(*campos).iterator(chunk_size=TAMANO_TROZO)
+    generador = generar_csv if formato == 'csv' else generar_ndjson
+    respuesta = StreamingHttpResponse(generador(filas, campos), content_type=FORMATOS[formato])
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre}.{formato}"'
+    return respuesta
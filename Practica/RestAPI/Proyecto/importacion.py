@@ -0,0 +1,217 @@
+"""
+Importación incremental de eventos y reservas desde NDJSON o CSV.
+
+La entrada se recorre línea a línea (de la petición o de un fichero) y se escribe con
+``bulk_create`` en lotes de tamaño configurable, cada uno en su propia transacción. Solo
+se mantiene en memoria el lote en curso. Las filas inválidas se saltan y se informan con
+el código HTTP que habría tenido su alta individual. Las reservas pasan por el control de
+aforo de ``Proyecto.motor_reservas``.
+"""
+import codecs
+import csv
+import datetime
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+
+from . import busqueda, estadisticas
+from .models import UsuarioPersonalizado, Eventos, Reservas
+from .motor_reservas import ESTADOS_RESERVA, ocupa_plazas, reservar_por_evento
+from .versiones import registrar_cambios
+
+FORMATOS = ('ndjson', 'csv')
+TAMANO_LOTE = getattr(settings, 'IMPORTACION_TAMANO_LOTE', 1000)
+MAX_ERRORES = 100
+
+
+class ErrorFila(ValueError):
+    pass
+
+
+def leer_registros(lineas, formato):
+    """
+    Convierte un iterable de líneas en bytes en tuplas ``(numero_linea, registro, error)``.
+    """
+    texto = codecs.iterdecode(lineas, 'utf-8-sig')
+    if formato == 'csv':
+        lector = csv.DictReader(texto)
+        try:
+            for registro in lector:
+                yield lector.line_num, registro, None
+        except csv.Error as e:
+            yield lector.line_num, None, f"CSV inválido: {e}"
+        return
+
+    for numero, linea in enumerate(texto, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            registro = json.loads(linea)
+        except ValueError:
+            yield numero, None, "JSON inválido."
+            continue
+        if not isinstance(registro, dict):
+            yield numero, None, "Cada línea debe ser un objeto JSON."
+            continue
+        yield numero, registro, None
+
+
+def _texto(registro, campo, max_length=None, obligatorio=True):
+    valor = registro.get(campo)
+    if valor in (None, ''):
+        if obligatorio:
+            raise ErrorFila(f"Falta el campo '{campo}'.")
+        return None
+    valor = str(valor)
+    if max_length and len(valor) > max_length:
+        raise ErrorFila(f"'{campo}' supera los {max_length} caracteres.")
+    return valor
+
+
+def _entero(registro, campo, minimo=0):
+    try:
+        valor = int(registro.get(campo))
+    except (TypeError, ValueError):
+        raise ErrorFila(f"'{campo}' debe ser un entero.")
+    if valor < minimo:
+        raise ErrorFila(f"'{campo}' debe ser mayor o igual que {minimo}.")
+    return valor
+
+
+def evento_desde_registro(registro, organizador):
+    try:
+        fecha = datetime.date.fromisoformat(str(registro.get('fecha')))
+    except ValueError:
+        raise ErrorFila("'fecha' debe tener el formato YYYY-MM-DD.")
+    return Eventos(
+        titulo=_texto(registro, 'titulo', 100),
+        descripcion=_texto(registro, 'descripcion', 100, obligatorio=False) or "",
+        fecha=fecha,
+        capacidad=_entero(registro, 'capacidad'),
+        url=_texto(registro, 'url', 200, obligatorio=False),
+        organizador=organizador,
+    )
+
+
+def reserva_desde_registro(registro):
+    estado = registro.get('estado') or 'pendiente'
+    if estado not in ESTADOS_RESERVA:
+        raise ErrorFila(f"Estado '{estado}' inválido.")
+    return Reservas(
+        usuario_id=_entero(registro, 'usuario', 1),
+        evento_id=_entero(registro, 'evento', 1),
+        entradas_reservadas=_entero(registro, 'entradas_reservadas', 1),
+        estado=estado,
+    )
+
+
+class Importacion:
+    """
+    Recorre los registros, agrupa en lotes y acumula el resumen de la importación.
+    """
+
+    def __init__(self, tamano_lote=None):
+        self.tamano_lote = tamano_lote or TAMANO_LOTE
+        self.importados = 0
+        self.errores_totales = 0
+        self.errores = []
+
+    def error(self, numero, mensaje, codigo=status.HTTP_400_BAD_REQUEST):
+        self.errores_totales += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"linea": numero, "status": codigo, "error": mensaje})
+
+    def ejecutar(self, registros):
+        lote = []
+        for numero, registro, error in registros:
+            if error is None:
+                try:
+                    lote.append((numero, self.convertir(registro)))
+                except ErrorFila as e:
+                    error = str(e)
+            if error is not None:
+                self.error(numero, error)
+            if len(lote) >= self.tamano_lote:
+                self.guardar_lote(lote)
+                lote = []
+        if lote:
+            self.guardar_lote(lote)
+        return self.resumen()
+
+    def resumen(self):
+        return {
+            "importados": self.importados,
+            "errores_totales": self.errores_totales,
+            "errores": self.errores,
+        }
+
+    def convertir(self, registro):
+        raise NotImplementedError
+
+    def guardar_lote(self, lote):
+        raise NotImplementedError
+
+
+class ImportacionEventos(Importacion):
+
+    def __init__(self, organizador, tamano_lote=None):
+        super().__init__(tamano_lote)
+        self.organizador = organizador
+
+    def convertir(self, registro):
+        return evento_desde_registro(registro, self.organizador)
+
+    def guardar_lote(self, lote):
+        with transaction.atomic():
+            creados = Eventos.objects.bulk_create([evento for _, evento in lote])
+            busqueda.indexar_eventos(creados)
+            registrar_cambios('eventos')
+        self.importados += len(creados)
+
+
+class ImportacionReservas(Importacion):
+    """
+    Con ``organizador`` solo se aceptan reservas de sus eventos (el comando ``importar``
+    puede omitirlo). Las filas que no caben en el aforo se rechazan con 409.
+    """
+
+    def __init__(self, organizador=None, tamano_lote=None):
+        super().__init__(tamano_lote)
+        self.organizador = organizador
+
+    def convertir(self, registro):
+        return reserva_desde_registro(registro)
+
+    def guardar_lote(self, lote):
+        usuarios = set(UsuarioPersonalizado.objects.filter(id__in={r.usuario_id for _, r in lote})
+                       .values_list('id', flat=True))
+        eventos = dict(Eventos.objects.filter(id__in={r.evento_id for _, r in lote})
+                       .values_list('id', 'organizador_id'))
+        por_evento = defaultdict(list)
+        for numero, reserva in lote:
+            if reserva.usuario_id not in usuarios:
+                self.error(numero, "Usuario no encontrado.", status.HTTP_404_NOT_FOUND)
+            elif reserva.evento_id not in eventos:
+                self.error(numero, "Evento no encontrado.", status.HTTP_404_NOT_FOUND)
+            elif self.organizador is not None and eventos[reserva.evento_id] != self.organizador.pk:
+                self.error(numero, "El evento pertenece a otro organizador.", status.HTTP_403_FORBIDDEN)
+            else:
+                por_evento[reserva.evento_id].append((numero, reserva))
+        if not por_evento:
+            return
+
+        with transaction.atomic():
+            validas, rechazadas = reservar_por_evento(
+                por_evento, lambda fila: fila[1].entradas_reservadas if ocupa_plazas(fila[1].estado) else 0)
+            validas = [reserva for _, reserva in validas]
+            if validas:
+                Reservas.objects.bulk_create(validas)
+                estadisticas.sumar_reservas(validas)
+                registrar_cambios(*{f'reservas:{reserva.evento_id}' for reserva in validas})
+        for (numero, _), e in rechazadas:
+            self.error(numero, str(e), status.HTTP_409_CONFLICT)
+        self.importados += len(validas)
@@ -0,0 +1,113 @@
+"""
+Instrumentación por petición: número de consultas SQL, tiempo en base de datos y tiempo total.
+
+``InstrumentacionMiddleware`` añade a cada respuesta la cabecera ``Server-Timing``
+(``vista``, ``bd`` y ``consultas``), que los navegadores muestran en la pestaña de red, y
+registra en el logger ``Proyecto.instrumentacion`` las peticiones que superan
+``INSTRUMENTACION_MAX_CONSULTAS`` consultas o ``INSTRUMENTACION_MAX_MS`` milisegundos, con
+el SQL que ejecutaron.
+
+Con ``INSTRUMENTACION = False`` el middleware lanza ``MiddlewareNotUsed`` al cargarse: Django
+lo quita de la cadena y no se instala ningún envoltorio en las conexiones, así que no cuesta
+nada. El tiempo de ``vista`` es el de todo lo que hay por debajo del middleware (debe ir el
+primero en ``MIDDLEWARE``); en las respuestas en streaming no incluye el envío del cuerpo.
+"""
+import contextvars
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class Medicion:
+    def __init__(self):
+        self.consultas = []  # (sql, milisegundos)
+        self.tiempo_bd = 0.0
+
+    def server_timing(self, tiempo_vista):
+        return (f'vista;dur={tiempo_vista:.1f}, bd;dur={self.tiempo_bd:.1f}, '
+                f'consultas;desc="{len(self.consultas)}"')
+
+
+# Las vistas asíncronas consultan desde otro hilo; sync_to_async copia el contexto, así que
+# la medición de la petición también llega allí.
+_medicion = contextvars.ContextVar('medicion_peticion', default=None)
+
+
+def registrar_consulta(execute, sql, params, many, context):
+    medicion = _medicion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = (time.perf_counter() - inicio) * 1000
+        medicion.consultas.append((sql, duracion))
+        medicion.tiempo_bd += duracion
+
+
+def instalar_registro(sender=None, connection=None, **kwargs):
+    if registrar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(registrar_consulta)
+
+
+class InstrumentacionMiddleware:
+    """
+    Mide cada petición y añade ``Server-Timing``; avisa de las que superan los umbrales.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTACION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.max_consultas = getattr(settings, 'INSTRUMENTACION_MAX_CONSULTAS', 20)
+        self.max_ms = getattr(settings, 'INSTRUMENTACION_MAX_MS', 500)
+        # Conexiones que se abran a partir de ahora (cada hilo tiene las suyas) y las ya abiertas en este
+        connection_created.connect(instalar_registro, dispatch_uid='instrumentacion')
+        for conexion in connections.all(initialized_only=True):
+            instalar_registro(connection=conexion)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicion = Medicion()
+        token = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            respuesta = self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self.terminar(request, respuesta, medicion, inicio)
+
+    async def __acall__(self, request):
+        medicion = Medicion()
+        token = _medicion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            respuesta = await self.get_response(request)
+        finally:
+            _medicion.reset(token)
+        return self.terminar(request, respuesta, medicion, inicio)
+
+    def terminar(self, request, respuesta, medicion, inicio):
+        tiempo_vista = (time.perf_counter() - inicio) * 1000
+        respuesta['Server-Timing'] = medicion.server_timing(tiempo_vista)
+        if len(medicion.consultas) > self.max_consultas or tiempo_vista > self.max_ms:
+            logger.warning(
+                "%s %s -> %s: %d consultas, %.1f ms en base de datos, %.1f ms en total\n%s",
+                request.method, request.get_full_path(), respuesta.status_code, len(medicion.consultas),
+                medicion.tiempo_bd, tiempo_vista,
+                "\n".join(f"  [{duracion:.1f} ms] {sql}" for sql, duracion in medicion.consultas),
+            )
+        return respuesta
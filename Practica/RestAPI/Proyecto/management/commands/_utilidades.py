@@ -0,0 +1,142 @@
+"""
+Utilidades compartidas por los comandos de benchmark y de estrés.
+"""
+import asyncio
+import io
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import override_settings
+from django.test.utils import (setup_databases, setup_test_environment, teardown_databases,
+                               teardown_test_environment)
+
+
+@contextmanager
+def base_datos_temporal():
+    """
+    Crea la base de datos de tests (un fichero SQLite, ver ``DATABASES['default']['TEST']``)
+    para los benchmarks que necesitan datos confirmados visibles desde varios hilos, y la
+    destruye al terminar. También habilita ``testserver`` para usar el cliente de Django.
+    Solo se crea la base principal y todas las lecturas van a ella (sin réplica).
+    """
+    setup_test_environment()
+    try:
+        configuracion = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            with override_settings(ALIAS_LECTURA=None):
+                yield
+        finally:
+            teardown_databases(configuracion, verbosity=0)
+    finally:
+        teardown_test_environment()
+
+
+@contextmanager
+def perfil_bd(produccion):
+    """
+    Aplica el perfil de producción de SQLite o la configuración por defecto de Django a
+    las conexiones que se abran dentro del bloque.
+    """
+    ajustes = connections.settings[DEFAULT_DB_ALIAS]
+    originales = {clave: ajustes.get(clave) for clave in ('OPTIONS', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+    if produccion:
+        ajustes.update(settings.SQLITE_CONEXIONES_PRODUCCION)
+    else:
+        ajustes.update(OPTIONS={}, CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False)
+    connections.close_all()
+    try:
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_PRAGMAS_PRODUCCION if produccion else {}):
+            yield
+    finally:
+        connections.close_all()
+        ajustes.update(originales)
+
+
+class ContadorBloqueos(logging.Handler):
+    """
+    Cuenta los errores 500 causados por ``database is locked`` y los separa del resto.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bloqueos = 0
+        self.otros = 0
+
+    def emit(self, record):
+        excepcion = record.exc_info[1] if record.exc_info else None
+        if isinstance(excepcion, OperationalError) and 'locked' in str(excepcion):
+            self.bloqueos += 1
+        elif excepcion is not None:
+            self.otros += 1
+
+
+@contextmanager
+def contar_bloqueos():
+    logger = logging.getLogger('django.request')
+    contador = ContadorBloqueos()
+    propagar = logger.propagate
+    logger.addHandler(contador)
+    logger.propagate = False
+    try:
+        yield contador
+    finally:
+        logger.removeHandler(contador)
+        logger.propagate = propagar
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def peticion_wsgi(aplicacion, ruta, query='', metodo='GET', cuerpo=b'', cabeceras=None):
+    """
+    Entrega una petición a la aplicación WSGI como lo haría el servidor y devuelve el código.
+    ``cabeceras`` usa las claves del entorno WSGI (p. ej. ``HTTP_AUTHORIZATION``).
+    """
+    codigo = []
+    entorno = {
+        'REQUEST_METHOD': metodo, 'PATH_INFO': ruta, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'HTTP_HOST': 'testserver',
+        'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(cuerpo)),
+        'wsgi.input': io.BytesIO(cuerpo), 'wsgi.url_scheme': 'http',
+        **(cabeceras or {}),
+    }
+    respuesta = aplicacion(entorno, lambda estado, cabeceras, exc_info=None: codigo.append(int(estado[:3])))
+    try:
+        b''.join(respuesta)
+    finally:
+        if hasattr(respuesta, 'close'):
+            respuesta.close()
+    return codigo[0]
+
+
+async def peticion_asgi(aplicacion, ruta, query):
+    """
+    Una conexión HTTP como la abriría uvicorn: un scope, el cuerpo vacío y la espera
+    de la desconexión mientras se genera la respuesta.
+    """
+    mensajes = []
+    cuerpo_enviado = False
+
+    async def receive():
+        nonlocal cuerpo_enviado
+        if not cuerpo_enviado:
+            cuerpo_enviado = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(mensaje):
+        mensajes.append(mensaje)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': ruta, 'raw_path': ruta.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    await aplicacion(scope, receive, send)
+    return mensajes[0]['status']
@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+MODOS = (
+    # (nombre, módulos importados al arrancar además de la URLconf); el segundo reproduce
+    # lo que cargaban antes views.py y urls.py (esquemas de drf_yasg y get_schema_view)
+    ("documentación perezosa", []),
+    ("documentación al arrancar", ["Proyecto.documentacion", "drf_yasg.views"]),
+)
+
+# Se ejecuta en un proceso nuevo con ``python -X importtime``: mide el arranque del worker
+# (django.setup, URLconf y aplicación WSGI) y la primera petición a un listado y al esquema.
+MARCA = "-- fin del arranque --"
+PROCESO = """
+import importlib, json, sys, time
+modulos, marca = json.loads(sys.argv[1]), sys.argv[2]
+inicio = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+importlib.import_module(settings.ROOT_URLCONF)
+for modulo in modulos:
+    importlib.import_module(modulo)
+from django.core.wsgi import get_wsgi_application
+aplicacion = get_wsgi_application()
+arranque = time.perf_counter() - inicio
+print(marca, file=sys.stderr, flush=True)
+from django.urls import reverse
+from Proyecto.management.commands._utilidades import base_datos_temporal, peticion_wsgi
+resultado = {"arranque": arranque}
+with base_datos_temporal():
+    for clave, ruta in (("listado", reverse("listar_evento")), ("esquema", reverse("schema-json"))):
+        inicio = time.perf_counter()
+        codigo = peticion_wsgi(aplicacion, ruta)
+        resultado[clave] = time.perf_counter() - inicio
+        resultado["codigo_" + clave] = codigo
+print(json.dumps(resultado))
+"""
+
+
+def leer_importtime(salida):
+    """
+    Devuelve el tiempo acumulado de las importaciones de primer nivel (en segundos) y los
+    módulos de drf_yasg importados durante el arranque, a partir de la salida de ``-X importtime``.
+    """
+    total, drf_yasg = 0, 0
+    for linea in salida.splitlines():
+        if linea == MARCA:
+            break
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, modulo = linea[len("import time:"):].split("|")
+        if not modulo[1:].startswith(" "):
+            total += int(acumulado)
+        if modulo.strip().split(".")[0] == "drf_yasg":
+            drf_yasg += 1
+    return total / 1e6, drf_yasg
+
+
+class Command(BaseCommand):
+    help = ("Mide el arranque en frío de un worker en procesos nuevos (python -X importtime): tiempo de "
+            "importación, módulos de drf_yasg cargados y latencia de la primera petición a un listado y a "
+            "swagger.json, con la documentación OpenAPI cargada de forma perezosa o al arrancar.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def medir(self, modulos):
+        entorno = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "RestAPI.settings")}
+        proceso = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROCESO, json.dumps(modulos), MARCA],
+            cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True, check=True,
+        )
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+        resultado["importacion"], resultado["drf_yasg"] = leer_importtime(proceso.stderr)
+        return resultado
+
+    def handle(self, *args, **options):
+        for nombre, modulos in MODOS:
+            medidas = [self.medir(modulos) for _ in range(options['repeticiones'])]
+
+            def mediana(clave):
+                return statistics.median(m[clave] for m in medidas) * 1000
+
+            errores = sum(1 for m in medidas for c in ("codigo_listado", "codigo_esquema") if m[c] != 200)
+            self.stdout.write(
+                f"{nombre:<26} importaciones {mediana('importacion'):6.0f} ms  arranque {mediana('arranque'):6.0f} ms  "
+                f"módulos drf_yasg {medidas[0]['drf_yasg']:3d}  1ª petición listado {mediana('listado'):6.1f} ms  "
+                f"1ª petición swagger.json {mediana('esquema'):6.1f} ms  errores {errores}"
+            )
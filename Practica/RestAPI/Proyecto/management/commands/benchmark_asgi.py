@@ -0,0 +1,119 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from Proyecto.models import UsuarioPersonalizado, Eventos, Reservas, Comentarios
+
+from ._utilidades import base_datos_temporal, percentil, peticion_asgi, peticion_wsgi
+
+MODOS = (
+    # (nombre, servidor, URLconf)
+    ("WSGI + APIView", "wsgi", "RestAPI.urls"),
+    ("ASGI + APIView", "asgi", "RestAPI.urls"),
+    ("ASGI + vistas async", "asgi", "RestAPI.urls_async"),
+)
+
+
+class Command(BaseCommand):
+    help = ("Compara el rendimiento de los listados públicos con conexiones concurrentes: WSGI con un hilo "
+            "por conexión frente a ASGI (como bajo uvicorn) con las APIView síncronas y con las vistas de "
+            "Proyecto.vistas_async. Las peticiones se entregan en proceso, sin red, sobre una base de datos "
+            "temporal.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=2000)
+        parser.add_argument('--concurrencia', type=int, default=64)
+        parser.add_argument('--eventos', type=int, default=1000)
+
+    def sembrar(self, n):
+        organizador = UsuarioPersonalizado.objects.create(
+            username="bench@example.com", nombre="Bench", email="bench@example.com", contrasenha="x", tipo="organizador",
+        )
+        eventos = Eventos.objects.bulk_create([
+            Eventos(titulo=f"Evento {i}", descripcion="desc", fecha="2025-01-01", capacidad=100, organizador=organizador)
+            for i in range(n)
+        ])
+        Reservas.objects.bulk_create([Reservas(usuario=organizador, evento=evento, entradas_reservadas=1)
+                                      for evento in eventos[:50] for _ in range(20)])
+        Comentarios.objects.bulk_create([Comentarios(texto="comentario", evento=evento)
+                                         for evento in eventos[:50] for _ in range(20)])
+        return [evento.id for evento in eventos[:50]]
+
+    def rutas(self, ids, eventos, peticiones):
+        # Solo páginas que existen: con menos de 1000 eventos hay menos de 50
+        paginas = min(50, -(-eventos // 20))
+        rutas = []
+        for i in range(peticiones):
+            tipo = i % 3
+            if tipo == 0:
+                rutas.append((reverse("listar_evento"), urlencode({"pagina": i % paginas + 1, "limite": 20})))
+            elif tipo == 1:
+                rutas.append((reverse("listar_reservas", args=[ids[i % len(ids)]]), ""))
+            else:
+                rutas.append((reverse("listar_comentarios", args=[ids[i % len(ids)]]), "limite=10"))
+        return rutas
+
+    def wsgi(self, rutas, concurrencia):
+        aplicacion = get_wsgi_application()
+
+        def trabajador(parte):
+            resultado = []
+            try:
+                for ruta, query in parte:
+                    inicio = time.perf_counter()
+                    codigo = peticion_wsgi(aplicacion, ruta, query)
+                    resultado.append((codigo, time.perf_counter() - inicio))
+            finally:
+                connection.close()
+            return resultado
+
+        with ThreadPoolExecutor(max_workers=concurrencia) as hilos:
+            partes = hilos.map(trabajador, [rutas[h::concurrencia] for h in range(concurrencia)])
+            return [r for parte in partes for r in parte]
+
+    def asgi(self, rutas, concurrencia):
+        aplicacion = get_asgi_application()
+
+        async def conexion(parte):
+            resultado = []
+            for ruta, query in parte:
+                inicio = time.perf_counter()
+                codigo = await peticion_asgi(aplicacion, ruta, query)
+                resultado.append((codigo, time.perf_counter() - inicio))
+            return resultado
+
+        async def principal():
+            partes = await asyncio.gather(*(conexion(rutas[h::concurrencia]) for h in range(concurrencia)))
+            return [r for parte in partes for r in parte]
+
+        return asyncio.run(principal())
+
+    def handle(self, *args, **options):
+        peticiones, concurrencia = options['peticiones'], options['concurrencia']
+        with base_datos_temporal():
+            ids = self.sembrar(options['eventos'])
+            rutas = self.rutas(ids, options['eventos'], peticiones)
+            self.stdout.write(f"{peticiones} peticiones, {concurrencia} conexiones concurrentes")
+            for nombre, servidor, urlconf in MODOS:
+                with override_settings(ROOT_URLCONF=urlconf):
+                    # Calentamiento: importaciones, caché de respuestas y sellos de versión
+                    getattr(self, servidor)(rutas[:concurrencia], concurrencia)
+                    inicio = time.perf_counter()
+                    resultado = getattr(self, servidor)(rutas, concurrencia)
+                    duracion = time.perf_counter() - inicio
+                latencias = [l for _, l in resultado]
+                errores = sum(1 for codigo, _ in resultado if codigo != 200)
+                self.stdout.write(
+                    f"{nombre:<22} {peticiones / duracion:8.0f} petición/s  "
+                    f"p50 {statistics.median(latencias) * 1000:7.1f} ms  p95 {percentil(latencias, 95) * 1000:7.1f} ms  "
+                    f"p99 {percentil(latencias, 99) * 1000:7.1f} ms  errores {errores}"
+                )
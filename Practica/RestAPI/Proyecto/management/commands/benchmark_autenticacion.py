@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+
+from Proyecto.autenticacion import TokenAuthenticationCacheada, cache_tokens
+from Proyecto.models import UsuarioPersonalizado
+
+
+class Command(BaseCommand):
+    help = ("Compara TokenAuthentication con TokenAuthenticationCacheada autenticando la misma "
+            "petición repetidas veces. Los datos de prueba se crean en una transacción que se revierte.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=5000)
+
+    def medir(self, clase, request, peticiones):
+        autenticador = clase()
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            for _ in range(peticiones):
+                autenticador.authenticate(request)
+            duracion = time.perf_counter() - inicio
+        return duracion, len(consultas.captured_queries)
+
+    def handle(self, *args, **options):
+        peticiones = options['peticiones']
+        with transaction.atomic():
+            usuario = UsuarioPersonalizado.objects.create(
+                username="benchmark@example.com", nombre="Benchmark", email="benchmark@example.com",
+                contrasenha="x", tipo="organizador",
+            )
+            token = Token.objects.create(user=usuario)
+            request = Request(RequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {token.key}"))
+            cache_tokens.clear()
+
+            for nombre, clase in (("TokenAuthentication", TokenAuthentication),
+                                  ("TokenAuthenticationCacheada", TokenAuthenticationCacheada)):
+                duracion, consultas = self.medir(clase, request, peticiones)
+                self.stdout.write(
+                    f"{nombre:<28} {duracion / peticiones * 1e6:8.1f} µs/petición  "
+                    f"{peticiones / duracion:10.0f} petición/s  {consultas} consultas"
+                )
+            transaction.set_rollback(True)
+        cache_tokens.clear()
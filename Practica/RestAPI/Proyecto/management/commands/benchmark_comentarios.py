@@ -0,0 +1,107 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from Proyecto.comentarios_diferidos import buffer_comentarios
+from Proyecto.models import UsuarioPersonalizado, Eventos, Comentarios
+
+from ._utilidades import base_datos_temporal, contar_bloqueos, percentil, peticion_wsgi
+
+
+class Command(BaseCommand):
+    help = ("Compara la creación de comentarios en ráfaga (varios hilos publicando a la vez, con lecturas del "
+            "listado intercaladas) insertando cada comentario en su propia transacción y con la escritura "
+            "diferida de Proyecto.comentarios_diferidos. Al terminar comprueba que todos los comentarios "
+            "aceptados están en la base de datos y en el listado.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=16)
+        parser.add_argument('--peticiones', type=int, default=200, help="Peticiones por hilo")
+        parser.add_argument('--lecturas', type=float, default=0.2, help="Proporción de lecturas del listado (0-1)")
+        parser.add_argument('--eventos', type=int, default=5)
+
+    def sembrar(self, eventos):
+        organizador = UsuarioPersonalizado.objects.create(
+            username="org@example.com", nombre="Org", email="org@example.com", contrasenha="x", tipo="organizador",
+        )
+        ids = [Eventos.objects.create(titulo=f"Evento {i}", descripcion="", fecha="2025-01-01", capacidad=10,
+                                      organizador=organizador).id
+               for i in range(eventos)]
+        return ids, Token.objects.create(user=organizador).key
+
+    def pasada(self, hilos, peticiones, lecturas, ids, token):
+        aplicacion = get_wsgi_application()
+        cabeceras = {'HTTP_AUTHORIZATION': f"Token {token}"}
+
+        def trabajador(indice):
+            resultado = []
+            try:
+                for i in range(peticiones):
+                    evento = ids[(indice + i) % len(ids)]
+                    lectura = (indice * peticiones + i) % 100 < lecturas * 100
+                    inicio = time.perf_counter()
+                    if lectura:
+                        codigo = peticion_wsgi(aplicacion, reverse("listar_comentarios", args=[evento]))
+                    else:
+                        cuerpo = json.dumps({"texto": f"Comentario {indice}-{i}"}).encode()
+                        codigo = peticion_wsgi(aplicacion, reverse("crear_comentario", args=[evento]), metodo='POST',
+                                               cuerpo=cuerpo, cabeceras=cabeceras)
+                    resultado.append((lectura, codigo, time.perf_counter() - inicio))
+            finally:
+                connection.close()
+            return resultado
+
+        with contar_bloqueos() as contador, ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            inicio = time.perf_counter()
+            resultado = [r for parte in ejecutor.map(trabajador, range(hilos)) for r in parte]
+            duracion = time.perf_counter() - inicio
+        # Lo que quede en el buffer (el hilo de fondo lo escribiría en COMENTARIOS_INTERVALO)
+        inicio = time.perf_counter()
+        buffer_comentarios.vaciar()
+        vaciado_final = time.perf_counter() - inicio
+
+        escrituras = [r for r in resultado if not r[0]]
+        aceptados = sum(1 for _, codigo, _ in escrituras if codigo in (201, 202))
+        guardados = Comentarios.objects.count()
+        # El listado (con su caché y sus ETag) debe incluir todo lo escrito
+        cliente = Client()
+        listados = sum(cliente.get(reverse("listar_comentarios", args=[evento]), {"limite": 1}).json()["count"]
+                       for evento in ids)
+        return {
+            "comentarios_s": aceptados / duracion,
+            "peticiones_s": sum(1 for _, codigo, _ in resultado if codigo < 300) / duracion,
+            "p50_ms": statistics.median(latencia for _, _, latencia in escrituras) * 1000,
+            "p95_ms": percentil([latencia for _, _, latencia in escrituras], 95) * 1000,
+            "bloqueos": contador.bloqueos,
+            "otros_errores": contador.otros,
+            "aceptados": aceptados,
+            "guardados": guardados,
+            "listados": listados,
+            "vaciado_final_ms": vaciado_final * 1000,
+        }
+
+    def handle(self, *args, **options):
+        hilos, peticiones, lecturas = options['hilos'], options['peticiones'], options['lecturas']
+        self.stdout.write(f"{hilos} hilos x {peticiones} peticiones, {lecturas:.0%} lecturas del listado")
+        resultados = {}
+        for nombre, diferidos in (("directo", False), ("diferido", True)):
+            with override_settings(COMENTARIOS_DIFERIDOS=diferidos), base_datos_temporal():
+                ids, token = self.sembrar(options['eventos'])
+                r = resultados[nombre] = self.pasada(hilos, peticiones, lecturas, ids, token)
+            self.stdout.write(
+                f"{nombre:<9} {r['comentarios_s']:7.0f} comentarios/s  {r['peticiones_s']:7.0f} petición/s  "
+                f"p50 {r['p50_ms']:6.1f} ms  p95 {r['p95_ms']:6.1f} ms  'database is locked' {r['bloqueos']:4}  "
+                f"otros errores {r['otros_errores']:3}  aceptados {r['aceptados']}  guardados {r['guardados']}  "
+                f"en el listado {r['listados']}  vaciado final {r['vaciado_final_ms']:.1f} ms"
+            )
+        base = resultados["directo"]["comentarios_s"]
+        if base:
+            self.stdout.write(f"Mejora con escritura diferida: {resultados['diferido']['comentarios_s'] / base - 1:+.0%}")
@@ -0,0 +1,371 @@
+import datetime
+import json
+import platform
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.authtoken.models import Token
+
+from Proyecto import busqueda, estadisticas
+from Proyecto.models import UsuarioPersonalizado, Eventos, Reservas, Comentarios
+from Proyecto.motor_reservas import recalcular_entradas_vendidas
+
+from ._utilidades import base_datos_temporal, contar_bloqueos, percentil, perfil_bd
+
+ESTADOS = ('pendiente', 'confirmada', 'cancelada')
+CONTRASENHA = "benchmark"
+LIMITE_PAGINA = 20
+CONSULTAS = re.compile(r'consultas;desc="(\d+)"')
+
+
+def leer_escala(valor):
+    """
+    Número de eventos: ``1000``, ``1k``, ``100k``, ``1M``...
+    """
+    multiplicadores = {'k': 10 ** 3, 'm': 10 ** 6}
+    valor = valor.strip().lower()
+    try:
+        if valor[-1:] in multiplicadores:
+            return int(float(valor[:-1]) * multiplicadores[valor[-1]])
+        return int(valor)
+    except ValueError:
+        raise CommandError(f"Escala inválida: {valor!r}")
+
+
+def lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
+
+
+def urls_de_la_api():
+    """
+    Nombres de las rutas de ``ROOT_URLCONF``; las incluidas (el admin) cuentan como una.
+    """
+    nombres = []
+    for patron in get_resolver().url_patterns:
+        if isinstance(patron, URLResolver):
+            nombres.append(patron.app_name or str(patron.pattern))
+        elif isinstance(patron, URLPattern) and patron.name:
+            nombres.append(patron.name)
+    return nombres
+
+
+class Command(BaseCommand):
+    help = ("Benchmark de todas las rutas de RestAPI/urls.py sobre una base de datos temporal sembrada a "
+            "varias escalas (eventos con reservas y comentarios proporcionales, con bulk_create) y con el "
+            "perfil de producción de SQLite. Cada ruta recibe --peticiones peticiones con el cliente de tests "
+            "desde --concurrencia hilos; se informa en JSON de p50/p95/p99, peticiones por segundo, errores "
+            "'database is locked' y consultas SQL por petición (de la cabecera Server-Timing de "
+            "Proyecto.instrumentacion, más las del cuerpo en las respuestas en streaming). Con --comparar se "
+            "añade el cociente frente a una ejecución anterior.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escalas', nargs='+', default=['1k'], help="Eventos por escala: 1k 100k 1M")
+        parser.add_argument('--reservas-por-evento', type=int, default=2)
+        parser.add_argument('--comentarios-por-evento', type=int, default=2)
+        parser.add_argument('--peticiones', type=int, default=100, help="Peticiones por ruta")
+        parser.add_argument('--concurrencia', type=int, default=8)
+        parser.add_argument('--rutas', nargs='+', help="Solo estas rutas (nombres de RestAPI/urls.py)")
+        parser.add_argument('--salida', help="Fichero JSON de resultados (por defecto, la salida estándar)")
+        parser.add_argument('--comparar', help="JSON de una ejecución anterior")
+
+    ##################################
+    # Datos:
+
+    def sembrar(self, eventos, reservas_por_evento, comentarios_por_evento, peticiones):
+        """
+        Siembra la base de datos y prepara los datos que consume cada ruta: las que borran o
+        cancelan reciben una fila propia por petición.
+        """
+        hash_contrasenha = make_password(CONTRASENHA)
+        organizadores = UsuarioPersonalizado.objects.bulk_create([
+            UsuarioPersonalizado(username=f"org{i}@example.com", nombre="Org", email=f"org{i}@example.com",
+                                 contrasenha=hash_contrasenha, password=hash_contrasenha, tipo="organizador")
+            for i in range(max(1, eventos // 1000))
+        ])
+        asistentes = UsuarioPersonalizado.objects.bulk_create([
+            UsuarioPersonalizado(username=f"asis{i}@example.com", nombre="Asis", email=f"asis{i}@example.com",
+                                 contrasenha="x", tipo="asistente")
+            for i in range(100)
+        ])
+        salientes = UsuarioPersonalizado.objects.bulk_create([
+            UsuarioPersonalizado(username=f"logout{i}@example.com", nombre="Logout", email=f"logout{i}@example.com",
+                                 contrasenha="x", tipo="asistente")
+            for i in range(peticiones)
+        ])
+        admin = UsuarioPersonalizado.objects.create(username="admin@example.com", nombre="Admin", email="admin@example.com",
+                                                    contrasenha="x", tipo="organizador", is_staff=True)
+        Token.objects.bulk_create([Token(user=usuario, key=Token.generate_key()) for usuario in [*organizadores[:1], *asistentes[:1], admin,
+                                                                       *salientes]])
+
+        fecha = datetime.date(2025, 1, 1)
+        muestra = []
+        filas = {'eventos': 0, 'reservas': 0, 'comentarios': 0}
+        for lote in lotes(range(eventos), 5000):
+            creados = Eventos.objects.bulk_create([
+                Eventos(titulo=f"Evento {i}", descripcion=f"Descripción del evento {i}",
+                        fecha=fecha + datetime.timedelta(days=i % 730), capacidad=1000,
+                        organizador=organizadores[i % len(organizadores)])
+                for i in lote
+            ])
+            Reservas.objects.bulk_create([
+                Reservas(usuario=asistentes[(evento.id + j) % len(asistentes)], evento=evento, entradas_reservadas=1,
+                         estado=ESTADOS[j % len(ESTADOS)])
+                for evento in creados for j in range(reservas_por_evento)
+            ])
+            Comentarios.objects.bulk_create([
+                Comentarios(texto=f"Comentario {j}", evento=evento)
+                for evento in creados for j in range(comentarios_por_evento)
+            ])
+            filas['eventos'] += len(creados)
+            filas['reservas'] += len(creados) * reservas_por_evento
+            filas['comentarios'] += len(creados) * comentarios_por_evento
+            if len(muestra) < 1000:
+                muestra += [evento.id for evento in creados[:1000 - len(muestra)]]
+
+        # bulk_create no pasa por las señales: índice de búsqueda, aforo y estadísticas
+        busqueda.reindexar()
+        recalcular_entradas_vendidas()
+        estadisticas.reconstruir()
+
+        organizador = organizadores[0]
+        asistente = asistentes[0]
+        borrables = Eventos.objects.bulk_create([
+            Eventos(titulo=f"Borrable {i}", descripcion="", fecha=fecha, capacidad=10, organizador=organizador)
+            for i in range(peticiones)
+        ])
+        cancelables = Reservas.objects.bulk_create([
+            Reservas(usuario=asistente, evento_id=muestra[i % len(muestra)], entradas_reservadas=1, estado='cancelada')
+            for i in range(peticiones)
+        ])
+        estadisticas.sumar_reservas(cancelables)
+        return {
+            'filas': filas,
+            'eventos': muestra,
+            # Los de ``organizador``: exportar e importar reservas exigen ser su organizador
+            'propios': list(Eventos.objects.filter(id__in=muestra, organizador=organizador).values_list('id', flat=True)),
+            'reservas': list(Reservas.objects.filter(evento_id__in=muestra[:100]).values_list('id', flat=True)[:1000]),
+            'organizador': organizador,
+            'asistente': asistente,
+            'tokens': {token.user_id: token.key for token in Token.objects.all()},
+            'admin': admin,
+            'salientes': salientes,
+            'borrables': [evento.id for evento in borrables],
+            'cancelables': [reserva.id for reserva in cancelables],
+        }
+
+    ##################################
+    # Escenarios:
+
+    def escenarios(self, datos, escala):
+        """
+        ``{nombre_ruta: funcion(i) -> (metodo, ruta, cuerpo, cabeceras)}`` con una petición
+        distinta para cada ``i``.
+        """
+        tokens = datos['tokens']
+        eventos, reservas = datos['eventos'], datos['reservas']
+
+        def auth(usuario):
+            return {'HTTP_AUTHORIZATION': f"Token {tokens[usuario.id]}"}
+
+        organizador, asistente, admin = auth(datos['organizador']), auth(datos['asistente']), auth(datos['admin'])
+
+        def evento(i):
+            return eventos[i % len(eventos)]
+
+        def propio(i):
+            return datos['propios'][i % len(datos['propios'])]
+
+        def ndjson(registros):
+            return "\n".join(json.dumps(registro) for registro in registros)
+
+        # Solo páginas que existen: a escalas pequeñas hay menos de 50
+        paginas = min(50, -(-datos['filas']['eventos'] // LIMITE_PAGINA))
+
+        def listar_evento(i):
+            parametros = [{'pagina': i % paginas + 1, 'limite': LIMITE_PAGINA}, {'cursor': '', 'limite': LIMITE_PAGINA},
+                          {'q': f"evento {i}"}]
+            return 'get', reverse('listar_evento'), parametros[i % 3], {}
+
+        return {
+            'admin': lambda i: ('get', '/admin/', None, {}),
+            'api_token_auth': lambda i: ('post', reverse('api_token_auth'),
+                                         {'username': datos['organizador'].username, 'password': CONTRASENHA}, {}),
+            'schema-swagger-ui': lambda i: ('get', reverse('schema-swagger-ui'), None, {}),
+            'schema-redoc': lambda i: ('get', reverse('schema-redoc'), None, {}),
+            'schema-json': lambda i: ('get', reverse('schema-json'), None, {}),
+            'regenerar_esquema': lambda i: ('post', reverse('regenerar_esquema'), None, admin),
+            'listar_evento': listar_evento,
+            'calendario_eventos': lambda i: ('get', reverse('calendario_eventos'), {
+                'agrupacion': ('dia', 'semana', 'mes')[i % 3], 'desde': "2025-01-01", 'hasta': "2025-12-31"}, {}),
+            'crear_evento': lambda i: ('post', reverse('crear_evento'), {
+                'titulo': f"Nuevo {i}", 'descripcion': "desc", 'fecha': "2025-06-01", 'capacidad': 50, 'url': ""},
+                organizador),
+            'actualizar_evento': lambda i: ('patch', reverse('actualizar_evento', args=[evento(i)]),
+                                            {'capacidad': 1000 + i}, organizador),
+            'borrar_evento': lambda i: ('delete', reverse('borrar_evento', args=[datos['borrables'][i]]), None,
+                                        organizador),
+            'estadisticas_evento': lambda i: ('get', reverse('estadisticas_evento', args=[evento(i)]), None,
+                                              organizador),
+            'panel_organizador': lambda i: ('get', reverse('panel_organizador'), {'limite': 50}, organizador),
+            'listar_reservas': lambda i: ('get', reverse('listar_reservas', args=[evento(i)]), None, {}),
+            'crear_reserva': lambda i: ('post', reverse('crear_reserva'), {
+                'usuario': datos['asistente'].id, 'evento': evento(i), 'entradas_reservadas': 1, 'estado': 'pendiente'},
+                asistente),
+            'crear_reservas_lote': lambda i: ('post', reverse('crear_reservas_lote'), {'reservas': [
+                {'usuario': datos['asistente'].id, 'evento': evento(i + j), 'entradas_reservadas': 1,
+                 'estado': 'pendiente'} for j in range(10)]}, asistente),
+            'actualizar_reserva': lambda i: ('patch', reverse('actualizar_reserva', args=[reservas[i % len(reservas)]]),
+                                             {'estado': ESTADOS[i % 2]}, organizador),
+            'cancelar_reserva': lambda i: ('delete', reverse('cancelar_reserva', args=[datos['cancelables'][i]]), None,
+                                           asistente),
+            'listar_comentarios': lambda i: ('get', reverse('listar_comentarios', args=[evento(i)]), None, {}),
+            'crear_comentario': lambda i: ('post', reverse('crear_comentario', args=[evento(i)]),
+                                           {'texto': f"Comentario {i}"}, asistente),
+            'exportar_eventos': lambda i: ('get', reverse('exportar_eventos'), {'formato': ('ndjson', 'csv')[i % 2]},
+                                           organizador),
+            'importar_eventos': lambda i: ('post', reverse('importar_eventos') + "?formato=ndjson", ndjson(
+                {'titulo': f"Importado {i}-{j}", 'descripcion': "", 'fecha': "2025-06-01", 'capacidad': 10}
+                for j in range(10)), organizador),
+            'exportar_reservas': lambda i: ('get', reverse('exportar_reservas', args=[propio(i)]), None, organizador),
+            'importar_reservas': lambda i: ('post', reverse('importar_reservas') + "?formato=ndjson", ndjson(
+                {'usuario': datos['asistente'].id, 'evento': propio(i + j), 'entradas_reservadas': 1}
+                for j in range(10)), organizador),
+            'estadisticas_cache': lambda i: ('get', reverse('estadisticas_cache'), None, admin),
+            'login': lambda i: ('post', reverse('login'),
+                                {'email': datos['organizador'].email, 'contrasenha': CONTRASENHA}, {}),
+            'logout': lambda i: ('post', reverse('logout'), None, auth(datos['salientes'][i])),
+            'register': lambda i: ('post', reverse('register'), {
+                'nombre': "Nuevo", 'email': f"nuevo{escala}_{i}@example.com", 'contrasenha': CONTRASENHA,
+                'tipo': "asistente"}, {}),
+        }
+
+    ##################################
+    # Medición:
+
+    def ejecutar(self, escenario, peticiones, concurrencia):
+        """
+        Lanza las peticiones repartidas entre ``concurrencia`` hilos, cada uno con su cliente.
+        Los errores de las vistas se cuentan como respuestas 500 en vez de abortar la medición.
+        """
+        locales = threading.local()
+
+        def contar_consultas(execute, sql, params, many, context):
+            locales.consultas += 1
+            return execute(sql, params, many, context)
+
+        def peticion(i):
+            cliente = getattr(locales, 'cliente', None)
+            if cliente is None:
+                cliente = locales.cliente = Client(raise_request_exception=False)
+            metodo, ruta, cuerpo, cabeceras = escenario(i)
+            opciones = {}
+            if metodo == 'get':
+                opciones['data'] = cuerpo
+            elif isinstance(cuerpo, str):
+                opciones.update(data=cuerpo, content_type="application/octet-stream")
+            elif cuerpo is not None:
+                opciones.update(data=json.dumps(cuerpo), content_type="application/json")
+            inicio = time.perf_counter()
+            respuesta = getattr(cliente, metodo)(ruta, **opciones, **cabeceras)
+            # Server-Timing se escribe antes de generar el cuerpo: las consultas del streaming se cuentan aquí
+            locales.consultas = 0
+            if respuesta.streaming:
+                with connection.execute_wrapper(contar_consultas):
+                    b"".join(respuesta.streaming_content)
+            duracion = time.perf_counter() - inicio
+            consultas = CONSULTAS.search(respuesta.get('Server-Timing', ''))
+            return respuesta.status_code, duracion, int(consultas.group(1)) + locales.consultas if consultas else None
+
+        def trabajador(parte):
+            try:
+                return [peticion(i) for i in parte]
+            finally:
+                connection.close()
+
+        inicio = time.perf_counter()
+        with contar_bloqueos() as bloqueos, ThreadPoolExecutor(max_workers=concurrencia) as hilos:
+            partes = hilos.map(trabajador, [range(h, peticiones, concurrencia) for h in range(concurrencia)])
+            resultado = [r for parte in partes for r in parte]
+        return resultado, time.perf_counter() - inicio, bloqueos.bloqueos
+
+    def resumir(self, resultado, duracion, bloqueos):
+        latencias = [latencia for _, latencia, _ in resultado]
+        consultas = [c for _, _, c in resultado if c is not None]
+        codigos = {}
+        for codigo, _, _ in resultado:
+            codigos[str(codigo)] = codigos.get(str(codigo), 0) + 1
+        return {
+            'peticiones': len(resultado),
+            'codigos': codigos,
+            'errores': sum(1 for codigo, _, _ in resultado if codigo >= 500),
+            'bloqueos': bloqueos,
+            'peticiones_s': round(len(resultado) / duracion, 1),
+            'p50_ms': round(percentil(latencias, 50) * 1000, 2),
+            'p95_ms': round(percentil(latencias, 95) * 1000, 2),
+            'p99_ms': round(percentil(latencias, 99) * 1000, 2),
+            'consultas_media': round(statistics.mean(consultas), 2) if consultas else None,
+            'consultas_max': max(consultas) if consultas else None,
+        }
+
+    def comparar(self, informe, fichero):
+        with open(fichero, encoding='utf-8') as f:
+            anterior = {e['eventos']: e for e in json.load(f)['escalas']}
+        for escala in informe['escalas']:
+            previa = anterior.get(escala['eventos'])
+            if previa is None:
+                continue
+            for nombre, actual in escala['rutas'].items():
+                antes = previa['rutas'].get(nombre)
+                if antes and antes['p95_ms']:
+                    actual['p95_frente_anterior'] = round(actual['p95_ms'] / antes['p95_ms'], 2)
+                if antes and antes['peticiones_s']:
+                    actual['peticiones_s_frente_anterior'] = round(actual['peticiones_s'] / antes['peticiones_s'], 2)
+
+    def handle(self, *args, **options):
+        peticiones, concurrencia = options['peticiones'], options['concurrencia']
+        informe = {
+            'python': platform.python_version(), 'django': django.get_version(),
+            'peticiones': peticiones, 'concurrencia': concurrencia, 'escalas': [],
+        }
+        for escala in (leer_escala(valor) for valor in options['escalas']):
+            # Base de datos nueva por escala; INSTRUMENTACION para contar las consultas
+            with perfil_bd(True), base_datos_temporal(), override_settings(INSTRUMENTACION=True, INSTRUMENTACION_MAX_CONSULTAS=10 ** 9,
+                                                          INSTRUMENTACION_MAX_MS=10 ** 9):
+                inicio = time.perf_counter()
+                datos = self.sembrar(escala, options['reservas_por_evento'], options['comentarios_por_evento'],
+                                     peticiones)
+                resultado = {'eventos': escala, 'filas': datos['filas'],
+                             'siembra_s': round(time.perf_counter() - inicio, 1), 'rutas': {}}
+                escenarios = self.escenarios(datos, escala)
+                nombres = urls_de_la_api()
+                resultado['rutas_sin_escenario'] = [nombre for nombre in nombres if nombre not in escenarios]
+                for nombre in options['rutas'] or nombres:
+                    if nombre not in escenarios:
+                        if options['rutas']:
+                            raise CommandError(f"No hay escenario para la ruta {nombre!r}.")
+                        continue
+                    self.stderr.write(f"{escala} eventos: {nombre}")
+                    resultado['rutas'][nombre] = self.resumir(*self.ejecutar(escenarios[nombre], peticiones,
+                                                                             concurrencia))
+                informe['escalas'].append(resultado)
+
+        if options['comparar']:
+            self.comparar(informe, options['comparar'])
+        texto = json.dumps(informe, indent=2, ensure_ascii=False)
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as f:
+                f.write(texto + "\n")
+        else:
+            self.stdout.write(texto)
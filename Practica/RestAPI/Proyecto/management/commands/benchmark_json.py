@@ -0,0 +1,73 @@
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from Proyecto import renderizado
+from Proyecto.cache import cache_respuestas
+from Proyecto.models import UsuarioPersonalizado, Eventos
+
+from ._utilidades import base_datos_temporal, percentil
+
+
+class Command(BaseCommand):
+    help = ("Mide la codificación JSON y la compresión de una página del listado de eventos: tiempo de "
+            "codificación con el JSONRenderer de DRF y con cada codificador de Proyecto.renderizado, "
+            "tamaño con y sin gzip y tiempo de la petición completa (servida desde la caché de respuestas).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=1000, help="Eventos de la página")
+        parser.add_argument('--repeticiones', type=int, default=200)
+
+    def sembrar(self, filas):
+        organizador = UsuarioPersonalizado.objects.create(
+            username="org@example.com", nombre="Organización de pruebas", email="org@example.com", contrasenha="x",
+            tipo="organizador",
+        )
+        fecha = datetime.date(2025, 1, 1)
+        Eventos.objects.bulk_create([
+            Eventos(titulo=f"Evento número {i}", descripcion=f"Descripción del evento {i} con acentos: ñandú",
+                    fecha=fecha + datetime.timedelta(days=i % 365), capacidad=100 + i,
+                    url=f"https://example.com/eventos/{i}", organizador=organizador)
+            for i in range(filas)
+        ])
+
+    def medir(self, funcion, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        return resultado, statistics.median(tiempos) * 1000, percentil(tiempos, 95) * 1000
+
+    def handle(self, *args, **options):
+        filas, repeticiones = options['filas'], options['repeticiones']
+        with base_datos_temporal():
+            self.sembrar(filas)
+            cliente = Client()
+            url = reverse("listar_evento")
+            parametros = {"limite": filas}
+            datos = cliente.get(url, parametros).data
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Codificación de una página de {filas} eventos"))
+            codificadores = {'drf': JSONRenderer().render, **renderizado.CODIFICADORES}
+            for nombre, codificar in codificadores.items():
+                cuerpo, p50, p95 = self.medir(lambda: codificar(datos), repeticiones)
+                self.stdout.write(f"  {nombre:<7} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  {len(cuerpo):>9} bytes")
+            cuerpo = renderizado.codificar(datos)
+            comprimido, p50, p95 = self.medir(lambda: compress_string(cuerpo, max_random_bytes=100), repeticiones)
+            self.stdout.write(f"  gzip    p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  {len(comprimido):>9} bytes "
+                              f"({len(comprimido) / len(cuerpo):.0%} del original)")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("Petición completa (con la página en la caché de respuestas)"))
+            for nombre, cabeceras in (("sin gzip", {}), ("con gzip", {"Accept-Encoding": "gzip"})):
+                respuesta, p50, p95 = self.medir(lambda: cliente.get(url, parametros, headers=cabeceras), repeticiones)
+                self.stdout.write(f"  {nombre:<8} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  "
+                                  f"{len(respuesta.content):>9} bytes enviados")
+            aciertos = cache_respuestas.estadisticas()["aciertos"]
+            self.stdout.write(f"  ({aciertos} aciertos de caché)")
@@ -0,0 +1,95 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from Proyecto import credenciales
+from Proyecto.models import UsuarioPersonalizado, Eventos
+
+from ._utilidades import base_datos_temporal, percentil
+
+
+class Command(BaseCommand):
+    help = ("Mide inicios de sesión concurrentes verificando el hash en el hilo de la petición y en el "
+            "pool acotado de Proyecto.credenciales, junto con la latencia de un listado servido a la vez. "
+            "Se ejecuta sobre una base de datos temporal.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--concurrencia', type=int, default=32)
+        parser.add_argument('--usuarios', type=int, default=50)
+
+    def trabajador(self, peticiones, hacer):
+        cliente = Client()
+        latencias, codigos = [], []
+        try:
+            for i in peticiones:
+                inicio = time.perf_counter()
+                codigos.append(hacer(cliente, i))
+                latencias.append(time.perf_counter() - inicio)
+        finally:
+            connection.close()
+        return latencias, codigos
+
+    def ejecutar(self, logins, concurrencia, usuarios):
+        url_login, url_listado = reverse("login"), reverse("listar_evento")
+
+        def login(cliente, i):
+            datos = {"email": f"bench{i % usuarios}@example.com", "contrasenha": "secreta"}
+            return cliente.post(url_login, datos).status_code
+
+        def listado(cliente, i):
+            return cliente.get(url_listado, {"pagina": i % 5 + 1}).status_code
+
+        repartos = [range(h, logins, concurrencia) for h in range(concurrencia)]
+        with ThreadPoolExecutor(max_workers=concurrencia + 1) as hilos:
+            inicio = time.perf_counter()
+            futuros = [hilos.submit(self.trabajador, reparto, login) for reparto in repartos]
+            # Un cliente adicional pide listados mientras duran los logins
+            lecturas = hilos.submit(self.trabajador, range(logins // 2), listado)
+            resultados = [f.result() for f in futuros]
+            duracion = time.perf_counter() - inicio
+            latencias_listado, _ = lecturas.result()
+
+        latencias = [l for r in resultados for l in r[0]]
+        codigos = [c for r in resultados for c in r[1]]
+        return {
+            "logins_por_segundo": logins / duracion,
+            "login_p50_ms": statistics.median(latencias) * 1000,
+            "login_p95_ms": percentil(latencias, 95) * 1000,
+            "listado_p95_ms": percentil(latencias_listado, 95) * 1000,
+            "correctos": codigos.count(200),
+            "rechazados_503": codigos.count(503),
+        }
+
+    def handle(self, *args, **options):
+        logins, concurrencia, usuarios = options['logins'], options['concurrencia'], options['usuarios']
+        with base_datos_temporal():
+            hash_comun = make_password("secreta")
+            UsuarioPersonalizado.objects.bulk_create([
+                UsuarioPersonalizado(username=f"bench{i}@example.com", nombre="Bench", email=f"bench{i}@example.com",
+                                     contrasenha=hash_comun, tipo="asistente")
+                for i in range(usuarios)
+            ])
+            organizador = UsuarioPersonalizado.objects.first()
+            Eventos.objects.bulk_create([
+                Eventos(titulo=f"Evento {i}", descripcion="desc", fecha="2025-01-01", capacidad=100,
+                        organizador=organizador)
+                for i in range(200)
+            ])
+
+            self.stdout.write(f"{logins} logins, {concurrencia} hilos, pool de {credenciales.MAX_HILOS} hilos "
+                              f"y {credenciales.MAX_PENDIENTES} plazas")
+            for nombre, en_pool in (("en el hilo de la petición", False), ("pool acotado", True)):
+                with override_settings(CREDENCIALES_EN_POOL=en_pool):
+                    r = self.ejecutar(logins, concurrencia, usuarios)
+                self.stdout.write(
+                    f"{nombre:<26} {r['logins_por_segundo']:7.1f} login/s  "
+                    f"p50 {r['login_p50_ms']:7.1f} ms  p95 {r['login_p95_ms']:7.1f} ms  "
+                    f"listado p95 {r['listado_p95_ms']:6.1f} ms  200={r['correctos']} 503={r['rechazados_503']}"
+                )
@@ -0,0 +1,115 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from Proyecto.basedatos import leer_pragmas
+from Proyecto.models import UsuarioPersonalizado, Eventos
+from Proyecto.motor_reservas import crear_reserva
+
+from ._utilidades import base_datos_temporal, contar_bloqueos, percentil, perfil_bd, peticion_wsgi
+
+
+class Command(BaseCommand):
+    help = ("Prueba de estrés de lecturas y reservas concurrentes sobre SQLite a través del ciclo WSGI "
+            "completo, con la configuración por defecto y con el perfil de producción (Proyecto.basedatos). "
+            "Cada pasada usa una base de datos temporal nueva.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=16)
+        parser.add_argument('--peticiones', type=int, default=150, help="Peticiones por hilo")
+        parser.add_argument('--escrituras', type=float, default=0.3,
+                            help="Proporción de escrituras (0-1): mitad reservas nuevas, mitad modificaciones")
+
+    def sembrar(self, hilos):
+        organizador = UsuarioPersonalizado.objects.create(
+            username="org@example.com", nombre="Org", email="org@example.com", contrasenha="x", tipo="organizador",
+        )
+        eventos = Eventos.objects.bulk_create([
+            Eventos(titulo=f"Evento {i}", descripcion="desc", fecha="2025-01-01", capacidad=10 ** 6,
+                    organizador=organizador)
+            for i in range(20)
+        ])
+        asistentes = UsuarioPersonalizado.objects.bulk_create([
+            UsuarioPersonalizado(username=f"a{i}@example.com", nombre="Asis", email=f"a{i}@example.com",
+                                 contrasenha="x", tipo="asistente")
+            for i in range(hilos)
+        ])
+        tokens = [Token.objects.create(user=asistente).key for asistente in asistentes]
+        # Una reserva por asistente para las modificaciones (lectura y escritura en la misma transacción)
+        reservas = [crear_reserva(asistente, eventos[0], 1, "confirmada").id for asistente in asistentes]
+        token_organizador = Token.objects.create(user=organizador).key
+        return [evento.id for evento in eventos], list(zip(asistentes, tokens, reservas)), token_organizador
+
+    def pasada(self, hilos, peticiones, escrituras):
+        ids, usuarios, token_organizador = self.sembrar(hilos)
+        aplicacion = get_wsgi_application()
+        url_crear = reverse("crear_reserva")
+
+        def trabajador(indice):
+            usuario, token, reserva = usuarios[indice]
+            url_actualizar = reverse("actualizar_reserva", args=[reserva])
+            cabeceras = {'HTTP_AUTHORIZATION': f"Token {token}"}
+            # Solo los organizadores pueden modificar reservas
+            cabeceras_organizador = {'HTTP_AUTHORIZATION': f"Token {token_organizador}"}
+            aleatorio = random.Random(indice)
+            resultado = []
+            try:
+                for i in range(peticiones):
+                    evento = ids[(indice + i) % len(ids)]
+                    escritura = aleatorio.random() < escrituras
+                    inicio = time.perf_counter()
+                    if escritura and i % 2:
+                        cuerpo = json.dumps({"entradas_reservadas": i % 3 + 1}).encode()
+                        codigo = peticion_wsgi(aplicacion, url_actualizar, metodo='PATCH', cuerpo=cuerpo,
+                                               cabeceras=cabeceras_organizador)
+                    elif escritura:
+                        cuerpo = json.dumps({"usuario": usuario.id, "evento": evento, "entradas_reservadas": 1,
+                                             "estado": "confirmada"}).encode()
+                        codigo = peticion_wsgi(aplicacion, url_crear, metodo='POST', cuerpo=cuerpo, cabeceras=cabeceras)
+                    else:
+                        codigo = peticion_wsgi(aplicacion, reverse("listar_reservas", args=[evento]))
+                    resultado.append((escritura, codigo, time.perf_counter() - inicio))
+            finally:
+                connection.close()
+            return resultado
+
+        with contar_bloqueos() as contador, ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            inicio = time.perf_counter()
+            resultado = [r for parte in ejecutor.map(trabajador, range(hilos)) for r in parte]
+            duracion = time.perf_counter() - inicio
+
+        correctas = [r for r in resultado if r[1] in (200, 201)]
+        return {
+            "peticiones_por_segundo": len(correctas) / duracion,
+            "escrituras": sum(1 for escritura, codigo, _ in resultado if escritura and codigo in (200, 201)),
+            "lecturas": sum(1 for escritura, codigo, _ in resultado if not escritura and codigo == 200),
+            "bloqueos": contador.bloqueos,
+            "otros_errores": contador.otros,
+            "p95_ms": percentil([r[2] for r in resultado], 95) * 1000,
+        }
+
+    def handle(self, *args, **options):
+        hilos, peticiones, escrituras = options['hilos'], options['peticiones'], options['escrituras']
+        self.stdout.write(f"{hilos} hilos x {peticiones} peticiones, {escrituras:.0%} escrituras")
+        resultados = {}
+        for nombre, produccion in (("por defecto", False), ("producción", True)):
+            with perfil_bd(produccion), base_datos_temporal():
+                if produccion:
+                    self.stdout.write(f"PRAGMA: {leer_pragmas(connection)}")
+                r = resultados[nombre] = self.pasada(hilos, peticiones, escrituras)
+            self.stdout.write(
+                f"{nombre:<12} {r['peticiones_por_segundo']:7.0f} petición/s correctas  "
+                f"escrituras {r['escrituras']:5}  lecturas {r['lecturas']:5}  "
+                f"'database is locked' {r['bloqueos']:4}  otros errores {r['otros_errores']:3}  p95 {r['p95_ms']:6.1f} ms"
+            )
+        base = resultados["por defecto"]["peticiones_por_segundo"]
+        if base:
+            mejora = resultados["producción"]["peticiones_por_segundo"] / base - 1
+            self.stdout.write(f"Mejora de rendimiento con el perfil de producción: {mejora:+.0%}")
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from Proyecto.models import Eventos
+
+
+class Command(BaseCommand):
+    help = ("Ejecuta los endpoints de lectura y muestra el EXPLAIN QUERY PLAN de cada consulta, "
+            "avisando de los recorridos completos de tabla.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evento', type=int, help="ID del evento para los listados de reservas y comentarios")
+
+    def endpoints(self, evento_id):
+        return [
+            (reverse("listar_evento"), {}),
+            (reverse("listar_evento"), {"fecha": "2025-01-01"}),
+            (reverse("listar_evento"), {"cursor": ""}),
+            (reverse("listar_evento"), {"q": "concierto"}),
+            (reverse("listar_evento"), {"desde": "2025-01-01", "hasta": "2025-01-31"}),
+            (reverse("calendario_eventos"), {"agrupacion": "dia", "desde": "2025-01-01", "hasta": "2025-12-31"}),
+            (reverse("calendario_eventos"), {"agrupacion": "mes"}),
+            (reverse("listar_reservas", args=[evento_id]), {}),
+            (reverse("listar_comentarios", args=[evento_id]), {}),
+        ]
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write("Este comando solo está soportado con SQLite.")
+            return
+        evento_id = options['evento'] or Eventos.objects.values_list('id', flat=True).first() or 1
+        factory = RequestFactory()
+        escaneos = 0
+
+        for url, params in self.endpoints(evento_id):
+            request = factory.get(url, params)
+            match = resolve(url)
+            with CaptureQueriesContext(connection) as consultas:
+                respuesta = match.func(request, *match.args, **match.kwargs)
+            self.stdout.write(self.style.MIGRATE_HEADING(f"GET {request.get_full_path()} -> {respuesta.status_code}"))
+
+            with connection.cursor() as cursor:
+                # Las consultas repetidas (p. ej. las de un N+1) solo se muestran una vez
+                for sql in dict.fromkeys(c['sql'] for c in consultas.captured_queries):
+                    cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                    self.stdout.write(f"  {sql}")
+                    for fila in cursor.fetchall():
+                        detalle = fila[-1]
+                        if detalle.startswith("SCAN") and "INDEX" not in detalle:
+                            escaneos += 1
+                            self.stdout.write(self.style.WARNING(f"    {detalle}  <- recorrido completo"))
+                        else:
+                            self.stdout.write(f"    {detalle}")
+
+        if escaneos:
+            self.stdout.write(self.style.WARNING(f"{escaneos} recorrido(s) completo(s) de tabla."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Ninguna consulta recorre una tabla completa."))
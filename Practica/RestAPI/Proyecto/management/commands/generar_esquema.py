@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from Proyecto.esquema import esquema_api
+
+
+class Command(BaseCommand):
+    help = ("Genera el esquema OpenAPI y lo escribe en ESQUEMA_API_FICHERO (o en --salida). Pensado para el "
+            "despliegue: los procesos en marcha recargan el fichero al ver que ha cambiado.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--salida', help="Fichero de destino; por defecto, ESQUEMA_API_FICHERO.")
+
+    def handle(self, *args, **options):
+        fichero = options['salida'] or esquema_api.fichero()
+        if not fichero:
+            raise CommandError("Indica --salida o configura ESQUEMA_API_FICHERO.")
+        with override_settings(ESQUEMA_API_FICHERO=fichero):
+            cuerpo = esquema_api.regenerar()
+        self.stdout.write(self.style.SUCCESS(f"Esquema escrito en {fichero} ({len(cuerpo)} bytes)."))
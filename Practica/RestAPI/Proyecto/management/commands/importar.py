@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Proyecto.importacion import FORMATOS, ImportacionEventos, ImportacionReservas, leer_registros
+from Proyecto.models import UsuarioPersonalizado
+
+
+class Command(BaseCommand):
+    help = "Importa eventos o reservas desde un fichero NDJSON o CSV, leyéndolo de forma incremental."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=['eventos', 'reservas'])
+        parser.add_argument('fichero', help="Ruta del fichero, o '-' para la entrada estándar")
+        parser.add_argument('--formato', choices=FORMATOS,
+                            help="Por defecto se deduce de la extensión (.csv o .ndjson)")
+        parser.add_argument('--tamano-lote', type=int, help="Filas por lote de bulk_create")
+        parser.add_argument('--organizador',
+                            help="Email del organizador de los eventos importados, o al que deben pertenecer "
+                                 "los eventos de las reservas importadas")
+
+    def handle(self, *args, **options):
+        formato = options['formato'] or ('csv' if options['fichero'].endswith('.csv') else 'ndjson')
+        if options['tamano_lote'] is not None and options['tamano_lote'] <= 0:
+            raise CommandError("--tamano-lote debe ser un entero positivo.")
+
+        organizador = None
+        if options['organizador']:
+            try:
+                organizador = UsuarioPersonalizado.objects.get(email=options['organizador'], tipo='organizador')
+            except UsuarioPersonalizado.DoesNotExist:
+                raise CommandError("No existe un organizador con ese email.")
+
+        if options['tipo'] == 'eventos':
+            if organizador is None:
+                raise CommandError("--organizador es obligatorio para importar eventos.")
+            importacion = ImportacionEventos(organizador, options['tamano_lote'])
+        else:
+            # Con --organizador solo se importan reservas de sus eventos
+            importacion = ImportacionReservas(organizador, options['tamano_lote'])
+
+        if options['fichero'] == '-':
+            resumen = importacion.ejecutar(leer_registros(sys.stdin.buffer, formato))
+        else:
+            with open(options['fichero'], 'rb') as fichero:
+                resumen = importacion.ejecutar(leer_registros(fichero, formato))
+
+        for error in resumen['errores']:
+            self.stderr.write(f"Línea {error['linea']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{resumen['importados']} {options['tipo']} importados, {resumen['errores_totales']} errores."
+        ))
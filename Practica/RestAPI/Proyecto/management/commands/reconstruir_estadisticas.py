@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from Proyecto import estadisticas
+from Proyecto.models import Eventos
+from Proyecto.motor_reservas import recalcular_entradas_vendidas
+
+
+class Command(BaseCommand):
+    help = ("Recalcula desde las reservas y los comentarios las estadísticas por evento y el contador "
+            "de entradas vendidas, para corregir desviaciones (p. ej. tras escrituras fuera de la aplicación).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('eventos', nargs='*', type=int, help="IDs de eventos (por defecto, todos)")
+        parser.add_argument('--tamano-lote', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        ids = options['eventos'] or None
+        filas = estadisticas.reconstruir(ids, tamano_lote=options['tamano_lote'])
+        eventos = Eventos.objects.filter(id__in=ids) if ids else None
+        recalcular_entradas_vendidas(eventos)
+        self.stdout.write(self.style.SUCCESS(f"Estadísticas recalculadas para {filas} eventos."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Proyecto import busqueda
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo de los eventos."
+
+    def handle(self, *args, **options):
+        if not busqueda.disponible():
+            self.stdout.write("La base de datos no es SQLite: la búsqueda usa icontains y no tiene índice.")
+            return
+        busqueda.reindexar()
+        self.stdout.write(self.style.SUCCESS("Índice de búsqueda reconstruido."))
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+from Proyecto.busqueda import TABLA_FTS, crear_indice
+
+
+def crear_tabla_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    crear_indice(schema_editor)
+    schema_editor.execute(
+        f"INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion) "
+        f"SELECT id, titulo, descripcion FROM Proyecto_eventos"
+    )
+
+
+def borrar_tabla_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {TABLA_FTS}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0003_remove_usuariopersonalizado_mail_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_tabla_fts, borrar_tabla_fts),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0004_eventos_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comentarios',
+            index=models.Index(fields=['evento', 'FechaC'], name='comentarios_evento_fechac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventos',
+            index=models.Index(fields=['fecha', 'id'], name='eventos_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservas',
+            index=models.Index(fields=['evento', 'estado'], name='reservas_evento_estado_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0005_indices_listados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Versiones',
+            fields=[
+                ('clave', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('numero', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:39
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def calcular_entradas_vendidas(apps, schema_editor):
+    Eventos = apps.get_model('Proyecto', 'Eventos')
+    Reservas = apps.get_model('Proyecto', 'Reservas')
+    ocupadas = (Reservas.objects.filter(evento=OuterRef('pk')).exclude(estado='cancelada')
+                .values('evento').annotate(total=Sum('entradas_reservadas')).values('total'))
+    Eventos.objects.update(entradas_vendidas=Coalesce(Subquery(ocupadas), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0006_versiones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventos',
+            name='entradas_vendidas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(calcular_entradas_vendidas, migrations.RunPython.noop),
+    ]
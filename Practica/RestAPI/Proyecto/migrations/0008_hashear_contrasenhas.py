@@ -0,0 +1,43 @@
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations, models
+
+TAMANO_LOTE = 500
+
+
+def hashear_contrasenhas(apps, schema_editor):
+    """
+    Sustituye las contraseñas guardadas en texto plano por su hash. Las que ya tienen
+    formato de hash se dejan como están, así que la migración puede repetirse.
+    """
+    UsuarioPersonalizado = apps.get_model('Proyecto', 'UsuarioPersonalizado')
+    pendientes = []
+    for usuario in UsuarioPersonalizado.objects.only('id', 'contrasenha').iterator(chunk_size=TAMANO_LOTE):
+        try:
+            identify_hasher(usuario.contrasenha)
+            continue
+        except ValueError:
+            pass
+        usuario.contrasenha = make_password(usuario.contrasenha)
+        pendientes.append(usuario)
+        if len(pendientes) >= TAMANO_LOTE:
+            UsuarioPersonalizado.objects.bulk_update(pendientes, ['contrasenha'])
+            pendientes = []
+    if pendientes:
+        UsuarioPersonalizado.objects.bulk_update(pendientes, ['contrasenha'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0007_eventos_entradas_vendidas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usuariopersonalizado',
+            name='contrasenha',
+            field=models.CharField(max_length=128),
+        ),
+        # No es reversible: el texto plano no se puede recuperar a partir del hash
+        migrations.RunPython(hashear_contrasenhas, migrations.RunPython.noop),
+    ]
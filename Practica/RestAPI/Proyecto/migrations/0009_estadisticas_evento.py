@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def calcular_estadisticas(apps, schema_editor):
+    Eventos = apps.get_model('Proyecto', 'Eventos')
+    Reservas = apps.get_model('Proyecto', 'Reservas')
+    Comentarios = apps.get_model('Proyecto', 'Comentarios')
+    EstadisticasEvento = apps.get_model('Proyecto', 'EstadisticasEvento')
+
+    EstadisticasEvento.objects.bulk_create(
+        [EstadisticasEvento(evento_id=id) for id in Eventos.objects.values_list('id', flat=True)], batch_size=1000
+    )
+    reservas = Reservas.objects.filter(evento=OuterRef('evento')).values('evento')
+    valores = {}
+    for estado in ('pendiente', 'confirmada', 'cancelada'):
+        del_estado = reservas.filter(estado=estado)
+        valores[f'reservas_{estado}'] = Coalesce(Subquery(del_estado.annotate(n=Count('id')).values('n')), Value(0))
+        valores[f'entradas_{estado}'] = Coalesce(
+            Subquery(del_estado.annotate(n=Sum('entradas_reservadas')).values('n')), Value(0))
+    comentarios = Comentarios.objects.filter(evento=OuterRef('evento')).values('evento')
+    valores['comentarios'] = Coalesce(Subquery(comentarios.annotate(n=Count('id')).values('n')), Value(0))
+    EstadisticasEvento.objects.update(**valores)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0008_hashear_contrasenhas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticasEvento',
+            fields=[
+                ('evento', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estadisticas', serialize=False, to='Proyecto.eventos')),
+                ('reservas_pendiente', models.PositiveIntegerField(default=0)),
+                ('reservas_confirmada', models.PositiveIntegerField(default=0)),
+                ('reservas_cancelada', models.PositiveIntegerField(default=0)),
+                ('entradas_pendiente', models.PositiveIntegerField(default=0)),
+                ('entradas_confirmada', models.PositiveIntegerField(default=0)),
+                ('entradas_cancelada', models.PositiveIntegerField(default=0)),
+                ('comentarios', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(calcular_estadisticas, migrations.RunPython.noop),
+    ]
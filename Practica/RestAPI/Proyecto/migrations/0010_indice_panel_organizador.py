@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Proyecto', '0009_estadisticas_evento'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventos',
+            index=models.Index(fields=['organizador', 'fecha', 'id'], name='eventos_organizador_fecha_idx'),
+        ),
+    ]
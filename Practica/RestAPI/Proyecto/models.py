@@ -10,7 +10,8 @@ class UsuarioPersonalizado(AbstractUser):
     tipo = models.CharField(max_length=20, choices=TIPO_USUARIO, default='asistente')
     nombre = models.CharField(max_length=25)
     email = models.CharField(max_length=100, unique=True)
-    contrasenha = models.CharField(max_length=100)
+    # Hash de la contraseña (formato de django.contrib.auth.hashers), ver Proyecto.credenciales
+    contrasenha = models.CharField(max_length=128)
     biografia = models.TextField(blank=True, null=True)
 
     def __str__(self):
@@ -22,10 +23,20 @@ class Eventos(models.Model):
     descripcion = models.CharField(max_length=100)
     fecha = models.DateField()
     capacidad = models.PositiveIntegerField()
+    # Entradas ocupadas por reservas no canceladas; lo mantiene Proyecto.motor_reservas
+    entradas_vendidas = models.PositiveIntegerField(default=0)
     url = models.URLField(max_length=200, blank=True, null=True)  # Asignamos correctamente el tipo de campo
     organizador = models.ForeignKey(UsuarioPersonalizado, on_delete=models.CASCADE, related_name="eventos",
                                     limit_choices_to={'tipo': 'organizador'})
 
+    class Meta:
+        indexes = [
+            # Listado de eventos: filtro y orden por fecha (con id como desempate)
+            models.Index(fields=['fecha', 'id'], name='eventos_fecha_id_idx'),
+            # Panel del organizador: sus eventos en el mismo orden
+            models.Index(fields=['organizador', 'fecha', 'id'], name='eventos_organizador_fecha_idx'),
+        ]
+
     def __str__(self):
         return self.titulo
 
@@ -41,6 +52,11 @@ class Reservas(models.Model):
     entradas_reservadas = models.PositiveIntegerField()
     estado = models.CharField(max_length=10, choices=Estado_Reserva, default='pendiente')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['evento', 'estado'], name='reservas_evento_estado_idx'),
+        ]
+
     def __str__(self):
         return f"Reserva para el evento '{self.evento.titulo}' a nombre de {self.usuario.username}"
 
@@ -50,5 +66,40 @@ class Comentarios(models.Model):
     evento = models.ForeignKey(Eventos, on_delete=models.CASCADE, related_name="comentarios")
     FechaC = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['evento', 'FechaC'], name='comentarios_evento_fechac_idx'),
+        ]
+
     def __str__(self):
         return f"Comentario en el evento '{self.evento.titulo}'"
+
+
+class Versiones(models.Model):
+    """
+    Sello de versión de una colección ('eventos', 'reservas:<id>', 'comentarios:<id>').
+    Cada escritura lo incrementa; los listados lo usan para generar su ETag.
+    """
+    clave = models.CharField(max_length=50, primary_key=True)
+    numero = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.clave} v{self.numero}"
+
+
+class EstadisticasEvento(models.Model):
+    """
+    Contadores por evento (reservas y entradas por estado, comentarios). Los mantiene
+    Proyecto.estadisticas de forma incremental; ``reconstruir_estadisticas`` los recalcula.
+    """
+    evento = models.OneToOneField(Eventos, on_delete=models.CASCADE, primary_key=True, related_name="estadisticas")
+    reservas_pendiente = models.PositiveIntegerField(default=0)
+    reservas_confirmada = models.PositiveIntegerField(default=0)
+    reservas_cancelada = models.PositiveIntegerField(default=0)
+    entradas_pendiente = models.PositiveIntegerField(default=0)
+    entradas_confirmada = models.PositiveIntegerField(default=0)
+    entradas_cancelada = models.PositiveIntegerField(default=0)
+    comentarios = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Estadísticas del evento {self.evento_id}"
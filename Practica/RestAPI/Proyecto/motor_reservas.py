@@ -0,0 +1,212 @@
+"""
+Motor de reservas con control de aforo.
+
+Las entradas ocupadas de cada evento se llevan en ``Eventos.entradas_vendidas``. Reservar
+es un único UPDATE condicional (``entradas_vendidas + n <= capacidad``), de modo que la
+comprobación y el incremento son atómicos en la base de datos: no hay ventana entre leer
+y escribir en la que dos peticiones simultáneas puedan vender la misma plaza.
+
+Las plazas de una reserva borrada se devuelven en su señal ``post_delete``
+(``Proyecto.signals``), sea cual sea el camino del borrado.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework import status
+
+from . import estadisticas
+from .models import UsuarioPersonalizado, Eventos, Reservas
+from .versiones import registrar_cambios
+
+ESTADOS_RESERVA = {estado for estado, _ in Reservas.Estado_Reserva}
+
+
+class AforoCompleto(Exception):
+    pass
+
+
+def ocupa_plazas(estado):
+    # Las reservas canceladas no ocupan aforo
+    return estado != 'cancelada'
+
+
+def reservar_entradas(evento_id, entradas):
+    if entradas <= 0:
+        return
+    actualizadas = (Eventos.objects
+                    .filter(id=evento_id, entradas_vendidas__lte=F('capacidad') - entradas)
+                    .update(entradas_vendidas=F('entradas_vendidas') + entradas))
+    if not actualizadas:
+        raise AforoCompleto("No quedan entradas suficientes para el evento.")
+
+
+def liberar_entradas(evento_id, entradas):
+    if entradas <= 0:
+        return
+    (Eventos.objects
+     .filter(id=evento_id, entradas_vendidas__gte=entradas)
+     .update(entradas_vendidas=F('entradas_vendidas') - entradas))
+
+
+def cambiar_capacidad(evento_id, capacidad):
+    """
+    Fija la capacidad del evento con un UPDATE condicional: falla si quedaría por debajo de
+    las entradas ya vendidas, también si una reserva se confirma justo antes.
+    """
+    actualizadas = (Eventos.objects
+                    .filter(id=evento_id, entradas_vendidas__lte=capacidad)
+                    .update(capacidad=capacidad))
+    if not actualizadas:
+        raise AforoCompleto("La capacidad no puede ser menor que las entradas ya vendidas.")
+
+
+def crear_reserva(usuario, evento, entradas_reservadas, estado='pendiente'):
+    with transaction.atomic():
+        if ocupa_plazas(estado):
+            reservar_entradas(evento.id, entradas_reservadas)
+        return Reservas.objects.create(
+            usuario=usuario,
+            evento=evento,
+            entradas_reservadas=entradas_reservadas,
+            estado=estado,
+        )
+
+
+def actualizar_reserva(reserva_id, usuario=None, evento=None, entradas_reservadas=None, estado=None):
+    """
+    Aplica los cambios a la reserva ajustando el aforo del evento anterior y del nuevo.
+    """
+    with transaction.atomic():
+        reserva = Reservas.objects.select_for_update().get(id=reserva_id)
+        antes = (reserva.evento_id, reserva.entradas_reservadas if ocupa_plazas(reserva.estado) else 0)
+
+        if usuario is not None:
+            reserva.usuario = usuario
+        if evento is not None:
+            reserva.evento = evento
+        if entradas_reservadas is not None:
+            reserva.entradas_reservadas = entradas_reservadas
+        if estado is not None:
+            reserva.estado = estado
+        despues = (reserva.evento_id, reserva.entradas_reservadas if ocupa_plazas(reserva.estado) else 0)
+
+        if antes[0] == despues[0]:
+            diferencia = despues[1] - antes[1]
+            if diferencia > 0:
+                reservar_entradas(despues[0], diferencia)
+            else:
+                liberar_entradas(despues[0], -diferencia)
+        else:
+            reservar_entradas(*despues)
+            liberar_entradas(*antes)
+        reserva.save()
+        return reserva
+
+
+def reservar_por_evento(por_evento, entradas_de):
+    """
+    Reserva el aforo de ``{evento_id: [elemento, ...]}`` con un UPDATE por evento; si el
+    grupo no cabe entero, se reserva elemento a elemento en orden de llegada.
+    ``entradas_de(elemento)`` da las plazas que ocupa cada uno. Devuelve
+    ``(aceptados, rechazados)``, con ``rechazados`` como pares ``(elemento, AforoCompleto)``.
+    Debe llamarse dentro de una transacción.
+    """
+    aceptados, rechazados = [], []
+    for evento_id, grupo in por_evento.items():
+        try:
+            reservar_entradas(evento_id, sum(entradas_de(elemento) for elemento in grupo))
+            aceptados.extend(grupo)
+            continue
+        except AforoCompleto:
+            pass
+        for elemento in grupo:
+            try:
+                reservar_entradas(evento_id, entradas_de(elemento))
+                aceptados.append(elemento)
+            except AforoCompleto as e:
+                rechazados.append((elemento, e))
+    return aceptados, rechazados
+
+
+def cancelar_reserva(reserva):
+    # Las plazas las devuelve la señal post_delete de Reservas (Proyecto.signals), que cubre
+    # también los borrados que no pasan por aquí
+    with transaction.atomic():
+        Reservas.objects.select_for_update().get(id=reserva.id).delete()
+
+
+def leer_entero_positivo(valor):
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        return None
+    return numero if numero > 0 else None
+
+
+def crear_reservas_lote(items):
+    """
+    Crea varias reservas en una transacción y devuelve un resultado por elemento, en el
+    mismo orden, con el código HTTP que habría dado ``reservas/crear/`` para él.
+
+    Usuarios y eventos se validan con dos consultas IN, el aforo se reserva con un UPDATE
+    condicional por evento distinto (más uno por reserva si el grupo de un evento no cabe
+    entero) y las filas se insertan con un único ``bulk_create``; estadísticas y sellos de
+    versión se actualizan con un UPDATE cada uno.
+    """
+    resultados = [None] * len(items)
+    validos = []
+    for indice, item in enumerate(items):
+        if not isinstance(item, dict):
+            resultados[indice] = {"status": status.HTTP_400_BAD_REQUEST, "error": "Formato de reserva inválido."}
+            continue
+        usuario_id = leer_entero_positivo(item.get("usuario"))
+        evento_id = leer_entero_positivo(item.get("evento"))
+        entradas = leer_entero_positivo(item.get("entradas_reservadas"))
+        estado = item.get("estado", "pendiente")
+        if usuario_id is None or evento_id is None or entradas is None or estado not in ESTADOS_RESERVA:
+            resultados[indice] = {"status": status.HTTP_400_BAD_REQUEST, "error": "Datos de reserva inválidos."}
+            continue
+        validos.append((indice, usuario_id, evento_id, entradas, estado))
+
+    usuarios = set(UsuarioPersonalizado.objects.filter(id__in={v[1] for v in validos}).values_list('id', flat=True))
+    eventos = set(Eventos.objects.filter(id__in={v[2] for v in validos}).values_list('id', flat=True))
+    por_evento = defaultdict(list)
+    for valido in validos:
+        indice, usuario_id, evento_id = valido[:3]
+        if usuario_id not in usuarios:
+            resultados[indice] = {"status": status.HTTP_404_NOT_FOUND, "error": "Usuario no encontrado."}
+        elif evento_id not in eventos:
+            resultados[indice] = {"status": status.HTTP_404_NOT_FOUND, "error": "Evento no encontrado."}
+        else:
+            por_evento[evento_id].append(valido)
+
+    with transaction.atomic():
+        aceptados, rechazados = reservar_por_evento(por_evento, lambda v: v[3] if ocupa_plazas(v[4]) else 0)
+        for valido, e in rechazados:
+            resultados[valido[0]] = {"status": status.HTTP_409_CONFLICT, "error": str(e)}
+
+        creadas = Reservas.objects.bulk_create([
+            Reservas(usuario_id=usuario_id, evento_id=evento_id, entradas_reservadas=entradas, estado=estado)
+            for _, usuario_id, evento_id, entradas, estado in aceptados
+        ])
+        # bulk_create no emite señales
+        if creadas:
+            estadisticas.sumar_reservas(creadas)
+            registrar_cambios(*{f'reservas:{reserva.evento_id}' for reserva in creadas})
+
+    for (indice, *_), reserva in zip(aceptados, creadas):
+        resultados[indice] = {"status": status.HTTP_201_CREATED, "id": reserva.id}
+    return resultados
+
+
+def recalcular_entradas_vendidas(eventos=None):
+    """
+    Recalcula el contador desde las reservas (todos los eventos o el queryset dado).
+    """
+    if eventos is None:
+        eventos = Eventos.objects.all()
+    ocupadas = (Reservas.objects.filter(evento=OuterRef('pk')).exclude(estado='cancelada')
+                .values('evento').annotate(total=Sum('entradas_reservadas')).values('total'))
+    return eventos.update(entradas_vendidas=Coalesce(Subquery(ocupadas), Value(0)))
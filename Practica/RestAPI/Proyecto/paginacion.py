@@ -0,0 +1,105 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+El cursor es un token opaco con el último par ``(campo, id)`` servido. La página
+siguiente se obtiene con un WHERE sobre ese par en lugar de un OFFSET, de modo que
+el coste de cada página no depende de su profundidad y no hace falta un COUNT(*).
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Q
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+def leer_limite(valor, defecto, maximo):
+    """
+    Tamaño de página pedido, acotado a ``maximo``. Lanza ValueError si no es un entero positivo.
+    """
+    if valor in (None, ''):
+        return defecto
+    try:
+        limite = int(valor)
+    except (TypeError, ValueError):
+        limite = 0
+    if limite <= 0:
+        raise ValueError("El límite debe ser un entero positivo.")
+    return min(limite, maximo)
+
+
+def codificar_cursor(valor, id):
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        valor = valor.isoformat()
+    crudo = json.dumps([valor, id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valor, id = json.loads(crudo)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise CursorInvalido("Cursor inválido.")
+    if not isinstance(id, int):
+        raise CursorInvalido("Cursor inválido.")
+    return valor, id
+
+
+def leer_valor_cursor(campo, valor):
+    """
+    Valor del cursor convertido al tipo de ``campo``. Las fechas viajan como texto ISO
+    (ver ``codificar_cursor``); cualquier otro tipo, o None, hace el cursor inválido.
+    """
+    if valor is None or (isinstance(campo, models.DateField) and not isinstance(valor, str)):
+        raise CursorInvalido("Cursor inválido.")
+    try:
+        return campo.to_python(valor)
+    except ValidationError:
+        raise CursorInvalido("Cursor inválido.")
+
+
+def consulta_por_cursor(queryset, cursor, limite, campo='fecha'):
+    """
+    Queryset de la página que sigue a ``cursor``, con una fila de más para saber si
+    existe página siguiente sin contar.
+    """
+    if cursor:
+        valor, id = decodificar_cursor(cursor)
+        if campo == 'id':
+            queryset = queryset.filter(id__gt=id)
+        else:
+            valor = leer_valor_cursor(queryset.model._meta.get_field(campo), valor)
+            queryset = queryset.filter(Q(**{f'{campo}__gt': valor}) | Q(**{campo: valor, 'id__gt': id}))
+    return queryset.order_by(*dict.fromkeys((campo, 'id')))[:limite + 1]
+
+
+def cerrar_pagina(filas, limite, campo='fecha'):
+    if len(filas) <= limite:
+        return filas, None
+    filas = filas[:limite]
+    return filas, codificar_cursor(filas[-1][campo], filas[-1]['id'])
+
+
+def paginar_por_cursor(queryset, cursor, limite, campo='fecha'):
+    """
+    Devuelve ``(filas, next_cursor)`` para un queryset de ``.values()`` ordenado por ``(campo, id)``.
+
+    ``next_cursor`` es None cuando no quedan más filas.
+    """
+    filas = list(consulta_por_cursor(queryset, cursor, limite, campo))
+    return cerrar_pagina(filas, limite, campo)
+
+
+async def apaginar_por_cursor(queryset, cursor, limite, campo='fecha'):
+    """
+    Versión asíncrona de ``paginar_por_cursor``.
+    """
+    filas = [fila async for fila in consulta_por_cursor(queryset, cursor, limite, campo)]
+    return cerrar_pagina(filas, limite, campo)
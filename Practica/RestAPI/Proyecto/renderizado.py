@@ -0,0 +1,95 @@
+"""
+Codificación JSON y compresión de las respuestas de la API.
+
+``RenderizadorJSON`` sustituye al ``JSONRenderer`` de DRF (``DEFAULT_RENDERER_CLASSES``) y
+``RespuestaJSON`` (vistas asíncronas) usa la misma función, ``codificar``: con orjson si está
+instalado y, si no, con el módulo ``json`` de la biblioteca estándar. Las dos dan el mismo
+JSON que DRF (UTF-8 sin escapar, compacto, U+2028/U+2029 escapados); fechas, decimales y
+demás tipos que orjson no trata igual pasan por el codificador de DRF, y lo que orjson no
+admite (claves que no son cadenas, enteros de más de 64 bits) se codifica con ``json``.
+
+La única diferencia: con NaN o infinito DRF y ``json`` dan error y orjson escribe ``null``.
+Buscarlos costaría recorrer cada respuesta; ningún serializador de la API los produce (el
+único float, ``ocupacion`` de las estadísticas, es siempre finito).
+
+``CompresionMiddleware`` comprime con gzip las respuestas de al menos
+``COMPRESION_MIN_BYTES`` bytes cuando el cliente lo acepta (``Accept-Encoding``). Por
+debajo del umbral comprimir cuesta más de lo que ahorra. Con ``COMPRESION = False`` no se
+carga.
+"""
+import json
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_codificador_drf = JSONEncoder()
+
+
+def escapar_separadores(salida):
+    # Como JSONRenderer: el JSON resultante es un subconjunto estricto de JavaScript
+    if b'\xe2\x80\xa8' in salida or b'\xe2\x80\xa9' in salida:
+        salida = salida.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return salida
+
+
+def codificar_json(datos):
+    return escapar_separadores(json.dumps(datos, cls=JSONEncoder, ensure_ascii=False, allow_nan=False,
+                                          separators=(',', ':')).encode('utf-8'))
+
+
+def codificar_orjson(datos):
+    try:
+        salida = orjson.dumps(datos, default=_codificador_drf.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except orjson.JSONEncodeError:
+        # Claves no str, enteros de más de 64 bits, recursión profunda...: lo que acepte la biblioteca estándar
+        return codificar_json(datos)
+    return escapar_separadores(salida)
+
+
+CODIFICADORES = {'json': codificar_json}
+if orjson is not None:
+    CODIFICADORES['orjson'] = codificar_orjson
+
+# El más rápido disponible
+codificar = codificar_orjson if orjson is not None else codificar_json
+
+
+class RenderizadorJSON(JSONRenderer):
+    """
+    ``JSONRenderer`` que codifica con ``codificar``. Si el cliente pide sangría
+    (``Accept: application/json; indent=4``) se usa el de DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return codificar(data)
+
+
+class CompresionMiddleware(GZipMiddleware):
+    """
+    ``GZipMiddleware`` de Django con umbral configurable. Convierte el ETag en débil, que
+    ``Proyecto.versiones`` sigue aceptando en ``If-None-Match``, y no toca las respuestas que
+    ya traen ``Content-Encoding`` (el esquema OpenAPI se guarda comprimido).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPRESION', True):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.min_bytes = getattr(settings, 'COMPRESION_MIN_BYTES', 1024)
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+        return super().process_response(request, response)
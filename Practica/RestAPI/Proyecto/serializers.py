@@ -0,0 +1,218 @@
+"""
+Serialización de los listados de la API.
+
+Los listados se construyen sobre ``.values()`` para que cada página se resuelva
+en una única consulta (con JOIN al organizador) sin instanciar modelos.
+
+Con ``fields=`` (ver ``Proyeccion``) un listado devuelve solo algunos campos: la consulta
+lee únicamente sus columnas (sin JOIN al organizador si no se pide) y cada fila se
+serializa solo con esos campos.
+"""
+from .estadisticas import ESTADOS
+
+# Columnas que se leen para cada evento del listado
+CAMPOS_EVENTO = (
+    'id',
+    'titulo',
+    'descripcion',
+    'fecha',
+    'capacidad',
+    'url',
+    'organizador__id',
+    'organizador__nombre',
+    'organizador__email',
+)
+
+
+class Proyeccion:
+    """
+    Campos públicos de un listado para el parámetro ``fields``. ``campos`` asocia a cada
+    campo de la respuesta las columnas de ``.values()`` que necesita y la función que saca
+    su valor de la fila; ``serializar`` es el serializador de la fila completa.
+    """
+
+    def __init__(self, campos, serializar):
+        self.campos = campos
+        self.serializar = serializar
+
+    def leer(self, valor):
+        """
+        Campos pedidos en ``valor`` (separados por comas), en el orden de la respuesta
+        completa, o None si no se pide ninguno. Lanza ``ValueError`` con los desconocidos.
+        """
+        pedidos = {campo.strip() for campo in (valor or "").split(",") if campo.strip()}
+        if not pedidos:
+            return None
+        desconocidos = pedidos - self.campos.keys()
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos en 'fields': {', '.join(sorted(desconocidos))}. "
+                             f"Disponibles: {', '.join(self.campos)}.")
+        return tuple(campo for campo in self.campos if campo in pedidos)
+
+    def columnas(self, campos, obligatorias=('id',)):
+        """
+        Columnas que hay que leer para ``campos`` (todas si es None). ``obligatorias`` son las
+        que necesita la paginación aunque no se devuelvan.
+        """
+        campos = self.campos if campos is None else campos
+        return tuple(dict.fromkeys([*obligatorias, *(columna for campo in campos for columna in self.campos[campo][0])]))
+
+    def serializador(self, campos):
+        if campos is None:
+            return self.serializar
+        extractores = [(campo, self.campos[campo][1]) for campo in campos]
+        return lambda fila: {campo: extraer(fila) for campo, extraer in extractores}
+
+
+def fecha_iso(valor):
+    return valor.strftime("%Y-%m-%d") if valor else ""
+
+
+def fecha_hora(valor):
+    return valor.strftime("%Y-%m-%d %H:%M:%S") if valor else ""
+
+
+def proyectar_eventos(eventos, campos=None):
+    """
+    Devuelve el queryset de eventos proyectado a las columnas del listado (o a las de ``campos``,
+    más ``fecha`` e ``id`` para el orden y el cursor).
+    """
+    if campos is None:
+        return eventos.values(*CAMPOS_EVENTO)
+    return eventos.values(*PROYECCION_EVENTO.columnas(campos, ('id', 'fecha')))
+
+
+def serializar_evento(fila):
+    """
+    Construye el diccionario de respuesta de un evento a partir de una fila de ``.values()``.
+    """
+    return {
+        "id": fila["id"],
+        "titulo": fila["titulo"],
+        "descripcion": fila["descripcion"],
+        "fecha": fila["fecha"].strftime("%Y-%m-%d") if fila["fecha"] else "",
+        "capacidad": fila["capacidad"],
+        "url": fila["url"],
+        "organizador": serializar_organizador(fila),
+    }
+
+
+def serializar_organizador(fila):
+    return {
+        "id": fila["organizador__id"],
+        "nombre": fila["organizador__nombre"],
+        "email": fila["organizador__email"],
+    } if fila["organizador__id"] else None
+
+
+PROYECCION_EVENTO = Proyeccion({
+    "id": (('id',), lambda fila: fila["id"]),
+    "titulo": (('titulo',), lambda fila: fila["titulo"]),
+    "descripcion": (('descripcion',), lambda fila: fila["descripcion"]),
+    "fecha": (('fecha',), lambda fila: fecha_iso(fila["fecha"])),
+    "capacidad": (('capacidad',), lambda fila: fila["capacidad"]),
+    "url": (('url',), lambda fila: fila["url"]),
+    "organizador": (('organizador__id', 'organizador__nombre', 'organizador__email'), serializar_organizador),
+}, serializar_evento)
+
+
+def serializar_eventos(filas, campos=None):
+    serializar = PROYECCION_EVENTO.serializador(campos)
+    return [serializar(fila) for fila in filas]
+
+
+def serializar_periodo(fila):
+    """
+    Fila del calendario de eventos (``Proyecto.views.consulta_calendario``). Las plazas libres
+    del periodo son la capacidad total menos las entradas vendidas.
+    """
+    return {
+        "periodo": fila["periodo"].strftime("%Y-%m-%d"),
+        "eventos": fila["eventos"],
+        "capacidad": fila["capacidad"],
+        "entradas_vendidas": fila["entradas_vendidas"],
+        "plazas_libres": fila["capacidad"] - fila["entradas_vendidas"],
+    }
+
+
+CAMPOS_RESERVA = ('id', 'usuario_id', 'evento_id', 'entradas_reservadas', 'estado')
+
+
+def serializar_reserva(fila):
+    return {
+        "id": fila["id"],
+        "usuario": fila["usuario_id"],
+        "evento": fila["evento_id"],
+        "entradas_reservadas": fila["entradas_reservadas"],
+        "estado": fila["estado"],
+    }
+
+
+CAMPOS_COMENTARIO = ('id', 'texto', 'FechaC')
+
+
+def serializar_comentario(fila):
+    return {
+        "id": fila["id"],
+        "texto": fila["texto"],
+        "FechaC": fila["FechaC"].strftime("%Y-%m-%d %H:%M:%S") if fila["FechaC"] else "",
+    }
+
+
+PROYECCION_RESERVA = Proyeccion({
+    "id": (('id',), lambda fila: fila["id"]),
+    "usuario": (('usuario_id',), lambda fila: fila["usuario_id"]),
+    "evento": (('evento_id',), lambda fila: fila["evento_id"]),
+    "entradas_reservadas": (('entradas_reservadas',), lambda fila: fila["entradas_reservadas"]),
+    "estado": (('estado',), lambda fila: fila["estado"]),
+}, serializar_reserva)
+
+PROYECCION_COMENTARIO = Proyeccion({
+    "id": (('id',), lambda fila: fila["id"]),
+    "texto": (('texto',), lambda fila: fila["texto"]),
+    "FechaC": (('FechaC',), lambda fila: fecha_hora(fila["FechaC"])),
+}, serializar_comentario)
+
+
+# Panel del organizador: columnas del evento y de su fila de ``EstadisticasEvento`` (LEFT JOIN)
+CAMPOS_PANEL = (
+    'id',
+    'titulo',
+    'fecha',
+    'capacidad',
+    'entradas_vendidas',
+    *(f'estadisticas__reservas_{estado}' for estado in ESTADOS),
+    *(f'estadisticas__entradas_{estado}' for estado in ESTADOS),
+    'estadisticas__comentarios',
+)
+
+
+def serializar_panel(fila):
+    reservas = {estado: fila[f"estadisticas__reservas_{estado}"] for estado in ESTADOS}
+    return {
+        "id": fila["id"],
+        "titulo": fila["titulo"],
+        "fecha": fila["fecha"].strftime("%Y-%m-%d") if fila["fecha"] else "",
+        "capacidad": fila["capacidad"],
+        "entradas_vendidas": fila["entradas_vendidas"],
+        "plazas_libres": fila["capacidad"] - fila["entradas_vendidas"],
+        "reservas": {"total": sum(reservas.values()), **reservas},
+        "entradas": {estado: fila[f"estadisticas__entradas_{estado}"] for estado in ESTADOS},
+        "comentarios": fila["estadisticas__comentarios"],
+    }
+
+
+def serializar_estadisticas(fila):
+    """
+    Respuesta de estadísticas de un evento a partir de su ``EstadisticasEvento`` (con el evento cargado).
+    """
+    evento = fila.evento
+    return {
+        "evento": evento.id,
+        "capacidad": evento.capacidad,
+        "entradas_vendidas": evento.entradas_vendidas,
+        "ocupacion": evento.entradas_vendidas / evento.capacidad if evento.capacidad else 0.0,
+        "reservas": {estado: getattr(fila, f"reservas_{estado}") for estado in ESTADOS},
+        "entradas": {estado: getattr(fila, f"entradas_{estado}") for estado in ESTADOS},
+        "comentarios": fila.comentarios,
+    }
@@ -0,0 +1,191 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from . import basedatos, busqueda, estadisticas
+from .motor_reservas import liberar_entradas, ocupa_plazas, recalcular_entradas_vendidas
+from .autenticacion import cache_tokens
+from .versiones import registrar_cambios
+from .models import UsuarioPersonalizado, Eventos, Reservas, Comentarios, EstadisticasEvento
+
+
+##################################
+# Conexiones a la base de datos:
+
+@receiver(connection_created)
+def configurar_conexion(sender, connection, **kwargs):
+    basedatos.aplicar_pragmas(connection)
+
+
+##################################
+# Índice de búsqueda:
+
+@receiver(post_save, sender=Eventos)
+def indexar_evento(sender, instance, **kwargs):
+    busqueda.indexar_evento(instance)
+
+
+@receiver(post_delete, sender=Eventos)
+def desindexar_evento(sender, instance, **kwargs):
+    busqueda.eliminar_evento(instance.pk)
+
+
+##################################
+# Invalidación de la caché de respuestas y sellos de versión:
+
+@receiver(post_save, sender=Eventos)
+def invalidar_evento_guardado(sender, instance, **kwargs):
+    registrar_cambios('eventos')
+
+
+@receiver(post_delete, sender=Eventos)
+def invalidar_evento_borrado(sender, instance, **kwargs):
+    # Sus listados de reservas y comentarios pasan a ser 404
+    registrar_cambios('eventos', f'reservas:{instance.pk}', f'comentarios:{instance.pk}')
+
+
+CAMPOS_ORGANIZADOR = {'nombre', 'email'}
+
+
+@receiver(post_save, sender=UsuarioPersonalizado)
+@receiver(post_delete, sender=UsuarioPersonalizado)
+def invalidar_organizador(sender, instance, created=False, update_fields=None, **kwargs):
+    # El listado de eventos incluye nombre y email del organizador; un usuario nuevo no tiene eventos
+    # y guardar otros campos (last_login...) no cambia el listado
+    if not created and (update_fields is None or CAMPOS_ORGANIZADOR & update_fields):
+        registrar_cambios('eventos')
+
+
+@receiver(post_init, sender=Reservas)
+@receiver(post_init, sender=Comentarios)
+def recordar_evento_original(sender, instance, **kwargs):
+    # Sin acceder al atributo para no disparar una consulta si el campo está diferido
+    instance._evento_id_original = instance.__dict__.get('evento_id')
+
+
+def etiquetas_por_evento(prefijo, instance):
+    etiquetas = {f'{prefijo}:{instance.evento_id}'}
+    # Si la fila cambió de evento, el listado del evento anterior también cambia
+    if instance._evento_id_original is not None:
+        etiquetas.add(f'{prefijo}:{instance._evento_id_original}')
+    return etiquetas
+
+
+def borrado_con_su_evento(origin):
+    """
+    Las reservas y comentarios que caen en cascada al borrar eventos no necesitan
+    contabilidad por fila: el receptor de Eventos invalida sus listados y la fila de
+    estadísticas se borra con el evento.
+    """
+    return isinstance(origin, Eventos) or getattr(origin, 'model', None) is Eventos
+
+
+@receiver(post_save, sender=Reservas)
+@receiver(post_delete, sender=Reservas)
+def invalidar_reservas(sender, instance, origin=None, **kwargs):
+    if borrado_con_su_evento(origin):
+        return
+    registrar_cambios(*etiquetas_por_evento('reservas', instance))
+    instance._evento_id_original = instance.evento_id
+
+
+@receiver(post_save, sender=Comentarios)
+@receiver(post_delete, sender=Comentarios)
+def invalidar_comentarios(sender, instance, origin=None, **kwargs):
+    if borrado_con_su_evento(origin):
+        return
+    registrar_cambios(*etiquetas_por_evento('comentarios', instance))
+    instance._evento_id_original = instance.evento_id
+
+
+##################################
+# Estadísticas por evento:
+
+@receiver(post_save, sender=Eventos)
+def crear_estadisticas(sender, instance, created, raw=False, using=None, **kwargs):
+    if created and not raw:
+        EstadisticasEvento.objects.using(using).create(evento=instance)
+
+
+@receiver(post_init, sender=Reservas)
+def recordar_reserva_original(sender, instance, **kwargs):
+    valores = instance.__dict__
+    instance._estadisticas_original = (valores.get('evento_id'), valores.get('estado'),
+                                       valores.get('entradas_reservadas'))
+
+
+@receiver(post_save, sender=Reservas)
+def estadisticas_reserva_guardada(sender, instance, created, **kwargs):
+    despues = (instance.evento_id, instance.estado, instance.entradas_reservadas)
+    estadisticas.cambio_reserva(None if created else instance._estadisticas_original, despues)
+    instance._estadisticas_original = despues
+
+
+@receiver(post_delete, sender=Reservas)
+def estadisticas_reserva_borrada(sender, instance, origin=None, **kwargs):
+    if borrado_con_su_evento(origin):
+        return
+    estadisticas.cambio_reserva(instance._estadisticas_original, None)
+
+
+@receiver(post_delete, sender=Reservas)
+def liberar_aforo_reserva_borrada(sender, instance, origin=None, **kwargs):
+    # Cualquier borrado (cancelación, cascada desde el usuario, admin...) devuelve las plazas;
+    # las reservas que caen con su evento no tienen a quién devolverlas
+    if borrado_con_su_evento(origin):
+        return
+    evento_id, estado, entradas = instance._estadisticas_original
+    if evento_id is None:
+        return
+    if estado is None or entradas is None:
+        # Campos diferidos: se recalcula el contador del evento
+        recalcular_entradas_vendidas(Eventos.objects.filter(id=evento_id))
+    elif ocupa_plazas(estado):
+        liberar_entradas(evento_id, entradas)
+
+
+@receiver(post_init, sender=Comentarios)
+def recordar_comentario_original(sender, instance, **kwargs):
+    instance._estadisticas_original = instance.__dict__.get('evento_id')
+
+
+@receiver(post_save, sender=Comentarios)
+def estadisticas_comentario_guardado(sender, instance, created, **kwargs):
+    if created:
+        estadisticas.cambio_comentario(None, instance.evento_id)
+    elif instance._estadisticas_original != instance.evento_id:
+        estadisticas.cambio_comentario(instance._estadisticas_original, instance.evento_id)
+    instance._estadisticas_original = instance.evento_id
+
+
+@receiver(post_delete, sender=Comentarios)
+def estadisticas_comentario_borrado(sender, instance, origin=None, **kwargs):
+    if borrado_con_su_evento(origin):
+        return
+    estadisticas.cambio_comentario(instance._estadisticas_original, None)
+
+
+##################################
+# Invalidación de la caché de tokens:
+
+@receiver(post_save, sender=Token)
+def invalidar_token_creado(sender, instance, **kwargs):
+    # Rotación: el token anterior del usuario deja de ser válido
+    cache_tokens.invalidar_usuario(instance.user_id)
+
+
+@receiver(post_delete, sender=Token)
+def invalidar_token_borrado(sender, instance, **kwargs):
+    cache_tokens.invalidar_token(instance.key)
+
+
+CAMPOS_ORGANIZADOR = {'nombre', 'email'}
+
+
+@receiver(post_save, sender=UsuarioPersonalizado)
+@receiver(post_delete, sender=UsuarioPersonalizado)
+def invalidar_tokens_usuario(sender, instance, **kwargs):
+    # Cambios de 'tipo', desactivación o borrado
+    cache_tokens.invalidar_usuario(instance.pk)
@@ -1,3 +1,1311 @@
-from django.test import TestCase
+import datetime
+import decimal
+import gzip
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from . import credenciales, estadisticas, views
+from .autenticacion import CacheTokens, cache_tokens
+from .basedatos import leer_pragmas
+from .enrutador import REPLICA_COOKIE
+from .comentarios_diferidos import BufferComentarios
+from .esquema import esquema_api
+from . import renderizado
+from .instrumentacion import InstrumentacionMiddleware
+from .cache import CacheLRU, RespuestaJSON, cache_respuestas
+from .paginacion import codificar_cursor
+from .models import UsuarioPersonalizado, Eventos, Reservas, Comentarios, EstadisticasEvento
+from .motor_reservas import AforoCompleto, actualizar_reserva, cancelar_reserva, crear_reserva, crear_reservas_lote
+
+
+def crear_organizador(email="org@example.com"):
+    return UsuarioPersonalizado.objects.create(
+        username=email, nombre="Org", email=email, contrasenha="x", tipo="organizador"
+    )
+
+
+def crear_asistente(email="asis@example.com"):
+    return UsuarioPersonalizado.objects.create(
+        username=email, nombre="Asis", email=email, contrasenha="x", tipo="asistente"
+    )
+
+
+def cabecera_token(usuario):
+    token, _ = Token.objects.get_or_create(user=usuario)
+    return {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+
+
+def crear_eventos(organizador, n, fecha=datetime.date(2025, 1, 1)):
+    return Eventos.objects.bulk_create([
+        Eventos(titulo=f"Evento {i}", descripcion="desc", fecha=fecha + datetime.timedelta(days=i),
+                capacidad=100, organizador=organizador)
+        for i in range(n)
+    ])
+
+
+@override_settings(ALIAS_LECTURA=None)
+class ProyectoTestCase(TestCase):
+    """
+    Los ids se reutilizan entre tests, así que las cachés en proceso se vacían en cada uno.
+    La réplica de lectura de los tests es otro fichero vacío; solo la usa ``ReplicaLecturaTests``.
+    """
+
+    def setUp(self):
+        cache_respuestas.clear()
+        cache_tokens.clear()
+        super().setUp()
+
+
+class ListarEventosTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        crear_eventos(self.organizador, 60)
+
+    def test_numero_de_consultas_constante(self):
+        # Sello de versión + COUNT del paginador + una única consulta con JOIN para la página
+        for limite in (1, 10, 50):
+            with self.assertNumQueries(3):
+                respuesta = self.client.get(reverse("listar_evento"), {"limite": limite})
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(len(respuesta.json()["results"]), limite)
+
+    def test_incluye_organizador(self):
+        respuesta = self.client.get(reverse("listar_evento"), {"limite": 1})
+        evento = respuesta.json()["results"][0]
+        self.assertEqual(evento["fecha"], "2025-01-01")
+        self.assertEqual(evento["organizador"], {
+            "id": self.organizador.id, "nombre": "Org", "email": "org@example.com"
+        })
+
+
+class CursorEventosTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        # Varias filas por fecha para comprobar el desempate por id
+        crear_eventos(organizador, 7)
+        crear_eventos(organizador, 7)
+
+    def test_recorre_todos_los_eventos_sin_repetir(self):
+        vistos = []
+        cursor = ""
+        while cursor is not None:
+            # Sello de versión + la página, sin COUNT
+            with self.assertNumQueries(2):
+                datos = self.client.get(reverse("listar_evento"), {"cursor": cursor, "limite": 4}).json()
+            vistos.extend(e["id"] for e in datos["results"])
+            cursor = datos["next_cursor"]
+        esperados = list(Eventos.objects.order_by("fecha", "id").values_list("id", flat=True))
+        self.assertEqual(vistos, esperados)
+
+    def test_cursor_invalido(self):
+        respuesta = self.client.get(reverse("listar_evento"), {"cursor": "no-es-un-cursor"})
+        self.assertEqual(respuesta.status_code, 400)
+        # JSON válido con tipos que no corresponden al campo del cursor
+        for valor in ([5, 3], [None, 3], ["2025-13-01", 3], [["2025-01-01"], 3]):
+            cursor = codificar_cursor(*valor)
+            for nombre_url, args in (("listar_evento", []), ("listar_comentarios", [Eventos.objects.first().id])):
+                respuesta = self.client.get(reverse(nombre_url, args=args), {"cursor": cursor})
+                self.assertEqual(respuesta.status_code, 400, (nombre_url, valor))
+
+    def test_limite_en_modo_cursor(self):
+        for limite in (0, -1, "x"):
+            respuesta = self.client.get(reverse("listar_evento"), {"cursor": "", "limite": limite})
+            self.assertEqual(respuesta.status_code, 400)
+        datos = self.client.get(reverse("listar_evento"), {"cursor": "", "limite": 10000}).json()
+        self.assertEqual(len(datos["results"]), 14)
+
+    def test_modo_pagina_sigue_funcionando(self):
+        datos = self.client.get(reverse("listar_evento"), {"pagina": 2, "limite": 5}).json()
+        self.assertEqual(datos["count"], 14)
+        self.assertEqual(datos["current_page"], 2)
+
+
+class BusquedaEventosTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        fecha = datetime.date(2025, 1, 1)
+        self.concierto = Eventos.objects.create(titulo="Concierto de jazz", descripcion="Música en directo",
+                                                fecha=fecha, capacidad=10, organizador=organizador)
+        self.charla = Eventos.objects.create(titulo="Charla", descripcion="Historia del jazz y del blues",
+                                             fecha=fecha, capacidad=10, organizador=organizador)
+        Eventos.objects.create(titulo="Teatro", descripcion="Obra clásica", fecha=fecha, capacidad=10,
+                               organizador=organizador)
+
+    def buscar(self, q):
+        datos = self.client.get(reverse("listar_evento"), {"q": q}).json()
+        return [e["id"] for e in datos["results"]]
+
+    def test_ordena_por_relevancia(self):
+        # El título pesa igual que la descripción, pero es un campo más corto
+        self.assertEqual(self.buscar("jazz"), [self.concierto.id, self.charla.id])
+
+    def test_prefijo_y_acentos(self):
+        self.assertEqual(self.buscar("musica"), [self.concierto.id])
+        self.assertEqual(self.buscar("clas"), [self.buscar("teatro")[0]])
+
+    def test_sincroniza_al_guardar_y_borrar(self):
+        self.charla.titulo = "Taller de cerámica"
+        self.charla.descripcion = "Práctico"
+        self.charla.save()
+        self.assertEqual(self.buscar("jazz"), [self.concierto.id])
+        self.assertEqual(self.buscar("ceramica"), [self.charla.id])
+        self.concierto.delete()
+        self.assertEqual(self.buscar("jazz"), [])
+
+    def test_caracteres_especiales(self):
+        respuesta = self.client.get(reverse("listar_evento"), {"q": '"jazz" OR ('})
+        self.assertEqual(respuesta.status_code, 200)
+
+
+class CalendarioEventosTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Del miércoles 1 de enero al domingo 9 de febrero de 2025
+        self.eventos = crear_eventos(crear_organizador(), 40)
+        Eventos.objects.filter(fecha__lte="2025-01-05").update(entradas_vendidas=3)
+
+    def test_rango_de_fechas(self):
+        datos = self.client.get(reverse("listar_evento"), {"desde": "2025-01-10", "hasta": "2025-01-19",
+                                                           "limite": 50}).json()
+        self.assertEqual(datos["count"], 10)
+        self.assertEqual(datos["results"][0]["fecha"], "2025-01-10")
+        self.assertEqual(datos["results"][-1]["fecha"], "2025-01-19")
+
+    def test_fecha_invalida(self):
+        for parametros in ({"desde": "ayer"}, {"hasta": "2025-13-01"}, {"fecha": "x"}):
+            respuesta = self.client.get(reverse("listar_evento"), parametros)
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertIn("error", respuesta.json())
+
+    def test_agrupa_por_mes_en_una_consulta(self):
+        with self.assertNumQueries(1):
+            datos = self.client.get(reverse("calendario_eventos")).json()
+        capacidad = self.eventos[0].capacidad
+        self.assertEqual(datos["agrupacion"], "mes")
+        self.assertEqual(datos["results"], [
+            {"periodo": "2025-01-01", "eventos": 31, "capacidad": 31 * capacidad, "entradas_vendidas": 15,
+             "plazas_libres": 31 * capacidad - 15},
+            {"periodo": "2025-02-01", "eventos": 9, "capacidad": 9 * capacidad, "entradas_vendidas": 0,
+             "plazas_libres": 9 * capacidad},
+        ])
+
+    def test_agrupa_por_semana_y_dia(self):
+        semanas = self.client.get(reverse("calendario_eventos"), {"agrupacion": "semana", "hasta": "2025-01-12"}).json()
+        # Las semanas empiezan en lunes
+        self.assertEqual([(p["periodo"], p["eventos"]) for p in semanas["results"]],
+                         [("2024-12-30", 5), ("2025-01-06", 7)])
+        dias = self.client.get(reverse("calendario_eventos"), {"agrupacion": "dia", "desde": "2025-02-08"}).json()
+        self.assertEqual([(p["periodo"], p["eventos"]) for p in dias["results"]],
+                         [("2025-02-08", 1), ("2025-02-09", 1)])
+
+    def test_parametros_invalidos(self):
+        for parametros in ({"agrupacion": "anho"}, {"desde": "2025/01/01"}):
+            self.assertEqual(self.client.get(reverse("calendario_eventos"), parametros).status_code, 400)
+
+
+class CacheLRUTests(TestCase):
+
+    def test_expulsa_la_menos_usada(self):
+        cache = CacheLRU(max_entradas=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_caduca(self):
+        cache = CacheLRU(ttl=-1)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), None)
+
+
+class CacheRespuestasTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                             capacidad=10, organizador=self.organizador)
+
+    def test_segunda_peticion_sin_consultas(self):
+        url = reverse("listar_evento")
+        self.client.get(url, {"limite": 3, "pagina": 1})
+        # Mismos parámetros en otro orden -> misma clave; solo se lee el sello de versión
+        with self.assertNumQueries(1):
+            respuesta = self.client.get(url, {"pagina": 1, "limite": 3})
+        self.assertEqual(respuesta.json()["count"], 1)
+        self.assertEqual(cache_respuestas.estadisticas()["aciertos"], 1)
+
+    def test_escritura_invalida_el_listado(self):
+        url = reverse("listar_evento")
+        self.client.get(url)
+        self.evento.titulo = "Feria renovada"
+        self.evento.save()
+        self.assertEqual(self.client.get(url).json()["results"][0]["titulo"], "Feria renovada")
+        self.organizador.nombre = "Otro"
+        self.organizador.save()
+        self.assertEqual(self.client.get(url).json()["results"][0]["organizador"]["nombre"], "Otro")
+
+    def test_guardar_otros_campos_del_usuario_no_invalida(self):
+        url = reverse("listar_evento")
+        self.client.get(url)
+        self.organizador.last_login = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        self.organizador.save(update_fields=["last_login"])
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        self.organizador.email = "nuevo@example.com"
+        self.organizador.save(update_fields=["email"])
+        self.assertEqual(self.client.get(url).json()["results"][0]["organizador"]["email"], "nuevo@example.com")
+
+    def test_invalidacion_precisa_por_evento(self):
+        otro = Eventos.objects.create(titulo="Otro", descripcion="desc", fecha=datetime.date(2025, 1, 2),
+                                      capacidad=10, organizador=self.organizador)
+        url = reverse("listar_comentarios", args=[self.evento.id])
+        url_otro = reverse("listar_comentarios", args=[otro.id])
+        self.client.get(url)
+        self.client.get(url_otro)
+        Comentarios.objects.create(texto="Hola", evento=self.evento)
+        self.assertEqual(len(self.client.get(url).json()["results"]), 1)
+        with self.assertNumQueries(1):
+            self.client.get(url_otro)
+
+    def test_cambio_de_evento_invalida_ambos_listados(self):
+        asistente = UsuarioPersonalizado.objects.create(username="a@example.com", nombre="A", email="a@example.com",
+                                                        contrasenha="x", tipo="asistente")
+        otro = Eventos.objects.create(titulo="Otro", descripcion="desc", fecha=datetime.date(2025, 1, 2),
+                                      capacidad=10, organizador=self.organizador)
+        reserva = Reservas.objects.create(usuario=asistente, evento=self.evento, entradas_reservadas=1)
+        url = reverse("listar_reservas", args=[self.evento.id])
+        self.assertEqual(len(self.client.get(url).json()["results"]), 1)
+        reserva = Reservas.objects.get(id=reserva.id)
+        reserva.evento = otro
+        reserva.save()
+        self.assertEqual(self.client.get(url).json()["results"], [])
+
+    def test_no_guarda_si_hubo_escritura_durante_la_lectura(self):
+        generacion = cache_respuestas.generacion("eventos")
+        cache_respuestas.invalidar("eventos")
+        cache_respuestas.guardar("eventos?", "eventos", generacion, {"results": []})
+        self.assertEqual(cache_respuestas.obtener("eventos?", "eventos"), None)
+
+
+class ETagTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        self.evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                             capacidad=10, organizador=organizador)
+
+    def test_304_sin_consultas_del_listado(self):
+        url = reverse("listar_comentarios", args=[self.evento.id])
+        etag = self.client.get(url).headers["ETag"]
+        with self.assertNumQueries(1):
+            respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 304)
+        self.assertEqual(respuesta.headers["ETag"], etag)
+
+    def test_escritura_cambia_el_etag(self):
+        url = reverse("listar_comentarios", args=[self.evento.id])
+        etag = self.client.get(url).headers["ETag"]
+        Comentarios.objects.create(texto="Hola", evento=self.evento)
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta.headers["ETag"], etag)
+
+    def test_etag_depende_de_los_parametros(self):
+        url = reverse("listar_evento")
+        etag = self.client.get(url, {"pagina": 1}).headers["ETag"]
+        self.assertEqual(self.client.get(url, {"pagina": 1}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, {"limite": 1}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_sin_etag_en_404(self):
+        respuesta = self.client.get(reverse("listar_reservas", args=[self.evento.id + 100]))
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertNotIn("ETag", respuesta.headers)
+
+
+class MotorReservasTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.asistente = crear_asistente()
+        self.evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                             capacidad=5, organizador=self.organizador)
+
+    def reservar(self, entradas, estado="pendiente"):
+        return self.client.post(reverse("crear_reserva"), {
+            "usuario": self.asistente.id, "evento": self.evento.id,
+            "entradas_reservadas": entradas, "estado": estado,
+        }, **cabecera_token(self.asistente))
+
+    def vendidas(self):
+        self.evento.refresh_from_db()
+        return self.evento.entradas_vendidas
+
+    def test_rechaza_exceso_de_aforo(self):
+        self.assertEqual(self.reservar(4).status_code, 201)
+        self.assertEqual(self.reservar(2).status_code, 409)
+        self.assertEqual(self.reservar(1).status_code, 201)
+        self.assertEqual(self.vendidas(), 5)
+        self.assertEqual(Reservas.objects.count(), 2)
+
+    def test_entradas_invalidas(self):
+        self.assertEqual(self.reservar(0).status_code, 400)
+        self.assertEqual(self.reservar("dos").status_code, 400)
+
+    def test_estado_invalido(self):
+        self.assertEqual(self.reservar(1, "foo").status_code, 400)
+        reserva_id = self.reservar(1).json()["id"]
+        respuesta = self.client.patch(reverse("actualizar_reserva", args=[reserva_id]), {"estado": "foo"},
+                                      content_type="application/json", **cabecera_token(self.organizador))
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(Reservas.objects.get(id=reserva_id).estado, "pendiente")
+        self.assertEqual(self.vendidas(), 1)
+
+    def test_actualizar_y_cancelar_mantienen_el_contador(self):
+        reserva_id = self.reservar(2).json()["id"]
+        url = reverse("actualizar_reserva", args=[reserva_id])
+        cabecera = cabecera_token(self.organizador)
+        self.client.patch(url, {"entradas_reservadas": 4}, content_type="application/json", **cabecera)
+        self.assertEqual(self.vendidas(), 4)
+        self.assertEqual(self.client.patch(url, {"entradas_reservadas": 6}, content_type="application/json",
+                                           **cabecera).status_code, 409)
+        self.client.patch(url, {"estado": "cancelada"}, content_type="application/json", **cabecera)
+        self.assertEqual(self.vendidas(), 0)
+        self.client.patch(url, {"estado": "confirmada"}, content_type="application/json", **cabecera)
+        self.assertEqual(self.vendidas(), 4)
+
+        otro = Eventos.objects.create(titulo="Otro", descripcion="desc", fecha=datetime.date(2025, 1, 2),
+                                      capacidad=10, organizador=self.organizador)
+        self.client.patch(url, {"evento": otro.id}, content_type="application/json", **cabecera)
+        otro.refresh_from_db()
+        self.assertEqual((self.vendidas(), otro.entradas_vendidas), (0, 4))
+
+        self.client.delete(reverse("cancelar_reserva", args=[reserva_id]), **cabecera_token(self.asistente))
+        otro.refresh_from_db()
+        self.assertEqual(otro.entradas_vendidas, 0)
+
+    def test_borrados_fuera_del_motor_devuelven_plazas(self):
+        self.reservar(2)
+        self.reservar(1, "cancelada")
+        otro = crear_asistente("otro@example.com")
+        crear_reserva(otro, self.evento, 3)
+        self.assertEqual(self.vendidas(), 5)
+        # Cascada al borrar el usuario y borrado por queryset (como el admin)
+        otro.delete()
+        self.assertEqual(self.vendidas(), 2)
+        Reservas.objects.filter(evento=self.evento).delete()
+        self.assertEqual(self.vendidas(), 0)
+        self.assertEqual(self.reservar(5).status_code, 201)
+
+    def editar_evento(self, **datos):
+        return self.client.patch(reverse("actualizar_evento", args=[self.evento.id]), datos,
+                                 content_type="application/json", **cabecera_token(self.organizador))
+
+    def test_editar_evento_no_pisa_reservas_concurrentes(self):
+        self.evento.capacidad = 2
+        self.evento.save()
+        leer_evento = views.get_object_or_404
+
+        def leer_y_reservar(*args, **kwargs):
+            # Una reserva se confirma entre la lectura del evento y su save()
+            evento = leer_evento(*args, **kwargs)
+            crear_reserva(self.asistente, evento, 2)
+            return evento
+
+        with mock.patch.object(views, "get_object_or_404", leer_y_reservar):
+            self.assertEqual(self.editar_evento(titulo="Feria nueva").status_code, 200)
+        self.assertEqual(self.vendidas(), 2)
+        self.assertEqual(self.evento.titulo, "Feria nueva")
+        self.assertEqual(self.reservar(2).status_code, 409)
+
+    def test_capacidad_menor_que_las_vendidas(self):
+        self.reservar(4)
+        self.assertEqual(self.editar_evento(capacidad=3, titulo="Otro").status_code, 409)
+        self.evento.refresh_from_db()
+        self.assertEqual((self.evento.capacidad, self.evento.titulo), (5, "Feria"))
+        self.assertEqual(self.editar_evento(capacidad="mucha").status_code, 400)
+        self.assertEqual(self.editar_evento(capacidad=4).status_code, 200)
+        self.assertEqual(self.reservar(1).status_code, 409)
+
+
+class ConcurrenciaReservasTests(TransactionTestCase):
+
+    def test_reservas_en_paralelo_no_sobrevenden(self):
+        organizador = crear_organizador()
+        asistente = crear_asistente()
+        evento = Eventos.objects.create(titulo="Concierto", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                        capacidad=300, organizador=organizador)
+
+        def reservar(_):
+            try:
+                crear_reserva(asistente, evento, 1)
+                return True
+            except AforoCompleto:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            resultados = list(pool.map(reservar, range(2000)))
+
+        evento.refresh_from_db()
+        self.assertEqual(sum(resultados), 300)
+        self.assertEqual(evento.entradas_vendidas, 300)
+        self.assertEqual(Reservas.objects.filter(evento=evento).count(), 300)
+
+
+class ReservasLoteTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        self.asistente = crear_asistente()
+        self.eventos = [
+            Eventos.objects.create(titulo=f"Evento {i}", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                   capacidad=3, organizador=organizador)
+            for i in range(2)
+        ]
+        self.cabecera = cabecera_token(self.asistente)
+
+    def enviar(self, reservas):
+        return self.client.post(reverse("crear_reservas_lote"), {"reservas": reservas},
+                                content_type="application/json", **self.cabecera)
+
+    def reserva(self, evento, entradas=1, **extra):
+        return {"usuario": self.asistente.id, "evento": evento, "entradas_reservadas": entradas,
+                "estado": "pendiente", **extra}
+
+    def test_resultados_por_elemento(self):
+        a, b = (e.id for e in self.eventos)
+        respuesta = self.enviar([
+            self.reserva(a, 2),
+            self.reserva(b, 1),
+            self.reserva(a, 2),
+            self.reserva(a, 1),
+            self.reserva(a + b + 100),
+            self.reserva(b, 0),
+            self.reserva(b, 1, usuario=999),
+        ])
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual([r["status"] for r in datos["resultados"]], [201, 201, 409, 201, 404, 400, 404])
+        self.assertEqual(datos["creadas"], 3)
+        self.assertEqual(list(Eventos.objects.order_by("id").values_list("entradas_vendidas", flat=True)), [3, 1])
+
+    def test_numero_de_consultas_no_depende_del_tamano(self):
+        a, b = (e.id for e in self.eventos)
+        Eventos.objects.filter(id__in=[a, b]).update(capacidad=1000)
+
+        def consultas(n):
+            with CaptureQueriesContext(connection) as capturadas:
+                self.enviar([self.reserva(a), self.reserva(b)] * n)
+            # SQLite trocea el INSERT masivo según su límite de parámetros
+            return [c["sql"] for c in capturadas if not c["sql"].startswith('INSERT INTO "Proyecto_reservas"')]
+
+        consultas(1)  # crea las filas de los sellos de versión
+        pocas = consultas(1)
+        self.assertEqual(len(consultas(250)), len(pocas))
+        self.assertEqual(Reservas.objects.count(), 504)
+
+    def test_una_consulta_por_evento_distinto(self):
+        organizador = self.eventos[0].organizador
+        eventos = crear_eventos(organizador, 10)
+
+        def consultas(lote):
+            with CaptureQueriesContext(connection) as capturadas:
+                self.enviar([self.reserva(evento.id) for evento in lote])
+            return capturadas
+
+        consultas(eventos)  # crea las filas de los sellos de versión
+        uno, diez = consultas(eventos[:1]), consultas(eventos)
+        # Solo crece el UPDATE condicional del aforo de cada evento
+        self.assertEqual(len(diez) - len(uno), 9)
+        self.assertEqual(sum('"Proyecto_eventos" SET' in c["sql"] for c in diez), 10)
+
+    def test_invalida_listado(self):
+        url = reverse("listar_reservas", args=[self.eventos[0].id])
+        self.assertEqual(self.client.get(url).json()["results"], [])
+        self.enviar([self.reserva(self.eventos[0].id)])
+        self.assertEqual(len(self.client.get(url).json()["results"]), 1)
+
+
+class ImportacionExportacionTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.asistente = crear_asistente()
+        self.cabecera = cabecera_token(self.organizador)
+
+    def importar(self, nombre_url, cuerpo, formato, **params):
+        url = reverse(nombre_url) + f"?formato={formato}&" + "&".join(f"{k}={v}" for k, v in params.items())
+        return self.client.post(url, cuerpo, content_type="application/octet-stream", **self.cabecera).json()
+
+    def test_importa_ndjson_por_lotes(self):
+        lineas = [json.dumps({"titulo": f"Evento {i}", "descripcion": "desc", "fecha": "2025-03-01",
+                              "capacidad": 10}) for i in range(25)]
+        lineas.insert(3, "{no es json")
+        lineas.insert(7, json.dumps({"titulo": "Sin fecha", "capacidad": 1}))
+        resumen = self.importar("importar_eventos", "\n".join(lineas), "ndjson", tamano_lote=10)
+        self.assertEqual(resumen["importados"], 25)
+        self.assertEqual([e["linea"] for e in resumen["errores"]], [4, 8])
+        self.assertEqual(Eventos.objects.filter(organizador=self.organizador).count(), 25)
+        # Los eventos importados se indexan para la búsqueda
+        self.assertEqual(self.client.get(reverse("listar_evento"), {"q": "evento"}).json()["count"], 25)
+
+    def test_importa_reservas_csv_y_actualiza_aforo(self):
+        evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                        capacidad=10, organizador=self.organizador)
+        cuerpo = ("usuario,evento,entradas_reservadas,estado\n"
+                  f"{self.asistente.id},{evento.id},2,confirmada\n"
+                  f"{self.asistente.id},{evento.id},3,cancelada\n"
+                  f"{self.asistente.id},{evento.id + 50},1,pendiente\n"
+                  f"{self.asistente.id},{evento.id},1,\n")
+        resumen = self.importar("importar_reservas", cuerpo, "csv", tamano_lote=2)
+        self.assertEqual((resumen["importados"], resumen["errores_totales"]), (3, 1))
+        evento.refresh_from_db()
+        self.assertEqual(evento.entradas_vendidas, 3)
+
+    def test_importar_reservas_respeta_aforo_y_propiedad(self):
+        evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                        capacidad=2, organizador=self.organizador)
+        ajeno = Eventos.objects.create(titulo="Ajeno", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                       capacidad=100, organizador=crear_organizador("otro@example.com"))
+        lineas = [json.dumps({"usuario": self.asistente.id, "evento": evento_id, "entradas_reservadas": entradas})
+                  for evento_id, entradas in ((evento.id, 50), (evento.id, 50), (evento.id, 2), (ajeno.id, 1))]
+        resumen = self.importar("importar_reservas", "\n".join(lineas), "ndjson")
+        self.assertEqual(resumen["importados"], 1)
+        self.assertEqual([(e["linea"], e["status"]) for e in resumen["errores"]], [(4, 403), (1, 409), (2, 409)])
+        evento.refresh_from_db()
+        ajeno.refresh_from_db()
+        self.assertEqual((evento.entradas_vendidas, ajeno.entradas_vendidas), (2, 0))
+        self.assertEqual(Reservas.objects.count(), 1)
+
+    def test_exporta_en_streaming(self):
+        crear_eventos(self.organizador, 3)
+        respuesta = self.client.get(reverse("exportar_eventos"), {"formato": "ndjson"}, **self.cabecera)
+        self.assertTrue(respuesta.streaming)
+        filas = [json.loads(linea) for linea in b"".join(respuesta.streaming_content).decode().splitlines()]
+        self.assertEqual([f["titulo"] for f in filas], ["Evento 0", "Evento 1", "Evento 2"])
+        self.assertEqual(filas[0]["fecha"], "2025-01-01")
+
+        respuesta = self.client.get(reverse("exportar_eventos"), {"formato": "csv"}, **self.cabecera)
+        lineas = b"".join(respuesta.streaming_content).decode().splitlines()
+        self.assertEqual(lineas[0], "id,titulo,descripcion,fecha,capacidad,url,organizador")
+        self.assertEqual(len(lineas), 4)
+
+    def test_exportar_reservas_solo_del_organizador(self):
+        evento = crear_eventos(self.organizador, 1)[0]
+        Reservas.objects.create(usuario=self.asistente, evento=evento, entradas_reservadas=1)
+        url = reverse("exportar_reservas", args=[evento.id])
+        respuesta = self.client.get(url, **self.cabecera)
+        self.assertEqual(len(b"".join(respuesta.streaming_content).decode().splitlines()), 1)
+        otro = cabecera_token(crear_organizador("otro@example.com"))
+        self.assertEqual(self.client.get(url, **otro).status_code, 403)
+
+    def test_ida_y_vuelta_csv(self):
+        crear_eventos(self.organizador, 4)
+        exportado = b"".join(self.client.get(reverse("exportar_eventos"), {"formato": "csv"},
+                                             **self.cabecera).streaming_content)
+        resumen = self.importar("importar_eventos", exportado, "csv")
+        self.assertEqual(resumen["importados"], 4)
+        self.assertEqual(Eventos.objects.count(), 8)
+
+
+class ListadosPorEventoTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        self.evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                             capacidad=1000, organizador=organizador)
+        Comentarios.objects.bulk_create([Comentarios(texto=f"Comentario {i}", evento=self.evento) for i in range(45)])
+        asistente = crear_asistente()
+        Reservas.objects.bulk_create([Reservas(usuario=asistente, evento=self.evento, entradas_reservadas=1)
+                                      for _ in range(7)])
+        # bulk_create no emite señales; el total de los listados sale de las estadísticas
+        estadisticas.reconstruir([self.evento.id])
+
+    def recorrer(self, nombre_url, **params):
+        url = reverse(nombre_url, args=[self.evento.id])
+        ids, cursor, paginas = [], None, 0
+        while True:
+            datos = self.client.get(url, {**params, **({"cursor": cursor} if cursor else {})}).json()
+            ids.extend(fila["id"] for fila in datos["results"])
+            paginas += 1
+            cursor = datos["next_cursor"]
+            if cursor is None:
+                return datos["count"], ids, paginas
+
+    def test_comentarios_por_cursor_en_orden(self):
+        count, ids, paginas = self.recorrer("listar_comentarios", limite=20)
+        esperados = list(Comentarios.objects.order_by("FechaC", "id").values_list("id", flat=True))
+        self.assertEqual((count, ids, paginas), (45, esperados, 3))
+
+    def test_limite_maximo(self):
+        estadisticas.sumar_comentarios(
+            Comentarios.objects.bulk_create([Comentarios(texto="x", evento=self.evento) for _ in range(200)]))
+        datos = self.client.get(reverse("listar_comentarios", args=[self.evento.id]), {"limite": 10000}).json()
+        self.assertEqual(len(datos["results"]), 100)
+        self.assertEqual(datos["count"], 245)
+
+    def test_reservas_sin_n_mas_1(self):
+        # Sello de versión + estadísticas del evento (existencia y total) + página, sin COUNT
+        with self.assertNumQueries(3):
+            count, ids, _ = self.recorrer("listar_reservas", limite=50)
+        self.assertEqual(count, 7)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_parametros_invalidos(self):
+        url = reverse("listar_reservas", args=[self.evento.id])
+        self.assertEqual(self.client.get(url, {"limite": "-1"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"cursor": "xx"}).status_code, 400)
+
+
+class CamposParcialesTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        self.evento = crear_eventos(organizador, 6)[0]
+        Reservas.objects.bulk_create([Reservas(usuario=crear_asistente(), evento=self.evento, entradas_reservadas=2)])
+        Comentarios.objects.bulk_create([Comentarios(texto=f"c{i}", evento=self.evento) for i in range(3)])
+
+    def test_eventos_solo_columnas_pedidas(self):
+        with CaptureQueriesContext(connection) as consultas:
+            datos = self.client.get(reverse("listar_evento"), {"fields": "titulo, id", "limite": 2}).json()
+        self.assertEqual(datos["results"][0], {"id": self.evento.id, "titulo": "Evento 0"})
+        pagina = consultas[-1]["sql"]
+        self.assertNotIn("descripcion", pagina)
+        self.assertNotIn("JOIN", pagina)
+
+    def test_eventos_por_cursor_sin_fecha(self):
+        datos = self.client.get(reverse("listar_evento"), {"fields": "titulo", "cursor": "", "limite": 4}).json()
+        self.assertEqual(datos["results"][0], {"titulo": "Evento 0"})
+        siguiente = self.client.get(reverse("listar_evento"), {"fields": "titulo", "cursor": datos["next_cursor"]}).json()
+        self.assertEqual([e["titulo"] for e in siguiente["results"]], ["Evento 4", "Evento 5"])
+
+    def test_con_busqueda(self):
+        feria = Eventos.objects.create(titulo="Feria del libro", descripcion="", fecha=datetime.date(2025, 3, 1),
+                                       capacidad=10, organizador=self.evento.organizador)
+        datos = self.client.get(reverse("listar_evento"), {"fields": "id", "q": "libro"}).json()
+        self.assertEqual(datos["results"], [{"id": feria.id}])
+
+    def test_organizador_anidado(self):
+        datos = self.client.get(reverse("listar_evento"), {"fields": "organizador", "limite": 1}).json()
+        self.assertEqual(datos["results"][0]["organizador"]["email"], "org@example.com")
+
+    def test_reservas_y_comentarios(self):
+        reservas = self.client.get(reverse("listar_reservas", args=[self.evento.id]), {"fields": "estado"}).json()
+        self.assertEqual(reservas["results"], [{"estado": "pendiente"}])
+        comentarios = self.client.get(reverse("listar_comentarios", args=[self.evento.id]), {"fields": "texto"}).json()
+        self.assertEqual(comentarios["results"], [{"texto": "c0"}, {"texto": "c1"}, {"texto": "c2"}])
+
+    def test_campo_desconocido(self):
+        for nombre, args in (("listar_evento", []), ("listar_reservas", [self.evento.id]),
+                             ("listar_comentarios", [self.evento.id])):
+            respuesta = self.client.get(reverse(nombre, args=args), {"fields": "id,contrasenha"})
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertIn("contrasenha", respuesta.json()["error"])
+
+
+class AutenticacionCacheadaTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.cabecera = cabecera_token(self.organizador)
+        self.evento = Eventos.objects.create(titulo="Feria", descripcion="desc", fecha=datetime.date(2025, 1, 1),
+                                             capacidad=10, organizador=self.organizador)
+        self.url = reverse("borrar_evento", args=[self.evento.id + 100])
+
+    def test_segunda_peticion_sin_consulta_de_token(self):
+        self.client.delete(self.url, **self.cabecera)
+        # Solo la búsqueda del evento (404)
+        with self.assertNumQueries(1):
+            respuesta = self.client.delete(self.url, **self.cabecera)
+        self.assertEqual(respuesta.status_code, 404)
+
+    def test_logout_invalida(self):
+        self.client.delete(self.url, **self.cabecera)
+        self.assertEqual(self.client.post(reverse("logout"), **self.cabecera).status_code, 200)
+        self.assertEqual(self.client.delete(self.url, **self.cabecera).status_code, 401)
+
+    def test_cambio_de_tipo_invalida(self):
+        self.client.delete(self.url, **self.cabecera)
+        self.organizador.tipo = "asistente"
+        self.organizador.save()
+        self.assertEqual(self.client.delete(self.url, **self.cabecera).status_code, 403)
+
+    def test_rotacion_y_borrado_de_usuario(self):
+        self.client.delete(self.url, **self.cabecera)
+        Token.objects.filter(user=self.organizador).delete()
+        nueva = cabecera_token(self.organizador)
+        self.assertEqual(self.client.delete(self.url, **self.cabecera).status_code, 401)
+        self.assertEqual(self.client.delete(self.url, **nueva).status_code, 404)
+        self.organizador.delete()
+        self.assertEqual(self.client.delete(self.url, **nueva).status_code, 401)
+
+    def test_indice_por_usuario_acotado(self):
+        cache = CacheTokens(max_entradas=2, ttl=60)
+        for pk in range(5):
+            cache.guardar(f"clave{pk}", UsuarioPersonalizado(pk=pk), None, cache.generacion())
+        self.assertEqual(cache._clave_por_usuario, {3: "clave3", 4: "clave4"})
+        cache.invalidar_usuario(4)
+        self.assertIsNone(cache.obtener("clave4"))
+
+        caducada = CacheTokens(ttl=-1)
+        caducada.guardar("clave", UsuarioPersonalizado(pk=1), None, caducada.generacion())
+        self.assertIsNone(caducada.obtener("clave"))
+        self.assertEqual(caducada._clave_por_usuario, {})
+
+
+@override_settings(PASSWORD_HASHERS=[
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+])
+class CredencialesTests(ProyectoTestCase):
+
+    def registrar(self, email="nuevo@example.com", contrasenha="secreta"):
+        return self.client.post(reverse("register"), {"nombre": "Nuevo", "email": email,
+                                                      "contrasenha": contrasenha, "tipo": "asistente"})
+
+    def login(self, email="nuevo@example.com", contrasenha="secreta"):
+        return self.client.post(reverse("login"), {"email": email, "contrasenha": contrasenha})
+
+    def test_registro_guarda_hash_y_login(self):
+        self.assertEqual(self.registrar().status_code, 201)
+        guardada = UsuarioPersonalizado.objects.get(email="nuevo@example.com").contrasenha
+        self.assertNotEqual(guardada, "secreta")
+        self.assertTrue(check_password("secreta", guardada))
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login(contrasenha="otra").status_code, 400)
+        self.assertEqual(self.login(email="nadie@example.com").status_code, 400)
+
+    def test_hash_antiguo_se_actualiza_al_entrar(self):
+        usuario = crear_asistente()
+        usuario.contrasenha = make_password("secreta", hasher="md5")
+        usuario.save()
+        self.assertEqual(self.login(email=usuario.email).status_code, 200)
+        usuario.refresh_from_db()
+        self.assertTrue(usuario.contrasenha.startswith("pbkdf2_sha256$"))
+
+    def test_pool_saturado_devuelve_503(self):
+        self.registrar()
+        plazas = threading.BoundedSemaphore(1)
+        plazas.acquire()
+        with mock.patch.object(credenciales, "_plazas", plazas):
+            respuesta = self.login()
+        self.assertEqual(respuesta.status_code, 503)
+        self.assertEqual(respuesta["Retry-After"], "1")
+
+    def test_espera_agotada_devuelve_503(self):
+        liberar = threading.Event()
+        with mock.patch.object(credenciales, "ESPERA_MAXIMA", 0.01), \
+                mock.patch.object(credenciales, "make_password", lambda contrasenha: liberar.wait(5)):
+            respuesta = self.registrar()
+        liberar.set()
+        self.assertEqual(respuesta.status_code, 503)
+        self.assertEqual(respuesta["Retry-After"], "1")
+
+    def test_migracion_hashea_texto_plano(self):
+        migracion = importlib.import_module("Proyecto.migrations.0008_hashear_contrasenhas")
+        plano = crear_asistente()
+        ya_hasheado = crear_organizador()
+        ya_hasheado.contrasenha = make_password("clave")
+        ya_hasheado.save()
+        migracion.hashear_contrasenhas(apps, None)
+        plano.refresh_from_db()
+        self.assertTrue(check_password("x", plano.contrasenha))
+        self.assertEqual(UsuarioPersonalizado.objects.get(pk=ya_hasheado.pk).contrasenha, ya_hasheado.contrasenha)
+
+
+class VistasAsyncTests(ProyectoTestCase):
+    """
+    Las vistas de ``Proyecto.vistas_async`` deben responder igual que las APIView.
+    """
+
+    def setUp(self):
+        super().setUp()
+        organizador = crear_organizador()
+        asistente = crear_asistente()
+        eventos = crear_eventos(organizador, 12)
+        self.evento = eventos[0]
+        Reservas.objects.bulk_create([Reservas(usuario=asistente, evento=self.evento, entradas_reservadas=1)
+                                      for _ in range(7)])
+        Comentarios.objects.bulk_create([Comentarios(texto=f"c{i}", evento=self.evento) for i in range(5)])
+
+    async def comparar(self, nombre, args=(), parametros=None):
+        url = reverse(nombre, args=args)
+        sincrona = await sync_to_async(self.client.get)(url, parametros or {})
+        cache_respuestas.clear()
+        with override_settings(ROOT_URLCONF="RestAPI.urls_async"):
+            asincrona = await self.async_client.get(url, parametros or {})
+        self.assertIsInstance(asincrona, RespuestaJSON)
+        self.assertEqual(asincrona.status_code, sincrona.status_code)
+        self.assertEqual(asincrona.json(), sincrona.json())
+        return asincrona
+
+    async def test_mismas_respuestas(self):
+        await self.comparar("listar_evento", parametros={"limite": 5, "pagina": 2})
+        await self.comparar("listar_evento", parametros={"pagina": 9})
+        await self.comparar("listar_evento", parametros={"limite": 5, "cursor": ""})
+        await self.comparar("listar_evento", parametros={"cursor": "xx"})
+        await self.comparar("listar_evento", parametros={"desde": "2025-01-03", "hasta": "2025-01-08"})
+        await self.comparar("listar_evento", parametros={"desde": "mañana"})
+        await self.comparar("calendario_eventos", parametros={"agrupacion": "semana"})
+        await self.comparar("calendario_eventos", parametros={"agrupacion": "anho"})
+        await self.comparar("listar_reservas", args=[self.evento.id], parametros={"limite": 3})
+        await self.comparar("listar_evento", parametros={"fields": "id,fecha", "cursor": ""})
+        await self.comparar("listar_comentarios", args=[self.evento.id], parametros={"fields": "FechaC"})
+        await self.comparar("listar_reservas", args=[self.evento.id], parametros={"fields": "x"})
+        await self.comparar("listar_comentarios", args=[self.evento.id])
+        await self.comparar("listar_comentarios", args=[self.evento.id + 1000])
+
+    async def test_etag_y_304(self):
+        respuesta = await self.comparar("listar_evento")
+        with override_settings(ROOT_URLCONF="RestAPI.urls_async"):
+            repetida = await self.async_client.get(reverse("listar_evento"), headers={"If-None-Match": respuesta["ETag"]})
+        self.assertEqual(repetida.status_code, 304)
+
+
+class PerfilSQLiteTests(TestCase):
+
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_PRAGMAS_PRODUCCION)
+    def test_pragmas_de_produccion(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            conexion = DatabaseWrapper({**connection.settings_dict, **settings.SQLITE_CONEXIONES_PRODUCCION,
+                                        "NAME": os.path.join(directorio, "perfil.sqlite3")}, alias="perfil")
+            try:
+                pragmas = leer_pragmas(conexion)
+                self.assertEqual(pragmas["journal_mode"], "wal")
+                self.assertEqual(pragmas["busy_timeout"], 5000)
+                self.assertEqual(pragmas["synchronous"], 1)  # NORMAL
+                self.assertEqual(conexion.transaction_mode, "IMMEDIATE")
+            finally:
+                conexion.close()
+
+
+class ReplicaLecturaTests(TestCase):
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache_respuestas.clear()
+        cache_tokens.clear()
+        self.organizador = crear_organizador()
+        Eventos.objects.create(titulo="En principal", descripcion="", fecha=datetime.date(2025, 1, 1),
+                               capacidad=10, organizador=self.organizador)
+        # Simula una réplica retrasada con contenido distinto
+        organizador_replica = UsuarioPersonalizado.objects.using("replica").create(
+            id=self.organizador.id, username="r@example.com", nombre="R", email="r@example.com", contrasenha="x")
+        Eventos.objects.using("replica").create(titulo="En réplica", descripcion="", fecha=datetime.date(2025, 1, 1),
+                                                capacidad=10, organizador=organizador_replica)
+
+    def titulos(self):
+        respuesta = self.client.get(reverse("listar_evento"))
+        return [evento["titulo"] for evento in respuesta.json()["results"]]
+
+    def test_listados_leen_de_la_replica(self):
+        self.assertEqual(self.titulos(), ["En réplica"])
+
+    async def test_vistas_async_leen_de_la_replica(self):
+        with override_settings(ROOT_URLCONF="RestAPI.urls_async"):
+            respuesta = await self.async_client.get(reverse("listar_evento"))
+        self.assertEqual([evento["titulo"] for evento in respuesta.json()["results"]], ["En réplica"])
+
+    def test_lee_sus_propias_escrituras(self):
+        respuesta = self.client.post(reverse("crear_evento"), {"titulo": "Nuevo", "descripcion": "", "fecha": "2025-02-01",
+                                                               "capacidad": 5, "url": ""},
+                                     **cabecera_token(self.organizador))
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertIn(REPLICA_COOKIE, respuesta.cookies)
+        self.assertEqual(self.titulos(), ["En principal", "Nuevo"])
+
+        # Al caducar la cookie vuelve a leer de la réplica
+        del self.client.cookies[REPLICA_COOKIE]
+        self.assertEqual(self.titulos(), ["En réplica"])
+
+    def test_escrituras_y_otras_vistas_en_principal(self):
+        respuesta = self.client.delete(reverse("borrar_evento", args=[self.organizador.id + 1000]),
+                                       **cabecera_token(self.organizador))
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertNotIn(REPLICA_COOKIE, respuesta.cookies)
+        self.assertEqual(Eventos.objects.using("replica").count(), 1)
+
+    def test_estadisticas_que_faltan_se_calculan_en_la_principal(self):
+        evento = Eventos.objects.get(titulo="En principal")
+        Comentarios.objects.create(texto="Hola", evento=evento)
+        EstadisticasEvento.objects.filter(evento=evento).delete()
+        EstadisticasEvento.objects.using("replica").filter(evento_id=evento.id).delete()
+
+        respuesta = self.client.get(reverse("listar_comentarios", args=[evento.id]))
+        self.assertEqual(respuesta.json()["count"], 1)
+        self.assertEqual(EstadisticasEvento.objects.get(evento=evento).comentarios, 1)
+
+
+class EstadisticasEventoTests(ProyectoTestCase):
+    CAMPOS = [f.name for f in EstadisticasEvento._meta.fields if f.name != "evento"]
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.asistente = crear_asistente()
+        self.a, self.b = (Eventos.objects.create(titulo=t, descripcion="", fecha=datetime.date(2025, 1, 1),
+                                                 capacidad=20, organizador=self.organizador) for t in "ab")
+
+    def guardadas(self, evento):
+        return EstadisticasEvento.objects.filter(evento=evento).values(*self.CAMPOS).get()
+
+    def exactas(self, evento):
+        fila = estadisticas.calcular([evento.id])[0]
+        return {campo: getattr(fila, campo) for campo in self.CAMPOS}
+
+    def test_mantenimiento_incremental(self):
+        r1 = crear_reserva(self.asistente, self.a, 3, "pendiente")
+        r2 = crear_reserva(self.asistente, self.a, 2, "confirmada")
+        actualizar_reserva(r1.id, estado="confirmada", entradas_reservadas=4)
+        actualizar_reserva(r2.id, evento=self.b)
+        cancelar_reserva(r1)
+        crear_reservas_lote([{"usuario": self.asistente.id, "evento": self.b.id, "entradas_reservadas": 1,
+                              "estado": "cancelada"}])
+        comentario = Comentarios.objects.create(texto="x", evento=self.a)
+        Comentarios.objects.create(texto="y", evento=self.a)
+        comentario.evento = self.b
+        comentario.save()
+        Comentarios.objects.filter(evento=self.a).delete()
+        for evento in (self.a, self.b):
+            self.assertEqual(self.guardadas(evento), self.exactas(evento))
+        self.assertEqual(self.guardadas(self.b)["entradas_confirmada"], 2)
+        self.assertEqual(self.guardadas(self.b)["comentarios"], 1)
+
+    def test_borrar_evento_sin_consultas_por_fila(self):
+        Reservas.objects.bulk_create([Reservas(usuario=self.asistente, evento=self.a, entradas_reservadas=1)
+                                      for _ in range(200)])
+        Comentarios.objects.bulk_create([Comentarios(texto="x", evento=self.a) for _ in range(200)])
+        url_comentarios = reverse("listar_comentarios", args=[self.a.id])
+        self.assertEqual(self.client.get(url_comentarios).status_code, 200)
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = self.client.delete(reverse("borrar_evento", args=[self.a.id]),
+                                           **cabecera_token(self.organizador))
+        self.assertEqual(respuesta.status_code, 200)
+        # Sin UPDATE de estadísticas ni de sellos por cada reserva o comentario
+        self.assertLess(len(contexto), 25)
+        self.assertFalse(any('"Proyecto_estadisticasevento" SET' in q["sql"] for q in contexto.captured_queries))
+        # Los listados cacheados del evento dejan de servirse
+        self.assertEqual(self.client.get(url_comentarios).status_code, 404)
+        self.assertEqual(list(EstadisticasEvento.objects.values_list("evento_id", flat=True)), [self.b.id])
+
+    def test_endpoint_en_una_consulta(self):
+        crear_reserva(self.asistente, self.a, 5, "confirmada")
+        url = reverse("estadisticas_evento", args=[self.a.id])
+        cabecera = cabecera_token(self.organizador)
+        self.client.get(url, **cabecera)
+        with self.assertNumQueries(1):
+            datos = self.client.get(url, **cabecera).json()
+        self.assertEqual(datos["ocupacion"], 0.25)
+        self.assertEqual(datos["entradas"], {"pendiente": 0, "confirmada": 5, "cancelada": 0})
+        self.assertEqual(self.client.get(reverse("estadisticas_evento", args=[999]), **cabecera).status_code, 404)
+
+    def test_eventos_sin_fila_y_reconstruccion(self):
+        evento = crear_eventos(self.organizador, 1)[0]
+        Reservas.objects.bulk_create([Reservas(usuario=self.asistente, evento=evento, entradas_reservadas=2)])
+        datos = self.client.get(reverse("estadisticas_evento", args=[evento.id]),
+                                **cabecera_token(self.organizador)).json()
+        self.assertEqual(datos["reservas"]["pendiente"], 1)
+
+        EstadisticasEvento.objects.filter(evento=self.a).update(comentarios=50)
+        call_command("reconstruir_estadisticas", stdout=io.StringIO())
+        self.assertEqual(self.guardadas(self.a)["comentarios"], 0)
+
+    def test_completar_no_pisa_filas_existentes(self):
+        EstadisticasEvento.objects.filter(evento=self.a).update(comentarios=7)
+        EstadisticasEvento.objects.filter(evento=self.b).delete()
+        self.assertEqual(estadisticas.completar([self.a.id, self.b.id, 999]), 2)
+        self.assertEqual(self.guardadas(self.a)["comentarios"], 7)
+        self.assertEqual(self.guardadas(self.b), self.exactas(self.b))
+
+
+class PanelOrganizadorTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        self.asistente = crear_asistente()
+        self.eventos = [Eventos.objects.create(titulo=f"Evento {i}", descripcion="", fecha=datetime.date(2025, 1, 1 + i),
+                                               capacidad=10, organizador=self.organizador) for i in range(5)]
+        crear_eventos(crear_organizador("otro@example.com"), 3)
+        crear_reserva(self.asistente, self.eventos[0], 3, "confirmada")
+        crear_reserva(self.asistente, self.eventos[0], 2, "pendiente")
+        actualizar_reserva(crear_reserva(self.asistente, self.eventos[0], 1, "pendiente").id, estado="cancelada")
+        Comentarios.objects.create(texto="x", evento=self.eventos[0])
+        self.cabecera = cabecera_token(self.organizador)
+
+    def test_una_consulta_por_pagina(self):
+        self.client.get(reverse("panel_organizador"), **self.cabecera)
+        vistos = []
+        cursor = ""
+        while cursor is not None:
+            with self.assertNumQueries(1):
+                datos = self.client.get(reverse("panel_organizador"), {"cursor": cursor, "limite": 2},
+                                        **self.cabecera).json()
+            vistos.extend(evento["id"] for evento in datos["results"])
+            cursor = datos["next_cursor"]
+        self.assertEqual(vistos, [evento.id for evento in self.eventos])
+
+    def test_agregados(self):
+        datos = self.client.get(reverse("panel_organizador"), {"hasta": "2025-01-01"}, **self.cabecera).json()
+        self.assertEqual(datos["results"], [{
+            "id": self.eventos[0].id, "titulo": "Evento 0", "fecha": "2025-01-01", "capacidad": 10,
+            "entradas_vendidas": 5, "plazas_libres": 5,
+            "reservas": {"total": 3, "pendiente": 1, "confirmada": 1, "cancelada": 1},
+            "entradas": {"pendiente": 2, "confirmada": 3, "cancelada": 1},
+            "comentarios": 1,
+        }])
+
+    def test_eventos_sin_fila_de_estadisticas(self):
+        evento = crear_eventos(self.organizador, 1, fecha=datetime.date(2026, 1, 1))[0]
+        Reservas.objects.bulk_create([Reservas(usuario=self.asistente, evento=evento, entradas_reservadas=2)])
+        datos = self.client.get(reverse("panel_organizador"), {"desde": "2026-01-01"}, **self.cabecera).json()
+        self.assertEqual(datos["results"][0]["reservas"]["pendiente"], 1)
+        self.assertTrue(EstadisticasEvento.objects.filter(evento=evento).exists())
+
+    def test_solo_organizadores(self):
+        self.assertEqual(self.client.get(reverse("panel_organizador")).status_code, 401)
+        self.assertEqual(self.client.get(reverse("panel_organizador"), **cabecera_token(self.asistente)).status_code,
+                         403)
+        self.assertEqual(self.client.get(reverse("panel_organizador"), {"cursor": "x"}, **self.cabecera).status_code,
+                         400)
+
+
+class EsquemaPrecalculadoTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        esquema_api.clear()
+        self.addCleanup(esquema_api.clear)
+
+    def test_se_genera_una_vez_y_responde_304(self):
+        url = reverse("schema-json")
+        with mock.patch.object(esquema_api, "generar", wraps=esquema_api.generar) as generar:
+            respuesta = self.client.get(url)
+            self.client.get(url)
+        self.assertEqual(generar.call_count, 1)
+        listado = json.loads(respuesta.content)["paths"]["/eventos/listar/"]["get"]
+        self.assertIn("cursor", [parametro["name"] for parametro in listado["parameters"]])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=respuesta["ETag"]).status_code, 304)
+
+        comprimida = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(comprimida["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(comprimida.content), respuesta.content)
+        # Cada codificación con su ETag fuerte
+        self.assertNotEqual(comprimida["ETag"], respuesta["ETag"])
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=comprimida["ETag"])
+                         .status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=respuesta["ETag"])
+                         .status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=comprimida["ETag"]).status_code, 200)
+        self.assertIn(url, self.client.get(reverse("schema-swagger-ui")).content.decode())
+
+    def test_arranque_sin_drf_yasg(self):
+        codigo = ("import sys, django; django.setup(); import RestAPI.urls; "
+                  "print(sorted(m for m in sys.modules if m.startswith('drf_yasg.')))")
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=settings.BASE_DIR, capture_output=True,
+                                text=True, check=True, env={**os.environ, "DJANGO_SETTINGS_MODULE": "RestAPI.settings"})
+        self.assertEqual(salida.stdout.strip(), "[]")
+
+    def test_fichero_y_regeneracion(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            fichero = os.path.join(directorio, "esquema.json")
+            call_command("generar_esquema", salida=fichero, stdout=io.StringIO())
+            with override_settings(ESQUEMA_API_FICHERO=fichero):
+                with open(fichero, "wb") as f:
+                    f.write(b'{"swagger": "2.0"}')
+                self.assertEqual(self.client.get(reverse("schema-json")).json(), {"swagger": "2.0"})
+
+                url = reverse("regenerar_esquema")
+                usuario = crear_organizador()
+                self.assertEqual(self.client.post(url, **cabecera_token(usuario)).status_code, 403)
+                UsuarioPersonalizado.objects.filter(id=usuario.id).update(is_staff=True)
+                cache_tokens.clear()
+                etag = self.client.post(url, **cabecera_token(usuario)).json()["etag"]
+                self.assertEqual(self.client.get(reverse("schema-json"))["ETag"], etag)
+                with open(fichero, "rb") as f:
+                    self.assertIn(b'"paths"', f.read())
+
+
+class InstrumentacionTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.organizador = crear_organizador()
+        crear_eventos(self.organizador, 3)
+
+    def test_desactivada_no_esta_en_la_cadena(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("listar_evento")))
+        with self.assertRaises(MiddlewareNotUsed):
+            InstrumentacionMiddleware(lambda request: None)
+
+    @override_settings(INSTRUMENTACION=True, INSTRUMENTACION_MAX_CONSULTAS=1)
+    def test_server_timing_y_umbral(self):
+        with CaptureQueriesContext(connection) as consultas, self.assertLogs("Proyecto.instrumentacion") as log:
+            respuesta = self.client.get(reverse("listar_evento"))
+        cabecera = respuesta["Server-Timing"]
+        self.assertRegex(cabecera, r'^vista;dur=[\d.]+, bd;dur=[\d.]+, consultas;desc="\d+"$')
+        self.assertIn(f'consultas;desc="{len(consultas)}"', cabecera)
+        self.assertIn('FROM "Proyecto_eventos"', log.output[0])
+
+    @override_settings(INSTRUMENTACION=True, ROOT_URLCONF="RestAPI.urls_async")
+    async def test_vistas_async(self):
+        evento = await Eventos.objects.afirst()
+        respuesta = await self.async_client.get(reverse("listar_comentarios", args=[evento.id]))
+        # Las consultas se ejecutan en el hilo de base de datos, no en el del bucle de eventos
+        self.assertNotIn('consultas;desc="0"', respuesta["Server-Timing"])
+
+
+@override_settings(COMENTARIOS_DIFERIDOS=True, COMENTARIOS_LOTE=3, COMENTARIOS_MAX_PENDIENTES=5)
+class ComentariosDiferidosTests(ProyectoTestCase):
+    """
+    Cada test usa un buffer propio y sin hilo de fondo: los vaciados se hacen a mano.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.buffer = BufferComentarios()
+        for parche in (mock.patch("Proyecto.views.buffer_comentarios", self.buffer),
+                       mock.patch.object(BufferComentarios, "_arrancar")):
+            parche.start()
+            self.addCleanup(parche.stop)
+        organizador = crear_organizador()
+        self.evento = crear_eventos(organizador, 1)[0]
+        EstadisticasEvento.objects.create(evento=self.evento)
+        self.cabecera = cabecera_token(organizador)
+
+    def comentar(self, evento_id, texto="hola"):
+        return self.client.post(reverse("crear_comentario", args=[evento_id]), {"texto": texto},
+                                content_type="application/json", **self.cabecera)
+
+    def test_el_listado_refleja_el_vaciado(self):
+        url = reverse("listar_comentarios", args=[self.evento.id])
+        antes = self.client.get(url)
+        for i in range(2):
+            self.assertEqual(self.comentar(self.evento.id, f"c{i}").status_code, 202)
+        self.assertEqual(self.comentar(999).status_code, 404)
+        self.assertEqual(Comentarios.objects.count(), 0)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=antes["ETag"]).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.buffer.vaciar(), 2)
+        despues = self.client.get(url, HTTP_IF_NONE_MATCH=antes["ETag"])
+        self.assertEqual(despues.status_code, 200)
+        self.assertEqual([c["texto"] for c in despues.json()["results"]], ["c0", "c1"])
+        self.assertEqual(EstadisticasEvento.objects.get(evento=self.evento).comentarios, 2)
+
+    def test_disparadores_y_limite(self):
+        for i in range(3):
+            self.comentar(self.evento.id)
+        # Con COMENTARIOS_LOTE pendientes se despierta al hilo de fondo
+        self.assertTrue(self.buffer._despertar.is_set())
+        self.assertEqual(Comentarios.objects.count(), 0)
+        # Con COMENTARIOS_MAX_PENDIENTES vacía la propia petición
+        for i in range(2):
+            self.comentar(self.evento.id)
+        self.assertEqual((Comentarios.objects.count(), len(self.buffer)), (5, 0))
+
+    def test_descarta_comentarios_de_eventos_borrados(self):
+        self.comentar(self.evento.id)
+        self.evento.delete()
+        with self.assertLogs("Proyecto.comentarios_diferidos", "WARNING"):
+            self.assertEqual(self.buffer.vaciar(), 0)
+        self.assertEqual(len(self.buffer), 0)
+
+
+class RenderizadoTests(ProyectoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.evento = crear_eventos(crear_organizador(), 30)[0]
+
+    def test_codificadores_equivalentes_a_drf(self):
+        datos = {"texto": "Canción ñ €", "fecha": datetime.datetime(2025, 1, 1, 10, 30, 0, 123456),
+                 "precio": decimal.Decimal("1.50"), 1: [None, True, 2.5], "grande": 2 ** 70}
+        esperado = json.loads(JSONRenderer().render(datos))
+        for nombre, codificar in renderizado.CODIFICADORES.items():
+            with self.subTest(nombre):
+                self.assertEqual(json.loads(codificar(datos)), esperado)
+        self.assertIn("Canción".encode(), renderizado.codificar(datos))
+
+        separadores = {"texto": "línea\u2028párrafo\u2029fin", "nulo": None}
+        for nombre, codificar in renderizado.CODIFICADORES.items():
+            with self.subTest(nombre):
+                self.assertEqual(codificar(separadores), JSONRenderer().render(separadores))
+
+        # Ningún serializador produce NaN ni infinito (ver Proyecto.renderizado)
+        for no_finito in (float("nan"), float("inf")):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({"valor": [no_finito]})
+            with self.assertRaises(ValueError):
+                renderizado.codificar_json({"valor": [no_finito]})
+
+    def test_listado_igual_con_cada_codificador(self):
+        respuestas = set()
+        for codificar in renderizado.CODIFICADORES.values():
+            cache_respuestas.clear()
+            with mock.patch.object(renderizado, "codificar", codificar):
+                respuestas.add(self.client.get(reverse("listar_evento"), {"limite": 30}).content)
+        self.assertEqual(len(respuestas), 1)
+
+    def test_comprime_por_encima_del_umbral(self):
+        url = reverse("listar_evento")
+        grande = self.client.get(url, {"limite": 30}, headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(grande["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", grande["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(grande.content))["count"], 30)
+        # El ETag pasa a ser débil y sigue sirviendo para el 304
+        self.assertTrue(grande["ETag"].startswith("W/"))
+        repetida = self.client.get(url, {"limite": 30}, headers={"Accept-Encoding": "gzip",
+                                                                  "If-None-Match": grande["ETag"]})
+        self.assertEqual(repetida.status_code, 304)
+
+        pequenha = self.client.get(url, {"limite": 1}, headers={"Accept-Encoding": "gzip"})
+        self.assertFalse(pequenha.has_header("Content-Encoding"))
+        sin_gzip = self.client.get(url, {"limite": 30})
+        self.assertFalse(sin_gzip.has_header("Content-Encoding"))
+
+    @override_settings(COMPRESION=False)
+    def test_desactivada(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            renderizado.CompresionMiddleware(lambda request: None)
@@ -0,0 +1,103 @@
+"""
+Sellos de versión persistentes y GET condicionales (ETag / If-None-Match).
+
+Cada escritura incrementa en la tabla ``Versiones`` el sello de las colecciones que
+modifica. Un listado solo necesita leer su sello para saber si el cliente ya tiene la
+versión actual y responder ``304 Not Modified`` sin ejecutar las consultas del listado.
+Al estar en la base de datos, el sello es común a todos los procesos del servidor.
+"""
+import functools
+import inspect
+import hashlib
+
+from django.db.models import F
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+
+from .cache import cache_respuestas, clave_peticion
+from .models import Versiones
+
+
+def incrementar(*etiquetas):
+    """
+    Incrementa los sellos con un UPDATE, sea cual sea el número de etiquetas.
+    """
+    etiquetas = set(etiquetas)
+    if not etiquetas or Versiones.objects.filter(clave__in=etiquetas).update(numero=F('numero') + 1) == len(etiquetas):
+        return
+    # Falta alguna fila: se crean las que no existan (aunque otro proceso las cree a la vez) y se
+    # incrementan todas de nuevo. Un sello que sube dos veces sigue invalidando igual
+    Versiones.objects.bulk_create([Versiones(clave=etiqueta) for etiqueta in etiquetas], ignore_conflicts=True)
+    Versiones.objects.filter(clave__in=etiquetas).update(numero=F('numero') + 1)
+
+
+def leer(etiqueta):
+    return Versiones.objects.filter(clave=etiqueta).values_list('numero', flat=True).first() or 0
+
+
+async def aleer(etiqueta):
+    return await Versiones.objects.filter(clave=etiqueta).values_list('numero', flat=True).afirst() or 0
+
+
+def registrar_cambios(*etiquetas):
+    """
+    Punto único de aviso de escritura: invalida la caché en proceso e incrementa los sellos.
+    Las escrituras masivas que no disparan señales deben llamarlo directamente.
+    """
+    cache_respuestas.invalidar_al_confirmar(*etiquetas)
+    incrementar(*etiquetas)
+
+
+def calcular_etag(clave, version):
+    return '"%s"' % hashlib.sha1(f"{clave}|{version}".encode()).hexdigest()
+
+
+def _no_modificado(request, etiqueta_peticion, version):
+    """
+    Devuelve ``(etag, respuesta_304)``; la respuesta es None si el cliente no tiene la versión actual.
+    """
+    etag = calcular_etag(clave_peticion(request, etiqueta_peticion), version)
+    etags_cliente = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in etags_cliente or f"W/{etag}" in etags_cliente or '*' in etags_cliente:
+        respuesta = HttpResponseNotModified()
+        respuesta['ETag'] = etag
+        return etag, respuesta
+    request.version_datos = version
+    return etag, None
+
+
+def _marcar(respuesta, etag):
+    if respuesta.status_code == status.HTTP_200_OK:
+        respuesta['ETag'] = etag
+        respuesta['Cache-Control'] = 'no-cache'
+    return respuesta
+
+
+def respuesta_condicional(etiqueta):
+    """
+    Decorador para el ``get`` de una vista (APIView o vista asíncrona de Django). Añade un
+    ETag fuerte a las respuestas 200 y responde 304 si ``If-None-Match`` coincide. Debe ir
+    por encima de ``cachear_respuesta``: deja la versión en ``request.version_datos`` para
+    que forme parte de la clave de caché.
+    """
+    def decorador(metodo):
+        if inspect.iscoroutinefunction(metodo):
+            @functools.wraps(metodo)
+            async def envoltorio_async(vista, request, *args, **kwargs):
+                etiqueta_peticion = etiqueta.format(**kwargs)
+                etag, no_modificado = _no_modificado(request, etiqueta_peticion, await aleer(etiqueta_peticion))
+                if no_modificado is not None:
+                    return no_modificado
+                return _marcar(await metodo(vista, request, *args, **kwargs), etag)
+            return envoltorio_async
+
+        @functools.wraps(metodo)
+        def envoltorio(vista, request, *args, **kwargs):
+            etiqueta_peticion = etiqueta.format(**kwargs)
+            etag, no_modificado = _no_modificado(request, etiqueta_peticion, leer(etiqueta_peticion))
+            if no_modificado is not None:
+                return no_modificado
+            return _marcar(metodo(vista, request, *args, **kwargs), etag)
+        return envoltorio
+    return decorador
@@ -1,107 +1,136 @@
+import datetime
 import json
 
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from .models import UsuarioPersonalizado, Eventos, Comentarios, Reservas
 from django.views.decorators.csrf import csrf_exempt
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from .permissions import IsOrganizador, IsParticipante
+from .serializers import (proyectar_eventos, serializar_eventos, PROYECCION_EVENTO, PROYECCION_RESERVA,
+                          PROYECCION_COMENTARIO, serializar_estadisticas, serializar_periodo, CAMPOS_PANEL,
+                          serializar_panel)
+from .paginacion import paginar_por_cursor, leer_limite, CursorInvalido
+from . import busqueda, comentarios_diferidos, estadisticas
+from .cache import cache_respuestas, cachear_respuesta
+from .versiones import respuesta_condicional
+from .motor_reservas import (AforoCompleto, crear_reserva, crear_reservas_lote, actualizar_reserva, cancelar_reserva,
+                             cambiar_capacidad, leer_entero_positivo, ESTADOS_RESERVA)
+from .exportacion import (FORMATOS as FORMATOS_EXPORTACION, CAMPOS_EVENTO as CAMPOS_EXPORTACION_EVENTO,
+                          CAMPOS_RESERVA as CAMPOS_EXPORTACION_RESERVA, respuesta_exportacion)
+from .importacion import ImportacionEventos, ImportacionReservas, leer_registros
 from rest_framework.authtoken.models import Token
-from rest_framework.authentication import TokenAuthentication
-
-# Importamos las utilidades de drf-yasg
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from .autenticacion import TokenAuthenticationCacheada
+from .credenciales import ServicioSaturado, hashear_contrasenha, verificar_contrasenha
+from .esquema import esquema_api
+from .comentarios_diferidos import buffer_comentarios
+from .enrutador import marcar_escritura
 
 ##################################
 # CRUD de eventos:
 
+def leer_fecha(parametros, nombre):
+    """
+    Fecha ``YYYY-MM-DD`` del parámetro ``nombre`` (``None`` si no viene). Lanza ``ValueError``
+    con un mensaje para el cliente si no es una fecha válida.
+    """
+    valor = parametros.get(nombre, "")
+    if not valor:
+        return None
+    try:
+        return datetime.date.fromisoformat(valor)
+    except ValueError:
+        raise ValueError(f"El parámetro '{nombre}' debe ser una fecha con formato YYYY-MM-DD.")
+
+
+def filtrar_por_fechas(eventos, parametros):
+    """
+    Filtros ``fecha`` (exacta) y ``desde``/``hasta`` (rango, ambos incluidos). Se resuelven con
+    el índice ``(fecha, id)``. Lanza ``ValueError`` si alguna fecha no es válida.
+    """
+    fecha, desde, hasta = (leer_fecha(parametros, nombre) for nombre in ("fecha", "desde", "hasta"))
+    if fecha:
+        eventos = eventos.filter(fecha=fecha)
+    if desde:
+        eventos = eventos.filter(fecha__gte=desde)
+    if hasta:
+        eventos = eventos.filter(fecha__lte=hasta)
+    return eventos
+
+
+def consulta_eventos(parametros, campos=None):
+    """
+    Queryset proyectado del listado de eventos con los filtros ``q``, ``titulo``, ``fecha``,
+    ``desde`` y ``hasta``, leyendo solo las columnas de ``campos`` si se indican. Lanza
+    ``ValueError`` si alguna fecha no es válida.
+    Lo comparten la vista síncrona y la asíncrona (``Proyecto.vistas_async``).
+    """
+    q_filtro = parametros.get("q", "")
+    titulo_filtro = parametros.get("titulo", "")
+
+    eventos = filtrar_por_fechas(Eventos.objects.all(), parametros)
+    if titulo_filtro:
+        eventos = eventos.filter(titulo__icontains=titulo_filtro)
+    if q_filtro:
+        # Ordenados por relevancia; en modo cursor se mantiene el orden (fecha, id)
+        eventos = busqueda.buscar(eventos, q_filtro)
+    else:
+        eventos = eventos.order_by('fecha', 'id')
+    return proyectar_eventos(eventos, campos)
+
+
+# Tamaño de página por defecto del listado de eventos (el máximo en modo cursor es LIMITE_MAXIMO)
+LIMITE_EVENTOS_POR_DEFECTO = 5
+
+
 class ListarEventosView(APIView):
     """
     GET: Lista todos los eventos disponibles con filtros y paginación.
     """
+    lectura_replica = True
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    # Definición de parámetros de query
-    titulo_param = openapi.Parameter('titulo', openapi.IN_QUERY, description="Filtro por título", type=openapi.TYPE_STRING)
-    fecha_param = openapi.Parameter('fecha', openapi.IN_QUERY, description="Filtro por fecha (YYYY-MM-DD)", type=openapi.TYPE_STRING)
-    limite_param = openapi.Parameter('limite', openapi.IN_QUERY, description="Número de eventos por página", type=openapi.TYPE_INTEGER, default=5)
-    pagina_param = openapi.Parameter('pagina', openapi.IN_QUERY, description="Número de página", type=openapi.TYPE_INTEGER, default=1)
-
-    @swagger_auto_schema(
-        manual_parameters=[titulo_param, fecha_param, limite_param, pagina_param],
-        responses={200: openapi.Response('Listado de eventos', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'count': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'total_pages': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'current_page': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'next': openapi.Schema(type=openapi.TYPE_INTEGER, nullable=True),
-                'previous': openapi.Schema(type=openapi.TYPE_INTEGER, nullable=True),
-                'results': openapi.Schema(
-                    type=openapi.TYPE_ARRAY,
-                    items=openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={
-                            'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                            'titulo': openapi.Schema(type=openapi.TYPE_STRING),
-                            'descripcion': openapi.Schema(type=openapi.TYPE_STRING),
-                            'fecha': openapi.Schema(type=openapi.TYPE_STRING),
-                            'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER),
-                            'url': openapi.Schema(type=openapi.TYPE_STRING),
-                            'organizador': openapi.Schema(
-                                type=openapi.TYPE_OBJECT,
-                                properties={
-                                    'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                    'nombre': openapi.Schema(type=openapi.TYPE_STRING),
-                                    'email': openapi.Schema(type=openapi.TYPE_STRING)
-                                }
-                            )
-                        }
-                    )
-                )
-            }
-        ))}
-    )
+    @respuesta_condicional('eventos')
+    @cachear_respuesta('eventos')
     def get(self, request):
-        titulo_filtro = request.query_params.get("titulo", "")
-        fecha_filtro = request.query_params.get("fecha", "")
-        limite = int(request.query_params.get("limite", 5))
-        pagina = int(request.query_params.get("pagina", 1))
+        cursor = request.query_params.get("cursor")
+
+        try:
+            campos = PROYECCION_EVENTO.leer(request.query_params.get("fields"))
+            eventos = consulta_eventos(request.query_params, campos)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        eventos = Eventos.objects.all()
-        if titulo_filtro:
-            eventos = eventos.filter(titulo__icontains=titulo_filtro)
-        if fecha_filtro:
-            eventos = eventos.filter(fecha=fecha_filtro)
-        eventos = eventos.order_by('fecha')
+        # Modo cursor: sin COUNT(*) ni OFFSET
+        if cursor is not None:
+            try:
+                limite = leer_limite(request.query_params.get("limite"), LIMITE_EVENTOS_POR_DEFECTO, LIMITE_MAXIMO)
+                filas, next_cursor = paginar_por_cursor(eventos, cursor, limite)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            data = {
+                "next_cursor": next_cursor,
+                "results": serializar_eventos(filas, campos),
+            }
+            return Response(data, status=status.HTTP_200_OK)
 
+        limite = int(request.query_params.get("limite", LIMITE_EVENTOS_POR_DEFECTO))
+        pagina = int(request.query_params.get("pagina", 1))
         paginator = Paginator(eventos, limite)
         try:
             eventos_pagina = paginator.page(pagina)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        results = []
-        for e in eventos_pagina:
-            results.append({
-                "id": e.id,
-                "titulo": e.titulo,
-                "descripcion": e.descripcion,
-                "fecha": e.fecha.strftime("%Y-%m-%d") if e.fecha else "",
-                "capacidad": e.capacidad,
-                "url": e.url,
-                "organizador": {
-                    "id": e.organizador.id,
-                    "nombre": e.organizador.nombre,
-                    "email": e.organizador.email,
-                } if e.organizador else None
-            })
+        results = serializar_eventos(eventos_pagina, campos)
 
         data = {
             "count": paginator.count,
@@ -114,36 +143,60 @@ class ListarEventosView(APIView):
         return Response(data, status=status.HTTP_200_OK)
 
 
+# Agrupaciones del calendario: expresión que lleva cada fecha al primer día de su periodo
+AGRUPACIONES_CALENDARIO = {
+    "dia": lambda: F('fecha'),
+    "semana": lambda: TruncWeek('fecha'),
+    "mes": lambda: TruncMonth('fecha'),
+}
+
+
+def consulta_calendario(parametros):
+    """
+    Número de eventos, capacidad, entradas vendidas y plazas libres por periodo (``agrupacion``:
+    ``dia``, ``semana`` o ``mes``) entre ``desde`` y ``hasta``, en una sola consulta con
+    ``GROUP BY``. Devuelve ``(agrupacion, queryset)``; lanza ``ValueError`` si algún parámetro
+    no es válido. Lo comparten la vista síncrona y la asíncrona.
+    """
+    agrupacion = parametros.get("agrupacion", "mes")
+    if agrupacion not in AGRUPACIONES_CALENDARIO:
+        raise ValueError(f"'agrupacion' debe ser uno de: {', '.join(AGRUPACIONES_CALENDARIO)}.")
+    eventos = filtrar_por_fechas(Eventos.objects.all(), parametros)
+    periodos = (eventos.annotate(periodo=AGRUPACIONES_CALENDARIO[agrupacion]())
+                .values('periodo')
+                .annotate(eventos=Count('id'), capacidad=Sum('capacidad'), entradas_vendidas=Sum('entradas_vendidas'))
+                .order_by('periodo'))
+    return agrupacion, periodos
+
+
+class CalendarioEventosView(APIView):
+    """
+    GET: Eventos y plazas libres por día, semana o mes, para pintar un calendario sin
+    descargar el listado completo. No se cachea: las plazas libres cambian con cada reserva.
+    """
+    lectura_replica = True
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        try:
+            agrupacion, periodos = consulta_calendario(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        data = {
+            "agrupacion": agrupacion,
+            "results": [serializar_periodo(fila) for fila in periodos],
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+
 class CrearEventoView(APIView):
     """
     POST: Crea un evento. (Acceso solo para organizadores)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsOrganizador]
 
-    # Esquema del request para crear un evento
-    evento_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        required=['titulo', 'descripcion', 'fecha', 'capacidad', 'url'],
-        properties={
-            'titulo': openapi.Schema(type=openapi.TYPE_STRING, description="Título del evento"),
-            'descripcion': openapi.Schema(type=openapi.TYPE_STRING, description="Descripción del evento"),
-            'fecha': openapi.Schema(type=openapi.TYPE_STRING, format='date', description="Fecha del evento (YYYY-MM-DD)"),
-            'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER, description="Capacidad del evento"),
-            'url': openapi.Schema(type=openapi.TYPE_STRING, description="URL relacionada al evento")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=evento_request,
-        responses={201: openapi.Response('Evento creado', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
-            }
-        ))}
-    )
     def post(self, request):
         data = request.data
         organizador = request.user  # Se asume que el usuario autenticado es el organizador
@@ -162,48 +215,35 @@ class ActualizarEventoView(APIView):
     """
     PUT/PATCH: Actualiza un evento. (Acceso solo para organizadores)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsOrganizador]
 
-    evento_update_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        properties={
-            'titulo': openapi.Schema(type=openapi.TYPE_STRING, description="Título del evento"),
-            'descripcion': openapi.Schema(type=openapi.TYPE_STRING, description="Descripción del evento"),
-            'fecha': openapi.Schema(type=openapi.TYPE_STRING, format='date', description="Fecha del evento (YYYY-MM-DD)"),
-            'capacidad': openapi.Schema(type=openapi.TYPE_INTEGER, description="Capacidad del evento"),
-            'url': openapi.Schema(type=openapi.TYPE_STRING, description="URL relacionada al evento"),
-            'organizador': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del organizador (opcional)")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=evento_update_request,
-        responses={200: openapi.Response('Evento actualizado', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
+    # entradas_vendidas no está: lo mantiene el motor de reservas y guardarlo desde aquí
+    # pisaría las reservas confirmadas entre la lectura del evento y el save()
+    CAMPOS_EDITABLES = ("titulo", "descripcion", "fecha", "capacidad", "url")
+
     def put(self, request, id):
         data = request.data
         evento = get_object_or_404(Eventos, id=id)
-        evento.titulo = data.get("titulo", evento.titulo)
-        evento.descripcion = data.get("descripcion", evento.descripcion)
-        evento.fecha = data.get("fecha", evento.fecha)
-        evento.capacidad = data.get("capacidad", evento.capacidad)
-        evento.url = data.get("url", evento.url)
+        campos = [campo for campo in self.CAMPOS_EDITABLES if campo in data]
+        for campo in campos:
+            setattr(evento, campo, data[campo])
+        if "capacidad" in data:
+            evento.capacidad = leer_entero_positivo(data["capacidad"])
+            if evento.capacidad is None:
+                return Response({"error": "La capacidad debe ser un entero positivo."}, status=status.HTTP_400_BAD_REQUEST)
         if "organizador" in data:
             evento.organizador = get_object_or_404(UsuarioPersonalizado, id=data.get("organizador"))
-        evento.save()
+            campos.append("organizador")
+        try:
+            with transaction.atomic():
+                if "capacidad" in data:
+                    cambiar_capacidad(evento.id, evento.capacidad)
+                evento.save(update_fields=campos)
+        except AforoCompleto as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
         return Response({"mensaje": "Evento actualizado"}, status=status.HTTP_200_OK)
 
-    @swagger_auto_schema(
-        request_body=evento_update_request,
-        responses={200: openapi.Response('Evento actualizado', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
     def patch(self, request, id):
         return self.put(request, id)
 
@@ -212,147 +252,188 @@ class BorrarEventoView(APIView):
     """
     DELETE: Elimina un evento. (Acceso solo para organizadores)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsOrganizador]
 
-    @swagger_auto_schema(
-        responses={200: openapi.Response('Evento eliminado', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
     def delete(self, request, id):
         evento = get_object_or_404(Eventos, id=id)
         evento.delete()
         return Response({"mensaje": "Evento eliminado"}, status=status.HTTP_200_OK)
 
+
+class EstadisticasEventoView(APIView):
+    """
+    GET: Devuelve la ocupación, las reservas y entradas por estado y el número de comentarios
+    de un evento. Se lee de la tabla de estadísticas, sin agregar reservas ni comentarios.
+    (Acceso solo para organizadores)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsOrganizador]
+
+    def get(self, request, id):
+        fila = estadisticas.obtener(id)
+        if fila is None:
+            return Response({"error": "Evento no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(serializar_estadisticas(fila), status=status.HTTP_200_OK)
+
+
+class PanelOrganizadorView(APIView):
+    """
+    GET: Los eventos del organizador autenticado con sus reservas (total, por estado y
+    entradas), plazas libres y número de comentarios, paginados por cursor sobre
+    ``(fecha, id)``. Cada página es una consulta sobre eventos con LEFT JOIN a sus
+    estadísticas: no se lee ninguna reserva ni comentario. Admite ``desde`` y ``hasta``.
+    (Acceso solo para organizadores)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsOrganizador]
+
+    def pagina(self, request, limite):
+        eventos = filtrar_por_fechas(Eventos.objects.filter(organizador=request.user), request.query_params)
+        return paginar_por_cursor(eventos.values(*CAMPOS_PANEL), request.query_params.get("cursor"), limite)
+
+    def get(self, request):
+        try:
+            limite = leer_limite(request.query_params.get("limite"), LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+            filas, next_cursor = self.pagina(request, limite)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Eventos sin fila de estadísticas (ver Proyecto.estadisticas): se calculan y se relee la página
+        faltan = [fila["id"] for fila in filas if fila["estadisticas__comentarios"] is None]
+        if faltan:
+            estadisticas.completar(faltan)
+            filas, next_cursor = self.pagina(request, limite)
+
+        data = {
+            "next_cursor": next_cursor,
+            "results": [serializar_panel(fila) for fila in filas],
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
 ##################################
 # Gestión de reservas:
 
+# Tamaño de página de los listados de reservas y comentarios de un evento (y del panel del organizador)
+LIMITE_POR_DEFECTO = 20
+LIMITE_MAXIMO = 100
+
+
+def listado_por_evento(request, id, modelo, campo_orden, proyeccion, contar):
+    """
+    Página acotada de las filas hijas de un evento, paginada por cursor sobre ``(campo_orden, id)``.
+    Con ``fields`` solo se leen y devuelven esos campos (``proyeccion``). El total, ``contar``,
+    sale de la fila de estadísticas del evento, que sirve también de comprobación de existencia.
+    """
+    try:
+        limite = leer_limite(request.query_params.get("limite"), LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+        campos = proyeccion.leer(request.query_params.get("fields"))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    fila_estadisticas = estadisticas.obtener(id)
+    if fila_estadisticas is None:
+        raise Http404("No Eventos matches the given query.")
+    filas = modelo.objects.filter(evento_id=id).values(*proyeccion.columnas(campos, ('id', campo_orden)))
+    serializar = proyeccion.serializador(campos)
+    try:
+        pagina, next_cursor = paginar_por_cursor(filas, request.query_params.get("cursor"), limite, campo=campo_orden)
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    data = {
+        # Contador mantenido en EstadisticasEvento: O(1) y exacto para el listado sin filtros
+        "count": contar(fila_estadisticas),
+        "next_cursor": next_cursor,
+        "results": [serializar(fila) for fila in pagina],
+    }
+    return Response(data, status=status.HTTP_200_OK)
+
+
 class ListarReservasView(APIView):
     """
-    GET: Lista las reservas de un evento.
+    GET: Lista las reservas de un evento, paginadas por cursor.
     """
+    lectura_replica = True
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    @swagger_auto_schema(
-        manual_parameters=[
-            openapi.Parameter('id', openapi.IN_PATH, description="ID del evento", type=openapi.TYPE_INTEGER)
-        ],
-        responses={200: openapi.Response('Listado de reservas', schema=openapi.Schema(
-            type=openapi.TYPE_ARRAY,
-            items=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'usuario': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'evento': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'estado': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        ))}
-    )
+    @respuesta_condicional('reservas:{id}')
+    @cachear_respuesta('reservas:{id}')
     def get(self, request, id):
-        evento = get_object_or_404(Eventos, id=id)
-        reservas = Reservas.objects.filter(evento=evento)
-        data = []
-        for reserva in reservas:
-            data.append({
-                "id": reserva.id,
-                "usuario": reserva.usuario.id if reserva.usuario else None,
-                "evento": reserva.evento.id,
-                "entradas_reservadas": reserva.entradas_reservadas,
-                "estado": reserva.estado,
-            })
-        return Response(data, status=status.HTTP_200_OK)
+        return listado_por_evento(request, id, Reservas, 'id', PROYECCION_RESERVA, estadisticas.total_reservas)
 
 
 class CrearReservaView(APIView):
     """
     POST: Crea una reserva. (Acceso solo para participantes)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsParticipante]
 
-    reserva_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        required=['usuario', 'evento', 'entradas_reservadas', 'estado'],
-        properties={
-            'usuario': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del usuario"),
-            'evento': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del evento"),
-            'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER, description="Número de entradas reservadas"),
-            'estado': openapi.Schema(type=openapi.TYPE_STRING, description="Estado de la reserva")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=reserva_request,
-        responses={201: openapi.Response('Reserva creada', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
-            }
-        ))}
-    )
     def post(self, request):
         data = request.data
         usuario = get_object_or_404(UsuarioPersonalizado, id=data["usuario"])
         evento = get_object_or_404(Eventos, id=data["evento"])
-        reserva = Reservas.objects.create(
-            usuario=usuario,
-            evento=evento,
-            entradas_reservadas=data["entradas_reservadas"],
-            estado=data["estado"],
-        )
+        entradas = leer_entero_positivo(data["entradas_reservadas"])
+        if entradas is None:
+            return Response({"error": "El número de entradas debe ser un entero positivo."}, status=status.HTTP_400_BAD_REQUEST)
+        estado = data.get("estado", "pendiente")
+        if estado not in ESTADOS_RESERVA:
+            return Response({"error": "Estado de reserva inválido."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            reserva = crear_reserva(usuario, evento, entradas, estado)
+        except AforoCompleto as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
         return Response({"id": reserva.id, "mensaje": "Se ha creado la reserva"}, status=status.HTTP_201_CREATED)
 
 
+class CrearReservasLoteView(APIView):
+    """
+    POST: Crea varias reservas en una sola petición. (Acceso solo para participantes)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsParticipante]
+
+    MAX_RESERVAS = 1000
+
+    def post(self, request):
+        reservas = request.data.get("reservas")
+        if not isinstance(reservas, list) or not reservas:
+            return Response({"error": "Se requiere una lista de reservas."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(reservas) > self.MAX_RESERVAS:
+            return Response({"error": f"Máximo {self.MAX_RESERVAS} reservas por lote."}, status=status.HTTP_400_BAD_REQUEST)
+        resultados = crear_reservas_lote(reservas)
+        return Response({
+            "creadas": sum(1 for r in resultados if r["status"] == status.HTTP_201_CREATED),
+            "resultados": resultados,
+        }, status=status.HTTP_200_OK)
+
+
 class ActualizarReservaView(APIView):
     """
     PUT/PATCH: Actualiza una reserva. (Acceso solo para organizadores)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsOrganizador]
 
-    reserva_update_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        properties={
-            'usuario': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del usuario"),
-            'evento': openapi.Schema(type=openapi.TYPE_INTEGER, description="ID del evento"),
-            'entradas_reservadas': openapi.Schema(type=openapi.TYPE_INTEGER, description="Número de entradas reservadas"),
-            'estado': openapi.Schema(type=openapi.TYPE_STRING, description="Estado de la reserva")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=reserva_update_request,
-        responses={200: openapi.Response('Reserva actualizada', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
     def put(self, request, id):
         data = request.data
         reserva = get_object_or_404(Reservas, id=id)
-        if "usuario" in data:
-            reserva.usuario = get_object_or_404(UsuarioPersonalizado, id=data["usuario"])
-        if "evento" in data:
-            reserva.evento = get_object_or_404(Eventos, id=data["evento"])
-        reserva.entradas_reservadas = data.get("entradas_reservadas", reserva.entradas_reservadas)
-        reserva.estado = data.get("estado", reserva.estado)
-        reserva.save()
+        usuario = get_object_or_404(UsuarioPersonalizado, id=data["usuario"]) if "usuario" in data else None
+        evento = get_object_or_404(Eventos, id=data["evento"]) if "evento" in data else None
+        entradas = None
+        if "entradas_reservadas" in data:
+            entradas = leer_entero_positivo(data["entradas_reservadas"])
+            if entradas is None:
+                return Response({"error": "El número de entradas debe ser un entero positivo."}, status=status.HTTP_400_BAD_REQUEST)
+        if "estado" in data and data["estado"] not in ESTADOS_RESERVA:
+            return Response({"error": "Estado de reserva inválido."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            actualizar_reserva(reserva.id, usuario=usuario, evento=evento, entradas_reservadas=entradas,
+                               estado=data.get("estado"))
+        except AforoCompleto as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
         return Response({"mensaje": "Reserva actualizada"}, status=status.HTTP_200_OK)
 
-    @swagger_auto_schema(
-        request_body=reserva_update_request,
-        responses={200: openapi.Response('Reserva actualizada', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
     def patch(self, request, id):
         return self.put(request, id)
 
@@ -361,23 +442,14 @@ class CancelarReservaView(APIView):
     """
     DELETE: Cancela una reserva. (Solo el titular de la reserva, participante, puede cancelarla)
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated, IsParticipante]
 
-    @swagger_auto_schema(
-        manual_parameters=[
-            openapi.Parameter('id', openapi.IN_PATH, description="ID de la reserva", type=openapi.TYPE_INTEGER)
-        ],
-        responses={200: openapi.Response('Reserva eliminada', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-        ))}
-    )
     def delete(self, request, id):
         reserva = get_object_or_404(Reservas, id=id)
         if request.user != reserva.usuario:
             return Response({"error": "¡No eres el titular!"}, status=status.HTTP_403_FORBIDDEN)
-        reserva.delete()
+        cancelar_reserva(reserva)
         return Response({"mensaje": "Reserva eliminada"}, status=status.HTTP_200_OK)
 
 ##################################
@@ -385,74 +457,145 @@ class CancelarReservaView(APIView):
 
 class ListarComentariosView(APIView):
     """
-    GET: Lista los comentarios de un evento.
+    GET: Lista los comentarios de un evento por orden de publicación, paginados por cursor.
     """
+    lectura_replica = True
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    @swagger_auto_schema(
-        manual_parameters=[
-            openapi.Parameter('id', openapi.IN_PATH, description="ID del evento", type=openapi.TYPE_INTEGER)
-        ],
-        responses={200: openapi.Response('Listado de comentarios', schema=openapi.Schema(
-            type=openapi.TYPE_ARRAY,
-            items=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                    'texto': openapi.Schema(type=openapi.TYPE_STRING),
-                    'FechaC': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )
-        ))}
-    )
+    @respuesta_condicional('comentarios:{id}')
+    @cachear_respuesta('comentarios:{id}')
     def get(self, request, id):
-        evento = get_object_or_404(Eventos, id=id)
-        comentarios = Comentarios.objects.filter(evento=evento)
-        data = []
-        for comentario in comentarios:
-            data.append({
-                "id": comentario.id,
-                "texto": comentario.texto,
-                "FechaC": comentario.FechaC.strftime("%Y-%m-%d %H:%M:%S") if comentario.FechaC else "",
-            })
-        return Response(data, status=status.HTTP_200_OK)
+        return listado_por_evento(request, id, Comentarios, 'FechaC', PROYECCION_COMENTARIO,
+                                  estadisticas.total_comentarios)
 
 
 class CrearComentarioView(APIView):
     """
-    POST: Crea un comentario asociado a un evento.
+    POST: Crea un comentario asociado a un evento. Con escritura diferida responde 202 y el
+    comentario se guarda en el siguiente lote.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [TokenAuthenticationCacheada]
     permission_classes = [IsAuthenticated]
 
-    comentario_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        required=['texto'],
-        properties={
-            'texto': openapi.Schema(type=openapi.TYPE_STRING, description="Texto del comentario")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=comentario_request,
-        responses={201: openapi.Response('Comentario creado', schema=openapi.Schema(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
-            }
-        ))}
-    )
     def post(self, request, id):
-        evento = get_object_or_404(Eventos, id=id)
         data = request.data
+        if comentarios_diferidos.activo():
+            # Solo una lectura; la inserción se hace por lotes (Proyecto.comentarios_diferidos)
+            get_object_or_404(Eventos.objects.only('id'), id=id)
+            buffer_comentarios.anhadir(id, data.get("texto", ""))
+            marcar_escritura()
+            return Response({"mensaje": "Se ha recibido el comentario"}, status=status.HTTP_202_ACCEPTED)
+        evento = get_object_or_404(Eventos, id=id)
         comentario = Comentarios.objects.create(
             texto=data.get("texto", ""),
             evento=evento,
         )
         return Response({"id": comentario.id, "mensaje": "Se ha creado el comentario"}, status=status.HTTP_201_CREATED)
 
+##################################
+# Importación y exportación:
+
+class ExportarEventosView(APIView):
+    """
+    GET: Exporta en streaming los eventos del organizador autenticado. (Acceso solo para organizadores)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsOrganizador]
+
+    def get(self, request):
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS_EXPORTACION:
+            return Response({"error": "Formato no soportado."}, status=status.HTTP_400_BAD_REQUEST)
+        eventos = Eventos.objects.filter(organizador=request.user)
+        return respuesta_exportacion(eventos, CAMPOS_EXPORTACION_EVENTO, formato, "eventos")
+
+
+class ExportarReservasView(APIView):
+    """
+    GET: Exporta en streaming las reservas de un evento. (Acceso solo para el organizador del evento)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsOrganizador]
+
+    def get(self, request, id):
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS_EXPORTACION:
+            return Response({"error": "Formato no soportado."}, status=status.HTTP_400_BAD_REQUEST)
+        evento = get_object_or_404(Eventos, id=id)
+        if evento.organizador_id != request.user.pk:
+            return Response({"error": "El evento pertenece a otro organizador."}, status=status.HTTP_403_FORBIDDEN)
+        reservas = Reservas.objects.filter(evento=evento)
+        return respuesta_exportacion(reservas, CAMPOS_EXPORTACION_RESERVA, formato, f"reservas_evento_{id}")
+
+
+class ImportarView(APIView):
+    """
+    Base de las importaciones: el cuerpo de la petición se lee línea a línea sin cargarlo entero.
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated, IsOrganizador]
+
+    def crear_importacion(self, request, tamano_lote):
+        raise NotImplementedError
+
+    def post(self, request):
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS_EXPORTACION:
+            return Response({"error": "Formato no soportado."}, status=status.HTTP_400_BAD_REQUEST)
+        tamano_lote = None
+        if "tamano_lote" in request.query_params:
+            tamano_lote = leer_entero_positivo(request.query_params["tamano_lote"])
+            if tamano_lote is None:
+                return Response({"error": "tamano_lote debe ser un entero positivo."}, status=status.HTTP_400_BAD_REQUEST)
+        # request.stream es la petición de Django: iterarla lee el cuerpo por líneas
+        registros = leer_registros(request.stream or [], formato)
+        resumen = self.crear_importacion(request, tamano_lote).ejecutar(registros)
+        return Response(resumen, status=status.HTTP_200_OK)
+
+
+class ImportarEventosView(ImportarView):
+    """
+    POST: Importa eventos (NDJSON o CSV) a nombre del organizador autenticado. (Acceso solo para organizadores)
+    """
+
+    def crear_importacion(self, request, tamano_lote):
+        return ImportacionEventos(request.user, tamano_lote)
+
+
+class ImportarReservasView(ImportarView):
+    """
+    POST: Importa reservas (NDJSON o CSV) de los eventos del organizador autenticado. (Acceso solo para organizadores)
+    """
+
+    def crear_importacion(self, request, tamano_lote):
+        return ImportacionReservas(request.user, tamano_lote)
+
+##################################
+# Caché:
+
+class EstadisticasCacheView(APIView):
+    """
+    GET: Devuelve los contadores de la caché de respuestas. (Acceso solo para administradores)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_respuestas.estadisticas(), status=status.HTTP_200_OK)
+
+class RegenerarEsquemaView(APIView):
+    """
+    POST: Vuelve a generar el esquema OpenAPI que sirve swagger.json. (Acceso solo para administradores)
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        cuerpo = esquema_api.regenerar()
+        _, _, etag = esquema_api.obtener()
+        return Response({"etag": etag, "bytes": len(cuerpo)}, status=status.HTTP_200_OK)
+
 ##################################
 # Usuario:
 
@@ -462,28 +605,6 @@ class LoginView(APIView):
     """
     permission_classes = []
 
-    login_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        required=['email', 'contrasenha'],
-        properties={
-            'email': openapi.Schema(type=openapi.TYPE_STRING, description="Email del usuario"),
-            'contrasenha': openapi.Schema(type=openapi.TYPE_STRING, description="Contraseña del usuario")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=login_request,
-        responses={
-            200: openapi.Response('Login exitoso', schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'token': openapi.Schema(type=openapi.TYPE_STRING),
-                    'mensaje': openapi.Schema(type=openapi.TYPE_STRING)
-                }
-            )),
-            400: "Credenciales inválidas."
-        }
-    )
     def post(self, request):
         data = request.data
         email = data.get("email")
@@ -492,13 +613,20 @@ class LoginView(APIView):
         if not email or not contrasenha:
             return Response({"error": "Faltan datos requeridos."}, status=status.HTTP_400_BAD_REQUEST)
 
+        usuario = UsuarioPersonalizado.objects.filter(email=email).only('id', 'contrasenha').first()
+
+        # Si el usuario no existe se verifica igualmente para que el tiempo de respuesta no lo delate
         try:
-            usuario = UsuarioPersonalizado.objects.get(email=email)
-        except UsuarioPersonalizado.DoesNotExist:
+            valida, nuevo_hash = verificar_contrasenha(contrasenha, usuario.contrasenha if usuario else None)
+        except ServicioSaturado as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": "1"})
+        if usuario is None or not valida:
             return Response({"error": "Credenciales inválidas."}, status=status.HTTP_400_BAD_REQUEST)
 
-        if usuario.contrasenha != contrasenha:
-            return Response({"error": "Credenciales inválidas."}, status=status.HTTP_400_BAD_REQUEST)
+        if nuevo_hash:
+            # Hash con parámetros antiguos: se actualiza sin pasar por save() (no cambia nada cacheado)
+            UsuarioPersonalizado.objects.filter(pk=usuario.pk).update(contrasenha=nuevo_hash)
 
         # Obtener o crear el token
         token, created = Token.objects.get_or_create(user=usuario)
@@ -509,34 +637,25 @@ class LoginView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class LogoutView(APIView):
+    """
+    POST: Cierra la sesión borrando el token del usuario autenticado.
+    """
+    authentication_classes = [TokenAuthenticationCacheada]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # El borrado del token lo retira también de la caché de autenticación
+        Token.objects.filter(key=request.auth.key).delete()
+        return Response({"mensaje": "Sesión cerrada."}, status=status.HTTP_200_OK)
+
+
 class RegisterView(APIView):
     """
     POST: Registra un nuevo usuario.
     """
     permission_classes = []
 
-    register_request = openapi.Schema(
-        type=openapi.TYPE_OBJECT,
-        required=['nombre', 'email', 'contrasenha', 'tipo'],
-        properties={
-            'nombre': openapi.Schema(type=openapi.TYPE_STRING, description="Nombre del usuario"),
-            'email': openapi.Schema(type=openapi.TYPE_STRING, description="Email del usuario"),
-            'contrasenha': openapi.Schema(type=openapi.TYPE_STRING, description="Contraseña del usuario"),
-            'tipo': openapi.Schema(type=openapi.TYPE_STRING, description="Tipo de usuario (organizador, asistente, etc.)"),
-            'biografia': openapi.Schema(type=openapi.TYPE_STRING, description="Biografía (opcional)")
-        }
-    )
-
-    @swagger_auto_schema(
-        request_body=register_request,
-        responses={
-            201: openapi.Response('Usuario registrado', schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={'mensaje': openapi.Schema(type=openapi.TYPE_STRING)}
-            )),
-            400: "Faltan datos requeridos o el email ya está registrado."
-        }
-    )
     def post(self, request):
         data = request.data
         nombre = data.get("nombre")
@@ -550,14 +669,19 @@ class RegisterView(APIView):
         if UsuarioPersonalizado.objects.filter(email=email).exists():
             return Response({"error": "El email ya está registrado."}, status=status.HTTP_400_BAD_REQUEST)
 
-        usuario = UsuarioPersonalizado.objects.create(
+        try:
+            contrasenha = hashear_contrasenha(contrasenha)
+        except ServicioSaturado as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": "1"})
+
+        UsuarioPersonalizado.objects.create(
             username=email,
             nombre=nombre,
             email=email,
-            contrasenha=contrasenha,  # Se almacena en texto plano; en producción usar hash.
+            contrasenha=contrasenha,
             tipo=tipo,
             biografia=biografia
         )
-        usuario.save()
         return Response({"mensaje": "Usuario registrado correctamente."}, status=status.HTTP_201_CREATED)
 
@@ -0,0 +1,140 @@
+"""
+Versiones asíncronas de los listados públicos (eventos, calendario, reservas y comentarios).
+
+Son vistas de Django con manejadores ``async def`` que consultan con la API asíncrona del
+ORM. Bajo ASGI se ejecutan en el bucle de eventos sin pasar la petición entera a un hilo;
+solo cada consulta salta al hilo de base de datos. Devuelven el mismo JSON, ETag y códigos
+de estado que las APIView de ``Proyecto.views`` y comparten con ellas filtros, paginación y
+caché. Se activan con ``ROOT_URLCONF = 'RestAPI.urls_async'``.
+"""
+from django.core.paginator import Paginator
+from django.views import View
+
+from . import estadisticas
+from .cache import RespuestaJSON, cachear_respuesta
+from .models import Reservas, Comentarios
+from .paginacion import apaginar_por_cursor, leer_limite, CursorInvalido
+from .serializers import (serializar_eventos, serializar_periodo, PROYECCION_EVENTO, PROYECCION_RESERVA,
+                          PROYECCION_COMENTARIO)
+from .versiones import respuesta_condicional
+from .views import (consulta_eventos, consulta_calendario, LIMITE_EVENTOS_POR_DEFECTO, LIMITE_POR_DEFECTO,
+                    LIMITE_MAXIMO)
+
+
+def error(mensaje, status=400):
+    return RespuestaJSON({"error": mensaje}, status=status)
+
+
+class ListarEventosView(View):
+    """
+    GET: Lista los eventos con filtros y paginación (por página o por cursor).
+    """
+    lectura_replica = True
+
+    @respuesta_condicional('eventos')
+    @cachear_respuesta('eventos')
+    async def get(self, request):
+        cursor = request.GET.get("cursor")
+
+        try:
+            campos = PROYECCION_EVENTO.leer(request.GET.get("fields"))
+            eventos = consulta_eventos(request.GET, campos)
+        except ValueError as e:
+            return error(str(e))
+
+        if cursor is not None:
+            try:
+                limite = leer_limite(request.GET.get("limite"), LIMITE_EVENTOS_POR_DEFECTO, LIMITE_MAXIMO)
+                filas, next_cursor = await apaginar_por_cursor(eventos, cursor, limite)
+            except ValueError as e:
+                return error(str(e))
+            return RespuestaJSON({
+                "next_cursor": next_cursor,
+                "results": serializar_eventos(filas, campos),
+            })
+
+        limite = int(request.GET.get("limite", LIMITE_EVENTOS_POR_DEFECTO))
+        pagina = int(request.GET.get("pagina", 1))
+        # Paginator sobre un rango del tamaño del COUNT: valida la página igual que la vista síncrona
+        try:
+            eventos_pagina = Paginator(range(await eventos.acount()), limite).page(pagina)
+        except Exception as e:
+            return error(str(e))
+        rango = eventos_pagina.object_list
+        filas = [fila async for fila in eventos[rango.start:rango.stop]] if rango else []
+
+        return RespuestaJSON({
+            "count": eventos_pagina.paginator.count,
+            "total_pages": eventos_pagina.paginator.num_pages,
+            "current_page": pagina,
+            "next": pagina + 1 if eventos_pagina.has_next() else None,
+            "previous": pagina - 1 if eventos_pagina.has_previous() else None,
+            "results": serializar_eventos(filas, campos),
+        })
+
+
+class CalendarioEventosView(View):
+    """
+    GET: Eventos y plazas libres por día, semana o mes (sin caché, como la vista síncrona).
+    """
+    lectura_replica = True
+
+    async def get(self, request):
+        try:
+            agrupacion, periodos = consulta_calendario(request.GET)
+        except ValueError as e:
+            return error(str(e))
+        return RespuestaJSON({
+            "agrupacion": agrupacion,
+            "results": [serializar_periodo(fila) async for fila in periodos],
+        })
+
+
+async def listado_por_evento(request, id, modelo, campo_orden, proyeccion, contar):
+    """
+    Equivalente asíncrono de ``Proyecto.views.listado_por_evento``.
+    """
+    try:
+        limite = leer_limite(request.GET.get("limite"), LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+        campos = proyeccion.leer(request.GET.get("fields"))
+    except ValueError as e:
+        return error(str(e))
+    fila_estadisticas = await estadisticas.aobtener(id)
+    if fila_estadisticas is None:
+        return RespuestaJSON({"detail": "No Eventos matches the given query."}, status=404)
+    filas = modelo.objects.filter(evento_id=id).values(*proyeccion.columnas(campos, ('id', campo_orden)))
+    serializar = proyeccion.serializador(campos)
+    try:
+        pagina, next_cursor = await apaginar_por_cursor(filas, request.GET.get("cursor"), limite, campo=campo_orden)
+    except CursorInvalido as e:
+        return error(str(e))
+    return RespuestaJSON({
+        "count": contar(fila_estadisticas),
+        "next_cursor": next_cursor,
+        "results": [serializar(fila) for fila in pagina],
+    })
+
+
+class ListarReservasView(View):
+    """
+    GET: Lista las reservas de un evento, paginadas por cursor.
+    """
+    lectura_replica = True
+
+    @respuesta_condicional('reservas:{id}')
+    @cachear_respuesta('reservas:{id}')
+    async def get(self, request, id):
+        return await listado_por_evento(request, id, Reservas, 'id', PROYECCION_RESERVA, estadisticas.total_reservas)
+
+
+class ListarComentariosView(View):
+    """
+    GET: Lista los comentarios de un evento por orden de publicación, paginados por cursor.
+    """
+    lectura_replica = True
+
+    @respuesta_condicional('comentarios:{id}')
+    @cachear_respuesta('comentarios:{id}')
+    async def get(self, request, id):
+        return await listado_por_evento(request, id, Comentarios, 'FechaC', PROYECCION_COMENTARIO,
+                                        estadisticas.total_comentarios)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,7 +43,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'Proyecto.instrumentacion.InstrumentacionMiddleware',
+    'Proyecto.renderizado.CompresionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'Proyecto.enrutador.EnrutamientoLecturasMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -74,13 +78,63 @@ WSGI_APPLICATION = 'RestAPI.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Perfil de producción de SQLite (Proyecto.basedatos). Es opcional y se activa con
+# SQLITE_PERFIL_PRODUCCION=1 en el entorno del servidor: journal_mode=WAL cambia el propio
+# fichero de la base de datos, y no debe aplicarse en cada 'manage.py' sobre db.sqlite3.
+SQLITE_PERFIL_PRODUCCION = os.environ.get('SQLITE_PERFIL_PRODUCCION') == '1'
+
+# Conexiones persistentes y transacciones BEGIN IMMEDIATE
+SQLITE_CONEXIONES_PRODUCCION = {
+    'CONN_MAX_AGE': 60,
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+    },
+}
+
+# PRAGMA que se aplican a cada conexión SQLite nueva
+SQLITE_PRAGMAS_PRODUCCION = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,  # milisegundos
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+_perfil_sqlite = SQLITE_CONEXIONES_PRODUCCION if SQLITE_PERFIL_PRODUCCION else {}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        **_perfil_sqlite,
+        # Base de tests en fichero: la de memoria compartida no espera a los bloqueos
+        # y los tests de concurrencia necesitan escrituras desde varios hilos.
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    },
+    # Réplica de lectura para los listados públicos (Proyecto.enrutador). En desarrollo es el
+    # mismo fichero; en producción, la réplica que mantenga el despliegue.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        **{clave: valor for clave, valor in _perfil_sqlite.items() if clave != 'OPTIONS'},
+        # Los tests usan un segundo fichero para comprobar a qué base va cada consulta
+        'TEST': {
+            'NAME': BASE_DIR / 'test_replica.sqlite3',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['Proyecto.enrutador.EnrutadorLecturaEscritura']
+
+# Alias de la réplica (None para leer siempre de 'default') y segundos durante los que un
+# cliente que acaba de escribir sigue leyendo de la principal
+ALIAS_LECTURA = 'replica'
+REPLICA_RETARDO_MAXIMO = 5
+
+SQLITE_PRAGMAS = SQLITE_PRAGMAS_PRODUCCION if SQLITE_PERFIL_PRODUCCION else {}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -102,14 +156,50 @@ AUTH_PASSWORD_VALIDATORS = [
 # settings.py
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'Proyecto.autenticacion.TokenAuthenticationCacheada',
         # Puedes agregar otras, como SessionAuthentication, si es necesario.
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # JSON con orjson si está instalado (Proyecto.renderizado)
+    'DEFAULT_RENDERER_CLASSES': [
+        'Proyecto.renderizado.RenderizadorJSON',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# Caché de respuestas de los listados públicos (Proyecto.cache)
+CACHE_RESPUESTAS_MAX_ENTRADAS = 1024
+CACHE_RESPUESTAS_TTL = 30  # segundos
+
+# Caché de autenticación por token (Proyecto.autenticacion)
+TOKEN_CACHE_MAX_ENTRADAS = 10000
+TOKEN_CACHE_TTL = 60  # segundos; límite de propagación de una invalidación a otros procesos
+
+# Esquema OpenAPI precalculado (Proyecto.esquema). Con un fichero, ``manage.py generar_esquema``
+# lo escribe en el despliegue; con None se genera en memoria en la primera petición.
+ESQUEMA_API_FICHERO = None
+SWAGGER_SETTINGS = {'SPEC_URL': 'schema-json'}
+REDOC_SETTINGS = {'SPEC_URL': 'schema-json'}
+
+# Instrumentación por petición (Proyecto.instrumentacion): cabecera Server-Timing y aviso en el
+# log, con el SQL ejecutado, de las peticiones que superan alguno de los umbrales.
+INSTRUMENTACION = False
+INSTRUMENTACION_MAX_CONSULTAS = 20
+INSTRUMENTACION_MAX_MS = 500
+
+# Escritura diferida de comentarios (Proyecto.comentarios_diferidos): se insertan por lotes
+# desde un buffer en memoria por proceso, por tamaño o por tiempo, y al terminar el proceso.
+COMENTARIOS_DIFERIDOS = False
+COMENTARIOS_LOTE = 200
+COMENTARIOS_MAX_PENDIENTES = 5000
+COMENTARIOS_INTERVALO = 0.5  # segundos
+
+# Compresión gzip de las respuestas (Proyecto.renderizado) a partir de este tamaño
+COMPRESION = True
+COMPRESION_MIN_BYTES = 1024
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -18,30 +18,56 @@ from django.contrib import admin
 from django.urls import path
 from Proyecto import views
 from rest_framework.authtoken.views import obtain_auth_token
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api-token-auth/', obtain_auth_token, name='api_token_auth'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+from Proyecto.esquema import EsquemaView, vista_documentacion
 
-    #Endpoints de Eventos
-    path("eventos/listar/", views.ListarEventosView.as_view(), name="listar_evento"),
-    path("eventos/crear/", views.CrearEventoView.as_view(), name="crear_evento"),
-    path("eventos/actualizar/<int:id>/", views.ActualizarEventoView.as_view(), name="actualizar_evento"),
-    path("eventos/borrar/<int:id>/", views.BorrarEventoView.as_view(), name="borrar_evento"),
-    #Endpoints de Reservas
-    path("reservas/listar/<int:id>/", views.ListarReservasView.as_view(), name="listar_reservas"),
-    path("reservas/crear/", views.CrearReservaView.as_view(), name="crear_reserva"),
-    path("reservas/actualizar/<int:id>/", views.ActualizarReservaView.as_view(), name="actualizar_reserva"),
-    path("reservas/cancelar/<int:id>/", views.CancelarReservaView.as_view(), name="cancelar_reserva"),
-    #Endpoints de Comentarios
-    path("comentarios/listar/<int:id>/", views.ListarComentariosView.as_view(), name="listar_comentarios"),
-    path("comentarios/crear/<int:id>/", views.CrearComentarioView.as_view(), name="crear_comentario"),
-    #Endpoints de Login
-    path("login/", views.LoginView.as_view(), name="login"),
-    path("register/", views.RegisterView.as_view(), name="register"),
-]
+# Las páginas de Swagger y ReDoc no generan el esquema: lo piden a ``swagger.json``
+# (SPEC_URL en settings), que lo sirve precalculado.
+schema_swagger_ui = vista_documentacion('swagger')
+schema_redoc = vista_documentacion('redoc')
 
 
+def rutas(listados=views):
+    """
+    Rutas de la API. ``listados`` es el módulo que aporta las vistas de los listados
+    públicos: ``Proyecto.views`` (APIView síncronas) o ``Proyecto.vistas_async``.
+    """
+    return [
+        path('admin/', admin.site.urls),
+        path('api-token-auth/', obtain_auth_token, name='api_token_auth'),
+        path('swagger/', schema_swagger_ui, name='schema-swagger-ui'),
+        path('redoc/', schema_redoc, name='schema-redoc'),
+        path('swagger.json', EsquemaView.as_view(), name='schema-json'),
+        path('esquema/regenerar/', views.RegenerarEsquemaView.as_view(), name='regenerar_esquema'),
+
+        #Endpoints de Eventos
+        path("eventos/listar/", listados.ListarEventosView.as_view(), name="listar_evento"),
+        path("eventos/calendario/", listados.CalendarioEventosView.as_view(), name="calendario_eventos"),
+        path("eventos/crear/", views.CrearEventoView.as_view(), name="crear_evento"),
+        path("eventos/actualizar/<int:id>/", views.ActualizarEventoView.as_view(), name="actualizar_evento"),
+        path("eventos/borrar/<int:id>/", views.BorrarEventoView.as_view(), name="borrar_evento"),
+        path("eventos/panel/", views.PanelOrganizadorView.as_view(), name="panel_organizador"),
+        path("eventos/estadisticas/<int:id>/", views.EstadisticasEventoView.as_view(), name="estadisticas_evento"),
+        #Endpoints de Reservas
+        path("reservas/listar/<int:id>/", listados.ListarReservasView.as_view(), name="listar_reservas"),
+        path("reservas/crear/", views.CrearReservaView.as_view(), name="crear_reserva"),
+        path("reservas/crear/lote/", views.CrearReservasLoteView.as_view(), name="crear_reservas_lote"),
+        path("reservas/actualizar/<int:id>/", views.ActualizarReservaView.as_view(), name="actualizar_reserva"),
+        path("reservas/cancelar/<int:id>/", views.CancelarReservaView.as_view(), name="cancelar_reserva"),
+        #Endpoints de Comentarios
+        path("comentarios/listar/<int:id>/", listados.ListarComentariosView.as_view(), name="listar_comentarios"),
+        path("comentarios/crear/<int:id>/", views.CrearComentarioView.as_view(), name="crear_comentario"),
+        #Endpoints de Importación y exportación
+        path("eventos/exportar/", views.ExportarEventosView.as_view(), name="exportar_eventos"),
+        path("eventos/importar/", views.ImportarEventosView.as_view(), name="importar_eventos"),
+        path("reservas/exportar/<int:id>/", views.ExportarReservasView.as_view(), name="exportar_reservas"),
+        path("reservas/importar/", views.ImportarReservasView.as_view(), name="importar_reservas"),
+        #Endpoints de Caché
+        path("cache/estadisticas/", views.EstadisticasCacheView.as_view(), name="estadisticas_cache"),
+        #Endpoints de Login
+        path("login/", views.LoginView.as_view(), name="login"),
+        path("logout/", views.LogoutView.as_view(), name="logout"),
+        path("register/", views.RegisterView.as_view(), name="register"),
+    ]
+
+
+urlpatterns = rutas()
@@ -0,0 +1,11 @@
+"""
+URLconf con las versiones asíncronas de los listados públicos (``Proyecto.vistas_async``).
+
+Para servirlas bajo ASGI: ``ROOT_URLCONF = 'RestAPI.urls_async'``. El resto de rutas son
+las mismas que en ``RestAPI.urls``.
+"""
+from Proyecto import vistas_async
+
+from .urls import rutas
+
+urlpatterns = rutas(vistas_async)